@@ -108,6 +108,12 @@ def get_arguments() -> argparse.Namespace:
     parser.add_argument(
         "--log-no-color", action="store_true", help="Disable color logs"
     )
+    parser.add_argument(
+        "--startup-trace",
+        metavar="path_to_trace_file",
+        default=None,
+        help="Write the setup timeline of the integrations as a Chrome trace",
+    )
     parser.add_argument(
         "--runner",
         action="store_true",
@@ -307,6 +313,7 @@ def main() -> int:
         safe_mode=args.safe_mode,
         debug=args.debug,
         open_ui=args.open_ui,
+        startup_trace=args.startup_trace,
     )
 
     exit_code = runner.run(runtime_conf)
@@ -17,14 +17,18 @@ from homeassistant import config as conf_util, config_entries, core, loader
 from homeassistant.components import http
 from homeassistant.const import REQUIRED_NEXT_PYTHON_DATE, REQUIRED_NEXT_PYTHON_VER
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import service, template
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.setup import (
     DATA_SETUP,
     DATA_SETUP_STARTED,
+    async_get_setup_timeline,
     async_set_domains_to_be_loaded,
     async_setup_component,
+    setup_timeline_to_chrome_trace,
 )
 from homeassistant.util.async_ import gather_with_concurrency
+from homeassistant.util.json import save_json
 from homeassistant.util.logging import async_activate_log_queue_handler
 from homeassistant.util.package import async_get_user_site, is_virtual_env
 from homeassistant.util.yaml import clear_secret_cache
@@ -48,6 +52,9 @@ COOLDOWN_TIME = 60
 
 MAX_LOAD_CONCURRENTLY = 6
 
+# Number of integrations with the slowest imports to log at debug level
+SLOWEST_IMPORTS = 10
+
 DEBUGGER_INTEGRATIONS = {"debugpy", "ptvsd"}
 CORE_INTEGRATIONS = ("homeassistant", "persistent_notification")
 LOGGING_INTEGRATIONS = {
@@ -162,6 +169,16 @@ async def async_setup_hass(
             hass,
         )
 
+    if runtime_config.startup_trace:
+        try:
+            await hass.async_add_executor_job(
+                save_json,
+                runtime_config.startup_trace,
+                setup_timeline_to_chrome_trace(async_get_setup_timeline(hass)),
+            )
+        except HomeAssistantError as err:
+            _LOGGER.error("Unable to write the startup trace: %s", err)
+
     if runtime_config.open_ui:
         hass.add_job(open_hass_ui, hass)
 
@@ -201,6 +218,12 @@ async def async_from_config_dict(
     hass.config_entries = config_entries.ConfigEntries(hass, config)
     await hass.config_entries.async_initialize()
 
+    # Reuse the templates compiled by a previous run when validating config
+    await template.async_load_code_cache(hass)
+
+    # Have the service descriptions ready before the frontend asks for them
+    service.async_build_descriptions_on_start(hass)
+
     # Set up core.
     _LOGGER.debug("Setting up %s", CORE_INTEGRATIONS)
 
@@ -404,10 +427,29 @@ async def async_setup_multi_components(
     setup_started: Dict[str, datetime],
 ) -> None:
     """Set up multiple domains. Log on failure."""
-    futures = {
+    await _async_wait_setup_components(
+        _async_start_setup_components(hass, domains, config), setup_started
+    )
+
+
+@core.callback
+def _async_start_setup_components(
+    hass: core.HomeAssistant, domains: Set[str], config: Dict[str, Any]
+) -> Dict[str, asyncio.Future]:
+    """Start setting up multiple domains."""
+    return {
         domain: hass.async_create_task(async_setup_component(hass, domain, config))
         for domain in domains
     }
+
+
+async def _async_wait_setup_components(
+    futures: Dict[str, asyncio.Future], setup_started: Dict[str, datetime]
+) -> None:
+    """Wait for the setup of multiple domains. Log on failure."""
+    if not futures:
+        return
+    domains = set(futures)
     log_task = asyncio.create_task(_async_log_pending_setups(domains, setup_started))
     await asyncio.wait(futures.values())
     log_task.cancel()
@@ -514,31 +556,32 @@ async def _async_set_up_integrations(
     asyncio.create_task(hass.helpers.entity_registry.async_get_registry())
     asyncio.create_task(hass.helpers.area_registry.async_get_registry())
 
-    # Start setup
+    # Every integration starts as soon as its own dependencies and after
+    # dependencies are set up, stage 2 does not wait for all of stage 1.
+    # Stage 1 integrations do not wait for their after dependencies.
+    async_set_domains_to_be_loaded(
+        hass, stage_1_domains | stage_2_domains, stage_1_domains
+    )
+    stage_1_futures = _async_start_setup_components(hass, stage_1_domains, config)
+    stage_2_futures = _async_start_setup_components(hass, stage_2_domains, config)
+
     if stage_1_domains:
         _LOGGER.info("Setting up stage 1: %s", stage_1_domains)
         try:
             async with hass.timeout.async_timeout(
                 STAGE_1_TIMEOUT, cool_down=COOLDOWN_TIME
             ):
-                await async_setup_multi_components(
-                    hass, stage_1_domains, config, setup_started
-                )
+                await _async_wait_setup_components(stage_1_futures, setup_started)
         except asyncio.TimeoutError:
             _LOGGER.warning("Setup timed out for stage 1 - moving forward")
 
-    # Enables after dependencies
-    async_set_domains_to_be_loaded(hass, stage_2_domains)
-
     if stage_2_domains:
         _LOGGER.info("Setting up stage 2: %s", stage_2_domains)
         try:
             async with hass.timeout.async_timeout(
                 STAGE_2_TIMEOUT, cool_down=COOLDOWN_TIME
             ):
-                await async_setup_multi_components(
-                    hass, stage_2_domains, config, setup_started
-                )
+                await _async_wait_setup_components(stage_2_futures, setup_started)
         except asyncio.TimeoutError:
             _LOGGER.warning("Setup timed out for stage 2 - moving forward")
 
@@ -549,3 +592,12 @@ async def _async_set_up_integrations(
             await hass.async_block_till_done()
     except asyncio.TimeoutError:
         _LOGGER.warning("Setup timed out for bootstrap - moving forward")
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        for entry in loader.async_get_import_profile(hass)[:SLOWEST_IMPORTS]:
+            _LOGGER.debug(
+                "Importing %s took %.3fs (%.3fs including other integrations)",
+                entry["domain"],
+                entry["self"],
+                entry["cumulative"],
+            )
@@ -1,9 +1,11 @@
 """Rest API for Home Assistant."""
 import asyncio
+import gzip
 import json
 import logging
+from typing import Optional, Tuple
 
-from aiohttp import web
+from aiohttp import hdrs, web
 from aiohttp.web_exceptions import HTTPBadRequest
 import async_timeout
 import voluptuous as vol
@@ -12,6 +14,7 @@ from homeassistant.auth.permissions.const import POLICY_READ
 from homeassistant.bootstrap import DATA_LOGGING
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import (
+    CONTENT_TYPE_JSON,
     EVENT_HOMEASSISTANT_STOP,
     EVENT_TIME_CHANGED,
     HTTP_BAD_REQUEST,
@@ -55,6 +58,9 @@ DOMAIN = "api"
 STREAM_PING_PAYLOAD = "ping"
 STREAM_PING_INTERVAL = 50  # seconds
 
+# Snapshots of all states larger than this are sent gzip compressed
+STATES_GZIP_MIN_SIZE = 64 * 1024
+
 
 def setup(hass, config):
     """Register the API with the HTTP interface."""
@@ -219,17 +225,53 @@ class APIStatesView(HomeAssistantView):
     url = URL_API_STATES
     name = "api:states"
 
-    @ha.callback
-    def get(self, request):
+    def __init__(self):
+        """Initialize the states view."""
+        self._states_gzip: Optional[Tuple[str, bytes]] = None
+
+    async def get(self, request):
         """Get current states."""
+        hass = request.app["hass"]
         user = request["hass_user"]
         entity_perm = user.permissions.check_entity
-        states = [
-            state
-            for state in request.app["hass"].states.async_all()
-            if entity_perm(state.entity_id, "read")
-        ]
-        return self.json(states)
+        read_all = user.permissions.access_all_entities("read")
+        # The body depends on the Accept-Encoding of the request
+        headers = {hdrs.VARY: hdrs.ACCEPT_ENCODING}
+        try:
+            states_json = hass.states.async_all_json(
+                None if read_all else lambda entity_id: entity_perm(entity_id, "read")
+            )
+        except (ValueError, TypeError):
+            return self.json(
+                [
+                    state
+                    for state in hass.states.async_all()
+                    if entity_perm(state.entity_id, "read")
+                ],
+                headers=headers,
+            )
+
+        if (
+            not read_all
+            or len(states_json) < STATES_GZIP_MIN_SIZE
+            or "gzip" not in request.headers.get(hdrs.ACCEPT_ENCODING, "")
+        ):
+            return self.json_serialized(states_json.encode("UTF-8"), headers=headers)
+
+        # The snapshot of all states is the same object until a state changes
+        states_gzip = self._states_gzip
+        if states_gzip is None or states_gzip[0] is not states_json:
+            states_gzip = self._states_gzip = (
+                states_json,
+                await hass.async_add_executor_job(
+                    gzip.compress, states_json.encode("UTF-8")
+                ),
+            )
+        return web.Response(
+            body=states_gzip[1],
+            content_type=CONTENT_TYPE_JSON,
+            headers={**headers, hdrs.CONTENT_ENCODING: "gzip"},
+        )
 
 
 class APIEntityStateView(HomeAssistantView):
@@ -246,9 +288,12 @@ class APIEntityStateView(HomeAssistantView):
             raise Unauthorized(entity_id=entity_id)
 
         state = request.app["hass"].states.get(entity_id)
-        if state:
+        if not state:
+            return self.json_message("Entity not found.", HTTP_NOT_FOUND)
+        try:
+            return self.json_serialized(state.as_json().encode("UTF-8"))
+        except (ValueError, TypeError):
             return self.json(state)
-        return self.json_message("Entity not found.", HTTP_NOT_FOUND)
 
     async def post(self, request, entity_id):
         """Update state of entity."""
@@ -1,7 +1,8 @@
 """Provide pre-made queries on top of the recorder component."""
 from collections import defaultdict
 from datetime import datetime as dt, timedelta
-from itertools import groupby
+from functools import partial
+from itertools import chain, groupby
 import json
 import logging
 import time
@@ -14,7 +15,10 @@ import voluptuous as vol
 
 from homeassistant.components import recorder
 from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.http.view import json_fragments
+from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.models import (
+    StateAttributes,
     States,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
@@ -79,13 +83,24 @@ QUERY_STATES = [
     States.domain,
     States.entity_id,
     States.state,
-    States.attributes,
+    # Attributes of rows recorded before schema 10 are stored in the states table
+    func.coalesce(States.attributes, StateAttributes.shared_attrs).label("attributes"),
     States.last_changed,
     States.last_updated,
 ]
 
 HISTORY_BAKERY = "history_bakery"
 
+# Rows fetched from the database at a time when streaming the history
+STREAM_YIELD_PER = 1000
+
+
+def _query_states(session):
+    """Return a query for QUERY_STATES joining the shared attributes."""
+    return session.query(*QUERY_STATES).outerjoin(
+        StateAttributes, States.attributes_id == StateAttributes.attributes_id
+    )
+
 
 def get_significant_states(hass, *args, **kwargs):
     """Wrap _get_significant_states with a sql session."""
@@ -113,10 +128,67 @@ def _get_significant_states(
     """
     timer_start = time.perf_counter()
 
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
+    start_states, states = _significant_states_rows(
+        hass,
+        session,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        significant_changes_only,
     )
 
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states took %fs", elapsed)
+
+    return _sorted_states_to_json(
+        hass,
+        session,
+        states,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
+        start_states,
+    )
+
+
+def _significant_states_rows(
+    hass,
+    session,
+    start_time,
+    end_time,
+    entity_ids,
+    filters,
+    significant_changes_only,
+    yield_per=None,
+):
+    """Return the start states and the significant state rows.
+
+    The start states are None unless the rows come from the history cache.
+    With yield_per, the rows are fetched from the database in chunks of
+    that size while iterating instead of all at once.
+    """
+    if entity_ids is not None:
+        history_cache = hass.data[DATA_INSTANCE].history_cache
+        cached = (
+            history_cache.get_significant_states(
+                entity_ids,
+                start_time,
+                end_time,
+                significant_changes_only,
+                SIGNIFICANT_DOMAINS,
+            )
+            if history_cache is not None
+            else None
+        )
+        if cached is not None:
+            return cached
+
+    baked_query = hass.data[HISTORY_BAKERY](lambda session: _query_states(session))
+
     if significant_changes_only:
         baked_query += lambda q: q.filter(
             (
@@ -142,34 +214,155 @@ def _get_significant_states(
 
     baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
 
-    states = execute(
-        baked_query(session).params(
-            start_time=start_time, end_time=end_time, entity_ids=entity_ids
-        )
+    query = baked_query(session).params(
+        start_time=start_time, end_time=end_time, entity_ids=entity_ids
     )
 
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("get_significant_states took %fs", elapsed)
+    if yield_per is not None:
+        return None, query.with_post_criteria(lambda q: q.yield_per(yield_per))
 
-    return _sorted_states_to_json(
+    return None, execute(query)
+
+
+def _stream_significant_states(
+    hass,
+    start_time,
+    end_time,
+    entity_ids,
+    filters,
+    include_start_time_state,
+    significant_changes_only,
+    minimal_response,
+):
+    """Yield the JSON of the significant states one entity at a time.
+
+    Works like _get_significant_states, but only the rows of one entity
+    and one chunk of database rows are held in memory. The entities are
+    queried one by one when entity_ids are given, to keep their order.
+    """
+    with session_scope(hass=hass) as session:
+        if entity_ids is not None:
+            histories = (
+                _stream_entity_history(
+                    hass,
+                    session,
+                    start_time,
+                    end_time,
+                    entity_id,
+                    include_start_time_state,
+                    significant_changes_only,
+                    minimal_response,
+                )
+                for entity_id in entity_ids
+            )
+        else:
+            histories = _stream_all_history(
+                hass,
+                session,
+                start_time,
+                end_time,
+                filters,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+            )
+
+        yield "["
+        separator = ""
+        for history_items in histories:
+            first = next(history_items, None)
+            # Leave out the entities without states like _sorted_states_to_json
+            if first is None:
+                continue
+            yield separator
+            yield from json_fragments(chain((first,), history_items))
+            separator = ","
+        yield "]"
+
+
+def _stream_entity_history(
+    hass,
+    session,
+    start_time,
+    end_time,
+    entity_id,
+    include_start_time_state,
+    significant_changes_only,
+    minimal_response,
+):
+    """Yield the history of one entity, querying its rows in chunks."""
+    start_states, states = _significant_states_rows(
         hass,
         session,
-        states,
         start_time,
-        entity_ids,
+        end_time,
+        [entity_id],
+        None,
+        significant_changes_only,
+        STREAM_YIELD_PER,
+    )
+    start_state = None
+    if include_start_time_state:
+        if start_states is None:
+            start_states = _get_single_entity_states_with_session(
+                hass, session, start_time, entity_id
+            )
+        else:
+            start_states = [LazyState(row) for row in start_states]
+        if start_states:
+            start_state = _as_start_state(start_states[0], start_time)
+
+    yield from _entity_states_to_json(
+        split_entity_id(entity_id)[0], start_state, iter(states), minimal_response
+    )
+
+
+def _stream_all_history(
+    hass,
+    session,
+    start_time,
+    end_time,
+    filters,
+    include_start_time_state,
+    significant_changes_only,
+    minimal_response,
+):
+    """Yield the history of all entities, querying the rows in chunks."""
+    start_states = {}
+    if include_start_time_state:
+        run = recorder.run_information_from_instance(hass, start_time)
+        for state in _get_states_with_session(
+            hass, session, start_time, run=run, filters=filters
+        ):
+            start_states[state.entity_id] = _as_start_state(state, start_time)
+
+    _, states = _significant_states_rows(
+        hass,
+        session,
+        start_time,
+        end_time,
+        None,
         filters,
-        include_start_time_state,
-        minimal_response,
+        significant_changes_only,
+        STREAM_YIELD_PER,
     )
+    for ent_id, group in groupby(states, lambda state: state.entity_id):
+        yield _entity_states_to_json(
+            split_entity_id(ent_id)[0],
+            start_states.pop(ent_id, None),
+            group,
+            minimal_response,
+        )
+
+    # The entities that did not change since the start time
+    for start_state in start_states.values():
+        yield iter((start_state,))
 
 
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
     with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+        baked_query = hass.data[HISTORY_BAKERY](lambda session: _query_states(session))
 
         baked_query += lambda q: q.filter(
             (States.last_changed == States.last_updated)
@@ -182,7 +375,9 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
             )
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
@@ -203,13 +398,13 @@ def get_last_state_changes(hass, number_of_states, entity_id):
     start_time = dt_util.utcnow()
 
     with session_scope(hass=hass) as session:
-        baked_query = hass.data[HISTORY_BAKERY](
-            lambda session: session.query(*QUERY_STATES)
-        )
+        baked_query = hass.data[HISTORY_BAKERY](lambda session: _query_states(session))
         baked_query += lambda q: q.filter(States.last_changed == States.last_updated)
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(
@@ -270,7 +465,7 @@ def _get_states_with_session(
     # We have more than one entity to look at (most commonly we want
     # all entities,) so we need to do a search on all states since the
     # last recorder run started.
-    query = session.query(*QUERY_STATES)
+    query = _query_states(session)
 
     most_recent_states_by_date = session.query(
         States.entity_id.label("max_entity_id"),
@@ -318,9 +513,7 @@ def _get_states_with_session(
 def _get_single_entity_states_with_session(hass, session, utc_point_in_time, entity_id):
     # Use an entirely different (and extremely fast) query if we only
     # have a single entity id
-    baked_query = hass.data[HISTORY_BAKERY](
-        lambda session: session.query(*QUERY_STATES)
-    )
+    baked_query = hass.data[HISTORY_BAKERY](lambda session: _query_states(session))
     baked_query += lambda q: q.filter(
         States.last_updated < bindparam("utc_point_in_time"),
         States.entity_id == bindparam("entity_id"),
@@ -344,6 +537,7 @@ def _sorted_states_to_json(
     filters=None,
     include_start_time_state=True,
     minimal_response=False,
+    start_states=None,
 ):
     """Convert SQL results into JSON friendly data structure.
 
@@ -354,7 +548,8 @@ def _sorted_states_to_json(
 
     We also need to go back and create a synthetic zero data point for
     each list of states, otherwise our graphs won't start on the Y
-    axis correctly.
+    axis correctly. The states at the start time are queried unless
+    start_states are given.
     """
     result = defaultdict(list)
     # Set all entity IDs to empty lists in result set to maintain the order
@@ -365,63 +560,90 @@ def _sorted_states_to_json(
     # Get the states at the start time
     timer_start = time.perf_counter()
     if include_start_time_state:
-        run = recorder.run_information_from_instance(hass, start_time)
-        for state in _get_states_with_session(
-            hass, session, start_time, entity_ids, run=run, filters=filters
-        ):
-            state.last_changed = start_time
-            state.last_updated = start_time
-            result[state.entity_id].append(state)
+        if start_states is None:
+            run = recorder.run_information_from_instance(hass, start_time)
+            start_states = _get_states_with_session(
+                hass, session, start_time, entity_ids, run=run, filters=filters
+            )
+        else:
+            start_states = [LazyState(row) for row in start_states]
+        for state in start_states:
+            result[state.entity_id].append(_as_start_state(state, start_time))
 
     if _LOGGER.isEnabledFor(logging.DEBUG):
         elapsed = time.perf_counter() - timer_start
         _LOGGER.debug("getting %d first datapoints took %fs", len(result), elapsed)
 
-    # Called in a tight loop so cache the function
-    # here
-    _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
-
     # Append all changes to it
     for ent_id, group in groupby(states, lambda state: state.entity_id):
-        domain = split_entity_id(ent_id)[0]
         ent_results = result[ent_id]
-        if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
-            ent_results.extend(LazyState(db_state) for db_state in group)
+        ent_results.extend(
+            _entity_states_to_json(
+                split_entity_id(ent_id)[0],
+                ent_results.pop() if ent_results else None,
+                group,
+                minimal_response,
+            )
+        )
+
+    # Filter out the empty lists if some states had 0 results.
+    return {key: val for key, val in result.items() if val}
+
 
-        # With minimal response we only provide a native
-        # State for the first and last response. All the states
-        # in-between only provide the "state" and the
-        # "last_changed".
-        if not ent_results:
-            ent_results.append(LazyState(next(group)))
+def _as_start_state(state, start_time):
+    """Move a state to the start time, our graphs start on the Y axis."""
+    state.last_changed = start_time
+    state.last_updated = start_time
+    return state
 
-        prev_state = ent_results[-1]
-        initial_state_count = len(ent_results)
 
+def _entity_states_to_json(domain, start_state, group, minimal_response):
+    """Yield the states of one entity, group holds its rows sorted by time.
+
+    With minimal response we only provide a native State for the first
+    and last response. All the states in-between only provide the
+    "state" and the "last_changed".
+    """
+    if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
+        if start_state is not None:
+            yield start_state
         for db_state in group:
-            # With minimal response we do not care about attribute
-            # changes so we can filter out duplicate states
-            if db_state.state == prev_state.state:
-                continue
+            yield LazyState(db_state)
+        return
 
-            ent_results.append(
-                {
-                    STATE_KEY: db_state.state,
-                    LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
-                        db_state.last_changed
-                    ),
-                }
-            )
-            prev_state = db_state
+    if start_state is None:
+        db_state = next(group, None)
+        if db_state is None:
+            return
+        start_state = LazyState(db_state)
+    yield start_state
+
+    # Called in a tight loop so cache the function
+    # here
+    _process_timestamp_to_utc_isoformat = process_timestamp_to_utc_isoformat
 
-        if prev_state and len(ent_results) != initial_state_count:
-            # There was at least one state change
-            # replace the last minimal state with
-            # a full state
-            ent_results[-1] = LazyState(prev_state)
+    prev_state = start_state
+    minimal_state = None
+    for db_state in group:
+        # With minimal response we do not care about attribute
+        # changes so we can filter out duplicate states
+        if db_state.state == prev_state.state:
+            continue
+
+        if minimal_state is not None:
+            yield minimal_state
+        minimal_state = {
+            STATE_KEY: db_state.state,
+            LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
+                db_state.last_changed
+            ),
+        }
+        prev_state = db_state
 
-    # Filter out the empty lists if some states had 0 results.
-    return {key: val for key, val in result.items() if val}
+    if minimal_state is not None:
+        # There was at least one state change, the last one is
+        # a full state
+        yield LazyState(prev_state)
 
 
 def get_state(hass, utc_point_in_time, entity_id, run=None):
@@ -511,6 +733,23 @@ class HistoryPeriodView(HomeAssistantView):
         ):
             return self.json([])
 
+        if not self.filters or not self.use_include_order:
+            return await self.json_stream(
+                request,
+                partial(
+                    _stream_significant_states,
+                    hass,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    self.filters,
+                    include_start_time_state,
+                    significant_changes_only,
+                    minimal_response,
+                ),
+            )
+
+        # Reordering the result needs all of it
         return cast(
             web.Response,
             await hass.async_add_executor_job(
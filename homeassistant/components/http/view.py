@@ -2,7 +2,7 @@
 import asyncio
 import json
 import logging
-from typing import Any, Callable, List, Optional
+from typing import Any, Callable, Iterable, Iterator, List, Optional
 
 from aiohttp import web
 from aiohttp.typedefs import LooseHeaders
@@ -22,6 +22,19 @@ from .const import KEY_AUTHENTICATED, KEY_HASS
 
 _LOGGER = logging.getLogger(__name__)
 
+# Bytes of JSON collected in the executor before writing them to the client
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def json_fragments(items: Iterable[Any]) -> Iterator[str]:
+    """Yield the JSON of a list one item at a time."""
+    yield "["
+    separator = ""
+    for item in items:
+        yield separator + json.dumps(item, cls=JSONEncoder, allow_nan=False)
+        separator = ","
+    yield "]"
+
 
 class HomeAssistantView:
     """Base view for all views."""
@@ -53,8 +66,17 @@ class HomeAssistantView:
         except (ValueError, TypeError) as err:
             _LOGGER.error("Unable to serialize to JSON: %s\n%s", err, result)
             raise HTTPInternalServerError from err
+        return HomeAssistantView.json_serialized(msg, status_code, headers)
+
+    @staticmethod
+    def json_serialized(
+        body: bytes,
+        status_code: int = HTTP_OK,
+        headers: Optional[LooseHeaders] = None,
+    ) -> web.Response:
+        """Return a response for already serialized JSON."""
         response = web.Response(
-            body=msg,
+            body=body,
             content_type=CONTENT_TYPE_JSON,
             status=status_code,
             headers=headers,
@@ -62,6 +84,61 @@ class HomeAssistantView:
         response.enable_compression()
         return response
 
+    @staticmethod
+    async def json_stream(
+        request: web.Request,
+        fragments_job: Callable[[], Iterable[str]],
+        status_code: int = HTTP_OK,
+    ) -> web.StreamResponse:
+        """Stream JSON generated in the executor to the client.
+
+        fragments_job is called in the executor and returns the JSON text in
+        fragments. They are written in chunks of STREAM_CHUNK_SIZE, so only
+        one chunk is held in memory instead of the whole result. If the JSON
+        can't be serialized after the first chunk was written, the status was
+        sent already and the connection is closed to abort the response.
+        """
+        hass = request.app[KEY_HASS]
+        response = web.StreamResponse(status=status_code)
+        response.content_type = CONTENT_TYPE_JSON
+        response.enable_compression()
+
+        async def write(chunk: bytes) -> None:
+            """Write a chunk, sending the headers first."""
+            if not response.prepared:
+                await response.prepare(request)
+            await response.write(chunk)
+
+        def stream() -> bytes:
+            """Generate the JSON and write all but the last chunk."""
+            chunk: List[str] = []
+            size = 0
+            for fragment in fragments_job():
+                chunk.append(fragment)
+                size += len(fragment)
+                if size >= STREAM_CHUNK_SIZE:
+                    asyncio.run_coroutine_threadsafe(
+                        write("".join(chunk).encode("UTF-8")), hass.loop
+                    ).result()
+                    chunk = []
+                    size = 0
+            return "".join(chunk).encode("UTF-8")
+
+        try:
+            last_chunk = await hass.async_add_executor_job(stream)
+        except (ValueError, TypeError) as err:
+            _LOGGER.error("Unable to serialize to JSON: %s", err)
+            if not response.prepared:
+                raise HTTPInternalServerError from err
+            # The client would otherwise get a truncated body with status 200
+            if request.transport is not None:
+                request.transport.close()
+            return response
+
+        await write(last_chunk)
+        await response.write_eof()
+        return response
+
     def json_message(
         self,
         message: str,
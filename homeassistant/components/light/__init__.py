@@ -243,12 +243,14 @@ async def async_setup(hass, config):
         SERVICE_TURN_ON,
         vol.All(cv.make_entity_service_schema(LIGHT_TURN_ON_SCHEMA), preprocess_data),
         async_handle_light_on_service,
+        coalesce=True,
     )
 
     component.async_register_entity_service(
         SERVICE_TURN_OFF,
         {ATTR_TRANSITION: VALID_TRANSITION, ATTR_FLASH: VALID_FLASH},
         "async_turn_off",
+        coalesce=True,
     )
 
     component.async_register_entity_service(
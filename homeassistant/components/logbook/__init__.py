@@ -12,8 +12,10 @@ import voluptuous as vol
 from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
 from homeassistant.components.history import sqlalchemy_filter_from_include_exclude_conf
 from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.http.view import json_fragments
 from homeassistant.components.recorder.models import (
     Events,
+    StateAttributes,
     States,
     process_timestamp_to_utc_isoformat,
 )
@@ -235,7 +237,7 @@ class LogbookView(HomeAssistantView):
 
         def json_events():
             """Fetch events and generate JSON."""
-            return self.json(
+            return json_fragments(
                 _get_events(
                     hass,
                     start_day,
@@ -247,7 +249,7 @@ class LogbookView(HomeAssistantView):
                 )
             )
 
-        return await hass.async_add_executor_job(json_events)
+        return await self.json_stream(request, json_events)
 
 
 def humanify(hass, events, entity_attr_cache, context_lookup):
@@ -420,7 +422,7 @@ def _get_events(
     entities_filter=None,
     entity_matches_only=False,
 ):
-    """Get events for a period of time."""
+    """Yield the logbook entries for a period of time."""
 
     entity_attr_cache = EntityAttributeCache(hass)
     context_lookup = {None: None}
@@ -475,8 +477,9 @@ def _get_events(
 
         query = query.order_by(Events.time_fired)
 
-        return list(
-            humanify(hass, yield_events(query), entity_attr_cache, context_lookup)
+        # The session stays open while the entries are consumed
+        yield from humanify(
+            hass, yield_events(query), entity_attr_cache, context_lookup
         )
 
 
@@ -486,7 +489,7 @@ def _generate_events_query(session):
         States.state,
         States.entity_id,
         States.domain,
-        States.attributes,
+        _state_attributes().label("attributes"),
     )
 
 
@@ -505,6 +508,9 @@ def _generate_states_query(session, start_day, end_day, old_state, entity_ids):
         _generate_events_query(session)
         .outerjoin(Events, (States.event_id == Events.event_id))
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .filter(_missing_state_matcher(old_state))
         .filter(_continuous_entity_matcher())
         .filter((States.last_updated > start_day) & (States.last_updated < end_day))
@@ -519,6 +525,9 @@ def _apply_events_types_and_states_filter(hass, query, old_state):
     events_query = (
         query.outerjoin(States, (Events.event_id == States.event_id))
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .filter(
             (Events.event_type != EVENT_STATE_CHANGED)
             | _missing_state_matcher(old_state)
@@ -548,10 +557,15 @@ def _continuous_entity_matcher():
     #
     return sqlalchemy.or_(
         sqlalchemy.not_(States.domain.in_(CONTINUOUS_DOMAINS)),
-        sqlalchemy.not_(States.attributes.contains(UNIT_OF_MEASUREMENT_JSON)),
+        sqlalchemy.not_(_state_attributes().contains(UNIT_OF_MEASUREMENT_JSON)),
     )
 
 
+def _state_attributes():
+    # Attributes of rows recorded before schema 10 are stored in the states table
+    return sqlalchemy.func.coalesce(States.attributes, StateAttributes.shared_attrs)
+
+
 def _apply_event_time_filter(events_query, start_day, end_day):
     return events_query.filter(
         (Events.time_fired > start_day) & (Events.time_fired < end_day)
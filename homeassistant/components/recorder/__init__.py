@@ -1,15 +1,15 @@
 """Support for recording details."""
 import asyncio
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 import concurrent.futures
 from datetime import datetime
 import logging
 import queue
 import threading
 import time
-from typing import Any, Callable, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from sqlalchemy import create_engine, event as sqlalchemy_event, exc, select
+from sqlalchemy import create_engine, event as sqlalchemy_event, exc, func, select, text
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.pool import StaticPool
 import voluptuous as vol
@@ -25,6 +25,7 @@ from homeassistant.const import (
     MATCH_ALL,
 )
 from homeassistant.core import CoreState, HomeAssistant, callback
+from homeassistant.helpers import discovery
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import (
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
@@ -36,7 +37,9 @@ import homeassistant.util.dt as dt_util
 
 from . import migration, purge
 from .const import CONF_DB_INTEGRITY_CHECK, DATA_INSTANCE, DOMAIN, SQLITE_URL_PREFIX
-from .models import Base, Events, RecorderRuns, States
+from .history_cache import HistoryCache
+from .models import Base, Events, RecorderRuns, StateAttributes, States
+from .overflow import OVERFLOW_POLICIES, OVERFLOW_SPILL, QueueOverflow
 from .util import session_scope, validate_or_move_away_sqlite_database
 
 _LOGGER = logging.getLogger(__name__)
@@ -55,16 +58,18 @@ SERVICE_PURGE_SCHEMA = vol.Schema(
 
 DEFAULT_URL = "sqlite:///{hass_config_path}"
 DEFAULT_DB_FILE = "home-assistant_v2.db"
+# Number of recently written attribute blobs kept by the recorder thread
+STATE_ATTRIBUTES_CACHE_SIZE = 2048
+# Stay below the SQLite limit of bound parameters per query
+STATE_ATTRIBUTES_QUERY_CHUNK = 900
+
+DEFAULT_SPILL_FILE = "home-assistant_v2.spill"
 DEFAULT_DB_INTEGRITY_CHECK = True
 DEFAULT_DB_MAX_RETRIES = 10
 DEFAULT_DB_RETRY_WAIT = 3
 DEFAULT_COMMIT_INTERVAL = 1
 KEEPALIVE_TIME = 30
 
-# Controls how often we clean up
-# States and Events objects
-EXPIRE_AFTER_COMMITS = 120
-
 CONF_AUTO_PURGE = "auto_purge"
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
@@ -73,6 +78,9 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_QUEUE_HIGH_WATER_MARK = "queue_high_water_mark"
+CONF_QUEUE_OVERFLOW = "queue_overflow"
+CONF_HISTORY_CACHE_SIZE = "history_cache_size"
 
 EXCLUDE_SCHEMA = INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER.extend(
     {vol.Optional(CONF_EVENT_TYPES): vol.All(cv.ensure_list, [cv.string])}
@@ -106,6 +114,12 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DB_INTEGRITY_CHECK, default=DEFAULT_DB_INTEGRITY_CHECK
                     ): cv.boolean,
+                    vol.Optional(CONF_QUEUE_HIGH_WATER_MARK): cv.positive_int,
+                    vol.Optional(CONF_QUEUE_OVERFLOW, default=OVERFLOW_SPILL): vol.In(
+                        OVERFLOW_POLICIES
+                    ),
+                    # Memory budget in MiB, the history cache is off when 0
+                    vol.Optional(CONF_HISTORY_CACHE_SIZE, default=0): cv.positive_int,
                 }
             ),
         )
@@ -164,6 +178,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
     db_integrity_check = conf[CONF_DB_INTEGRITY_CHECK]
+    queue_high_water_mark = conf.get(CONF_QUEUE_HIGH_WATER_MARK)
 
     db_url = conf.get(CONF_DB_URL)
     if not db_url:
@@ -181,10 +196,18 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         entity_filter=entity_filter,
         exclude_t=exclude_t,
         db_integrity_check=db_integrity_check,
+        queue_high_water_mark=queue_high_water_mark,
+        queue_overflow=conf[CONF_QUEUE_OVERFLOW],
+        history_cache_size=conf[CONF_HISTORY_CACHE_SIZE],
     )
     instance.async_initialize()
     instance.start()
 
+    if queue_high_water_mark:
+        hass.async_create_task(
+            discovery.async_load_platform(hass, "sensor", DOMAIN, {}, config)
+        )
+
     async def async_handle_purge_service(service):
         """Handle calls to the purge service."""
         instance.do_adhoc_purge(**service.data)
@@ -218,6 +241,9 @@ class Recorder(threading.Thread):
         entity_filter: Callable[[str], bool],
         exclude_t: List[str],
         db_integrity_check: bool,
+        queue_high_water_mark: Optional[int] = None,
+        queue_overflow: str = OVERFLOW_SPILL,
+        history_cache_size: int = 0,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -227,6 +253,17 @@ class Recorder(threading.Thread):
         self.keep_days = keep_days
         self.commit_interval = commit_interval
         self.queue: Any = queue.SimpleQueue()
+        self.overflow: Optional[QueueOverflow] = None
+        if queue_high_water_mark:
+            self.overflow = QueueOverflow(
+                self.queue,
+                queue_high_water_mark,
+                queue_overflow,
+                hass.config.path(DEFAULT_SPILL_FILE),
+            )
+        self.history_cache: Optional[HistoryCache] = None
+        if history_cache_size:
+            self.history_cache = HistoryCache(history_cache_size * 1024 * 1024)
         self.recording_start = dt_util.utcnow()
         self.db_url = uri
         self.db_max_retries = db_max_retries
@@ -240,11 +277,24 @@ class Recorder(threading.Thread):
         self.entity_filter = entity_filter
         self.exclude_t = exclude_t
 
+        self.purge_progress: Optional[purge.PurgeProgress] = None
         self._timechanges_seen = 0
-        self._commits_without_expire = 0
         self._keepalive_count = 0
-        self._old_states = {}
-        self._pending_expunge = []
+        # Last state row per entity, used to fill in old_state_id
+        self._old_states: Dict[str, Dict[str, Any]] = {}
+        # Rows buffered between commits and bulk inserted on commit
+        self._pending_events: List[Dict[str, Any]] = []
+        self._pending_states: List[
+            Tuple[
+                Dict[str, Any],
+                Dict[str, Any],
+                Optional[Dict[str, Any]],
+                Dict[str, Any],
+            ]
+        ] = []
+        self._pending_state_attributes: List[Dict[str, Any]] = []
+        # Recently written attribute rows keyed by their JSON, least recent first
+        self._state_attributes: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self.event_session = None
         self.get_session = None
         self._completed_database_setup = False
@@ -350,16 +400,33 @@ class Recorder(threading.Thread):
 
         self.event_session = self.get_session()
         self.event_session.expire_on_commit = False
+
+        if self.overflow is not None:
+            self.overflow.recover()
+
         # Use a session for the event read loop
         # with a commit every time the event time
         # has changed. This reduces the disk io.
         while True:
+            if self.overflow is not None and self.queue.empty():
+                # Returns once events are put in the queue again
+                for event in self.overflow.replay():
+                    self._process_one_event(event)
             event = self.queue.get()
+            if self.overflow is not None:
+                self.overflow.flush_coalesced()
             if event is None:
+                if self.overflow is not None:
+                    self.overflow.close()
                 self._close_run()
                 self._close_connection()
                 return
             if isinstance(event, PurgeTask):
+                # Purging deletes unused attribute rows, write the buffered
+                # rows first and forget which attributes were written.
+                if self._pending_states:
+                    self._commit_event_session_or_retry()
+                self._state_attributes.clear()
                 # Schedule a new purge task if this one didn't finish
                 if not purge.purge_old_data(self, event.keep_days, event.repack):
                     self.queue.put(PurgeTask(event.keep_days, event.repack))
@@ -367,69 +434,77 @@ class Recorder(threading.Thread):
             if isinstance(event, WaitTask):
                 self._queue_watch.set()
                 continue
-            if event.event_type == EVENT_TIME_CHANGED:
-                self._keepalive_count += 1
-                if self._keepalive_count >= KEEPALIVE_TIME:
-                    self._keepalive_count = 0
-                    self._send_keep_alive()
-                if self.commit_interval:
-                    self._timechanges_seen += 1
-                    if self._timechanges_seen >= self.commit_interval:
-                        self._timechanges_seen = 0
-                        self._commit_event_session_or_retry()
-                continue
-            if event.event_type in self.exclude_t:
-                continue
+            self._process_one_event(event)
+
+    def _process_one_event(self, event):
+        """Buffer the rows of an event, committing when needed."""
+        if event.event_type == EVENT_TIME_CHANGED:
+            self._keepalive_count += 1
+            if self._keepalive_count >= KEEPALIVE_TIME:
+                self._keepalive_count = 0
+                self._send_keep_alive()
+            if self.commit_interval:
+                self._timechanges_seen += 1
+                if self._timechanges_seen >= self.commit_interval:
+                    self._timechanges_seen = 0
+                    self._commit_event_session_or_retry()
+            return
+        if event.event_type in self.exclude_t:
+            return
 
-            entity_id = event.data.get(ATTR_ENTITY_ID)
-            if entity_id is not None:
-                if not self.entity_filter(entity_id):
-                    continue
+        entity_id = event.data.get(ATTR_ENTITY_ID)
+        if entity_id is not None:
+            if not self.entity_filter(entity_id):
+                return
+
+        event_row = None
+        try:
+            if event.event_type == EVENT_STATE_CHANGED:
+                event_row = Events.row_from_event(event, event_data="{}")
+            else:
+                event_row = Events.row_from_event(event)
+            event_row["created"] = event.time_fired
+            self._pending_events.append(event_row)
+        except (TypeError, ValueError):
+            _LOGGER.warning("Event is not JSON serializable: %s", event)
+        except Exception as err:  # pylint: disable=broad-except
+            # Must catch the exception to prevent the loop from collapsing
+            _LOGGER.exception("Error adding event: %s", err)
 
+        if event_row and event.event_type == EVENT_STATE_CHANGED:
             try:
-                if event.event_type == EVENT_STATE_CHANGED:
-                    dbevent = Events.from_event(event, event_data="{}")
-                else:
-                    dbevent = Events.from_event(event)
-                dbevent.created = event.time_fired
-                self.event_session.add(dbevent)
+                state_row = States.row_from_event(event)
+                has_new_state = event.data.get("new_state")
+                if not has_new_state:
+                    state_row["state"] = None
+                state_row["created"] = event.time_fired
+                shared_attrs = state_row["attributes"]
+                # Attributes are stored once in the state_attributes table
+                state_row["attributes"] = None
+                # The primary keys and old_state_id are assigned on commit
+                self._pending_states.append(
+                    (
+                        state_row,
+                        event_row,
+                        self._old_states.pop(state_row["entity_id"], None),
+                        self._state_attributes_row(shared_attrs),
+                    )
+                )
+                if has_new_state:
+                    self._old_states[state_row["entity_id"]] = state_row
             except (TypeError, ValueError):
-                _LOGGER.warning("Event is not JSON serializable: %s", event)
+                _LOGGER.warning(
+                    "State is not JSON serializable: %s",
+                    event.data.get("new_state"),
+                )
             except Exception as err:  # pylint: disable=broad-except
                 # Must catch the exception to prevent the loop from collapsing
-                _LOGGER.exception("Error adding event: %s", err)
-
-            if dbevent and event.event_type == EVENT_STATE_CHANGED:
-                try:
-                    dbstate = States.from_event(event)
-                    has_new_state = event.data.get("new_state")
-                    if dbstate.entity_id in self._old_states:
-                        old_state = self._old_states.pop(dbstate.entity_id)
-                        if old_state.state_id:
-                            dbstate.old_state_id = old_state.state_id
-                        else:
-                            dbstate.old_state = old_state
-                    if not has_new_state:
-                        dbstate.state = None
-                    dbstate.event = dbevent
-                    dbstate.created = event.time_fired
-                    self.event_session.add(dbstate)
-                    if has_new_state:
-                        self._old_states[dbstate.entity_id] = dbstate
-                        self._pending_expunge.append(dbstate)
-                except (TypeError, ValueError):
-                    _LOGGER.warning(
-                        "State is not JSON serializable: %s",
-                        event.data.get("new_state"),
-                    )
-                except Exception as err:  # pylint: disable=broad-except
-                    # Must catch the exception to prevent the loop from collapsing
-                    _LOGGER.exception("Error adding state change: %s", err)
+                _LOGGER.exception("Error adding state change: %s", err)
 
-            # If they do not have a commit interval
-            # than we commit right away
-            if not self.commit_interval:
-                self._commit_event_session_or_retry()
+        # If they do not have a commit interval
+        # than we commit right away
+        if not self.commit_interval:
+            self._commit_event_session_or_retry()
 
     def _send_keep_alive(self):
         try:
@@ -473,12 +548,15 @@ class Recorder(threading.Thread):
             except Exception as err:  # pylint: disable=broad-except
                 # Must catch the exception to prevent the loop from collapsing
                 _LOGGER.exception("Error saving events: %s", err)
+                # The rows would fail every later commit as well
+                self._discard_pending_rows()
                 return
 
         _LOGGER.error(
             "Error in database update. Could not save " "after %d tries. Giving up",
             tries,
         )
+        self._discard_pending_rows()
         self._reopen_event_session()
 
     def _reopen_event_session(self):
@@ -502,34 +580,165 @@ class Recorder(threading.Thread):
             _LOGGER.exception("Error while creating new event session: %s", err)
 
     def _commit_event_session(self):
-        self._commits_without_expire += 1
-
         try:
-            if self._pending_expunge:
-                self.event_session.flush()
-                for dbstate in self._pending_expunge:
-                    # Expunge the state so its not expired
-                    # until we use it later for dbstate.old_state
-                    if dbstate in self.event_session:
-                        self.event_session.expunge(dbstate)
-                self._pending_expunge = []
+            self._insert_pending_rows()
             self.event_session.commit()
         except Exception as err:
             _LOGGER.error("Error executing query: %s", err)
             self.event_session.rollback()
+            self._clear_pending_keys()
             raise
 
-        # Expire is an expensive operation (frequently more expensive
-        # than the flush and commit itself) so we only
-        # do it after EXPIRE_AFTER_COMMITS commits
-        if self._commits_without_expire == EXPIRE_AFTER_COMMITS:
-            self._commits_without_expire = 0
-            self.event_session.expire_all()
+        if self.history_cache is not None and self._pending_states:
+            self.history_cache.add_rows(
+                (state_row, attributes_row["shared_attrs"])
+                for state_row, _, _, attributes_row in self._pending_states
+            )
+
+        self._pending_events = []
+        self._pending_states = []
+        self._pending_state_attributes = []
+
+    def _insert_pending_rows(self):
+        """Bulk insert the buffered rows with executemany.
+
+        The primary keys of each batch are reserved up front, so event_id
+        and old_state_id can be set without reading back the key of every
+        inserted row.
+        """
+        execute = self.event_session.execute
+
+        if self._pending_events:
+            event_ids = self._reserve_ids(
+                Events.__table__.c.event_id, len(self._pending_events)
+            )
+            for event_row, event_id in zip(self._pending_events, event_ids):
+                event_row["event_id"] = event_id
+            execute(Events.__table__.insert(), self._pending_events)
+
+        if self._pending_state_attributes:
+            self._insert_pending_state_attributes()
+
+        if self._pending_states:
+            state_ids = self._reserve_ids(
+                States.__table__.c.state_id, len(self._pending_states)
+            )
+            for (state_row, event_row, old_state_row, attributes_row), state_id in zip(
+                self._pending_states, state_ids
+            ):
+                state_row["state_id"] = state_id
+                state_row["event_id"] = event_row["event_id"]
+                state_row["old_state_id"] = (
+                    old_state_row["state_id"] if old_state_row else None
+                )
+                state_row["attributes_id"] = attributes_row["attributes_id"]
+            execute(
+                States.__table__.insert(),
+                [state_row for state_row, _, _, _ in self._pending_states],
+            )
+
+    def _reserve_ids(self, column, count):
+        """Reserve count primary keys of column for the rows of a batch.
+
+        PostgreSQL hands out the keys from the sequence of the column, so
+        they are never handed out again. The other databases assign keys
+        after the largest one in use, as the recorder is the only writer.
+        """
+        if self.engine.dialect.name == "postgresql":
+            return [
+                key
+                for key, in self.event_session.execute(
+                    text("SELECT nextval(:sequence) FROM generate_series(1, :count)"),
+                    {
+                        "sequence": f"{column.table.name}_{column.name}_seq",
+                        "count": count,
+                    },
+                )
+            ]
+        first = (
+            self.event_session.execute(select([func.max(column)])).scalar() or 0
+        ) + 1
+        return range(first, first + count)
+
+    def _state_attributes_row(self, shared_attrs):
+        """Return the attributes row for shared_attrs, buffering new ones."""
+        attributes_row = self._state_attributes.get(shared_attrs)
+        if attributes_row is not None:
+            self._state_attributes.move_to_end(shared_attrs)
+            return attributes_row
+
+        attributes_row = {
+            "hash": StateAttributes.hash_shared_attrs(shared_attrs),
+            "shared_attrs": shared_attrs,
+        }
+        self._pending_state_attributes.append(attributes_row)
+        self._state_attributes[shared_attrs] = attributes_row
+        if len(self._state_attributes) > STATE_ATTRIBUTES_CACHE_SIZE:
+            self._state_attributes.popitem(last=False)
+        return attributes_row
+
+    def _insert_pending_state_attributes(self):
+        """Reuse stored attribute rows and bulk insert the new ones."""
+        pending = self._pending_state_attributes
+        hashes = list({attributes_row["hash"] for attributes_row in pending})
+        existing = {}
+        for idx in range(0, len(hashes), STATE_ATTRIBUTES_QUERY_CHUNK):
+            query = self.event_session.query(
+                StateAttributes.attributes_id, StateAttributes.shared_attrs
+            ).filter(
+                StateAttributes.hash.in_(
+                    hashes[idx : idx + STATE_ATTRIBUTES_QUERY_CHUNK]
+                )
+            )
+            for attributes_id, shared_attrs in query:
+                existing[shared_attrs] = attributes_id
+
+        new_rows = {}
+        for attributes_row in pending:
+            shared_attrs = attributes_row["shared_attrs"]
+            if shared_attrs not in existing:
+                new_rows.setdefault(shared_attrs, attributes_row)
+        if new_rows:
+            attributes_ids = self._reserve_ids(
+                StateAttributes.__table__.c.attributes_id, len(new_rows)
+            )
+            for shared_attrs, attributes_id in zip(new_rows, attributes_ids):
+                existing[shared_attrs] = attributes_id
+                new_rows[shared_attrs]["attributes_id"] = attributes_id
+            self.event_session.execute(
+                StateAttributes.__table__.insert(), list(new_rows.values())
+            )
+
+        for attributes_row in pending:
+            attributes_row["attributes_id"] = existing[attributes_row["shared_attrs"]]
+
+    def _clear_pending_keys(self):
+        """Clear the keys of buffered rows that were not committed."""
+        for event_row in self._pending_events:
+            event_row.pop("event_id", None)
+        for state_row, _, _, _ in self._pending_states:
+            for key in ("state_id", "event_id", "old_state_id", "attributes_id"):
+                state_row.pop(key, None)
+        for attributes_row in self._pending_state_attributes:
+            attributes_row.pop("attributes_id", None)
+
+    def _discard_pending_rows(self):
+        """Drop buffered rows that could not be saved."""
+        self._pending_events = []
+        self._pending_states = []
+        self._pending_state_attributes = []
+        # The buffered attributes may never have been written
+        self._state_attributes.clear()
+        # The last states may never have been written
+        self._old_states = {}
 
     @callback
     def event_listener(self, event):
         """Listen for new events and put them in the process queue."""
-        self.queue.put(event)
+        if self.overflow is not None:
+            self.overflow.put(event)
+        else:
+            self.queue.put(event)
 
     def block_till_done(self):
         """Block till all events processed.
@@ -0,0 +1,247 @@
+"""Keep the recently recorded states in memory to answer history queries."""
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timedelta
+import sys
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import homeassistant.util.dt as dt_util
+
+# Rows older than this are dropped, except the last one before it which is
+# the state at the start of the window
+HISTORY_CACHE_WINDOW = timedelta(days=1)
+
+# Estimated bytes used per row and per entity, interned values are counted
+# with their actual size
+ROW_SIZE = 2 * array("q").itemsize + 2 * array("I").itemsize
+ENTITY_SIZE = 600
+VALUE_SIZE = 100
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_util.UTC)
+MICROSECOND = timedelta(microseconds=1)
+
+CachedState = namedtuple(
+    "CachedState", ["entity_id", "state", "attributes", "last_changed", "last_updated"]
+)
+
+
+def _to_microseconds(timestamp: datetime) -> int:
+    """Convert an aware datetime to microseconds since the epoch."""
+    return (timestamp - EPOCH) // MICROSECOND
+
+
+def _from_microseconds(microseconds: int) -> datetime:
+    """Convert microseconds since the epoch to an aware UTC datetime."""
+    return EPOCH + timedelta(microseconds=microseconds)
+
+
+class _ValueTable:
+    """Interned state and attribute strings, shared by all entities."""
+
+    def __init__(self) -> None:
+        """Initialize the value table."""
+        self.values: List[Optional[str]] = []
+        self.size = 0
+        self._index: Dict[Optional[str], int] = {}
+        self._refs = array("I")
+        self._free: List[int] = []
+
+    def intern(self, value: Optional[str]) -> int:
+        """Return the index of value and take a reference to it."""
+        idx = self._index.get(value)
+        if idx is not None:
+            self._refs[idx] += 1
+            return idx
+
+        if self._free:
+            idx = self._free.pop()
+            self.values[idx] = value
+            self._refs[idx] = 1
+        else:
+            idx = len(self.values)
+            self.values.append(value)
+            self._refs.append(1)
+        self._index[value] = idx
+        self.size += VALUE_SIZE + sys.getsizeof(value)
+        return idx
+
+    def release(self, idx: int) -> None:
+        """Drop a reference to the value at idx."""
+        self._refs[idx] -= 1
+        if self._refs[idx]:
+            return
+        value = self.values[idx]
+        del self._index[value]
+        self.values[idx] = None
+        self._free.append(idx)
+        self.size -= VALUE_SIZE + sys.getsizeof(value)
+
+
+class _EntityHistory:
+    """Column arrays with the recent states of one entity, oldest first."""
+
+    __slots__ = ["last_updated", "last_changed", "states", "attributes"]
+
+    def __init__(self) -> None:
+        """Initialize the entity history."""
+        self.last_updated = array("q")
+        self.last_changed = array("q")
+        self.states = array("I")
+        self.attributes = array("I")
+
+
+class HistoryCache:
+    """Recent states of the recorded entities, fed by the recorder thread.
+
+    Each entity keeps its rows of the last HISTORY_CACHE_WINDOW in column
+    arrays. States and attributes are interned in a table shared by all
+    entities. An entity only answers queries starting after its oldest row,
+    as rows recorded before the cache started are only in the database.
+    Once over the memory budget, the least recently queried entities are
+    evicted.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """Initialize the history cache, max_size is in bytes."""
+        self.max_size = max_size
+        self._entities: "OrderedDict[str, _EntityHistory]" = OrderedDict()
+        self._values = _ValueTable()
+        self._rows = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """Return the estimated number of bytes used."""
+        return (
+            self._rows * ROW_SIZE
+            + len(self._entities) * ENTITY_SIZE
+            + self._values.size
+        )
+
+    def add_rows(self, rows: Iterable[Tuple[Dict[str, Any], str]]) -> None:
+        """Add committed state rows with their attributes JSON."""
+        with self._lock:
+            cutoff = _to_microseconds(dt_util.utcnow() - HISTORY_CACHE_WINDOW)
+            touched = {}
+            for state_row, shared_attrs in rows:
+                entity_id = state_row["entity_id"]
+                history = self._entities.get(entity_id)
+                if history is None:
+                    history = self._entities[entity_id] = _EntityHistory()
+                last_updated = _to_microseconds(state_row["last_updated"])
+                if history.last_updated and last_updated < history.last_updated[-1]:
+                    # Out of order rows would break the bisects, start over
+                    self._trim(history, len(history.last_updated))
+                history.last_updated.append(last_updated)
+                history.last_changed.append(_to_microseconds(state_row["last_changed"]))
+                history.states.append(self._values.intern(state_row["state"]))
+                history.attributes.append(self._values.intern(shared_attrs))
+                self._rows += 1
+                touched[entity_id] = history
+
+            for history in touched.values():
+                # Keep the last row before the cutoff as the start state
+                self._trim(history, bisect_left(history.last_updated, cutoff) - 1)
+
+            while self._entities and self.size > self.max_size:
+                _, history = self._entities.popitem(last=False)
+                self._trim(history, len(history.last_updated))
+
+    def purge(self, purge_before: datetime) -> None:
+        """Drop the rows purged from the database."""
+        purge_before_us = _to_microseconds(purge_before)
+        with self._lock:
+            for entity_id, history in list(self._entities.items()):
+                self._trim(history, bisect_left(history.last_updated, purge_before_us))
+                if not history.last_updated:
+                    del self._entities[entity_id]
+
+    def clear(self) -> None:
+        """Drop all rows."""
+        with self._lock:
+            self._entities.clear()
+            self._values = _ValueTable()
+            self._rows = 0
+
+    def _trim(self, history: _EntityHistory, count: int) -> None:
+        """Drop the oldest count rows of an entity, must hold the lock."""
+        if count <= 0:
+            return
+        for idx in range(count):
+            self._values.release(history.states[idx])
+            self._values.release(history.attributes[idx])
+        del history.last_updated[:count]
+        del history.last_changed[:count]
+        del history.states[:count]
+        del history.attributes[:count]
+        self._rows -= count
+
+    def get_significant_states(
+        self,
+        entity_ids: List[str],
+        start_time: datetime,
+        end_time: Optional[datetime],
+        significant_changes_only: bool,
+        significant_domains: Iterable[str],
+    ) -> Optional[Tuple[List[CachedState], List[CachedState]]]:
+        """Return the states at and the changes after start_time.
+
+        Returns None if the cache does not hold all rows of the entities
+        since start_time, the database has to be queried instead.
+        The changes are sorted by entity_id and last_updated, like the rows
+        returned by the history queries.
+        """
+        start = _to_microseconds(start_time)
+        end = _to_microseconds(end_time) if end_time is not None else None
+        with self._lock:
+            histories = []
+            for entity_id in entity_ids:
+                history = self._entities.get(entity_id)
+                if history is None or history.last_updated[0] >= start:
+                    return None
+                histories.append((entity_id, history))
+
+            start_states = []
+            changes = []
+            for entity_id, history in sorted(histories):
+                self._entities.move_to_end(entity_id)
+                last_updated = history.last_updated
+                # The state at start_time was set before it
+                start_states.append(
+                    self._cached_state(
+                        entity_id, history, bisect_left(last_updated, start) - 1
+                    )
+                )
+                first = bisect_right(last_updated, start)
+                last = (
+                    bisect_left(last_updated, end, first)
+                    if end is not None
+                    else len(last_updated)
+                )
+                all_significant = (
+                    not significant_changes_only
+                    or entity_id.split(".", 1)[0] in significant_domains
+                )
+                for idx in range(first, last):
+                    if (
+                        all_significant
+                        or history.last_changed[idx] == last_updated[idx]
+                    ):
+                        changes.append(self._cached_state(entity_id, history, idx))
+
+        return start_states, changes
+
+    def _cached_state(
+        self, entity_id: str, history: _EntityHistory, idx: int
+    ) -> CachedState:
+        """Return the row at idx of an entity, must hold the lock."""
+        values = self._values.values
+        return CachedState(
+            entity_id,
+            values[history.states[idx]],
+            values[history.attributes[idx]],
+            _from_microseconds(history.last_changed[idx]),
+            _from_microseconds(history.last_updated[idx]),
+        )
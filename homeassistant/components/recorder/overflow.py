@@ -0,0 +1,272 @@
+"""Keep the recorder queue below a high-water mark."""
+import json
+import logging
+import os
+import queue as queue_module
+import threading
+from typing import Any, Dict, Iterator, Optional
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Context, Event, EventOrigin, State, callback
+import homeassistant.util.dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+OVERFLOW_COALESCE = "coalesce"
+OVERFLOW_DROP = "drop"
+OVERFLOW_SPILL = "spill"
+
+OVERFLOW_POLICIES = [OVERFLOW_SPILL, OVERFLOW_COALESCE, OVERFLOW_DROP]
+
+REPLAY_POSTFIX = ".replay"
+# Spilled events waiting for the spill writer, events are dropped beyond this
+SPILL_QUEUE_SIZE = 10000
+# Seconds the replay waits for the spill writer before checking again
+SPILL_WAIT = 1
+
+
+class QueueOverflow:
+    """Apply the overflow policy when the recorder queue is over the mark.
+
+    The spill policy hands events to a spill writer thread once the queue is
+    over the high-water mark, which appends them to an on-disk file. All
+    later events are spilled as well, to keep them in order, until the
+    recorder thread has replayed all of them. Events are dropped when the
+    spill writer falls more than SPILL_QUEUE_SIZE events behind.
+
+    The coalesce policy keeps only the latest state change per entity and
+    the drop policy drops events while the queue is over the mark.
+    """
+
+    def __init__(
+        self, queue: Any, high_water_mark: int, policy: str, spill_path: str
+    ) -> None:
+        """Initialize the queue overflow handling."""
+        self.queue = queue
+        self.high_water_mark = high_water_mark
+        self.policy = policy
+        self.spill_path = spill_path
+        self.dropped = 0
+        self.coalesced = 0
+        self.spilled = 0
+        self.replayed = 0
+        self._coalesced_events: Dict[str, Event] = {}
+        self._lock = threading.Lock()
+        # Spilled events handed to the spill writer, None stops the writer
+        self._spill_queue: "queue_module.Queue[Optional[Event]]" = queue_module.Queue(
+            SPILL_QUEUE_SIZE
+        )
+        self._spill_writer: Optional[threading.Thread] = None
+        # Set by the spill writer after writing events to the spill file
+        self._spill_written = threading.Event()
+        # Spilled events that were dropped as they are not JSON serializable
+        self._spill_dropped = 0
+        # Guards the spill file, which the recorder thread moves away to replay
+        self._file_lock = threading.Lock()
+        self._spill_file: Optional[Any] = None
+        self._spilling = False
+
+    @property
+    def spill_pending(self) -> int:
+        """Return the number of spilled events not yet replayed."""
+        return max(self.spilled - self.replayed - self._spill_dropped, 0)
+
+    @callback
+    def put(self, event: Event) -> None:
+        """Put an event in the queue or apply the overflow policy."""
+        with self._lock:
+            if self.policy == OVERFLOW_SPILL:
+                if self._spilling or self.queue.qsize() >= self.high_water_mark:
+                    self._spill(event)
+                else:
+                    self.queue.put(event)
+                return
+
+            if self.queue.qsize() < self.high_water_mark:
+                self._put_coalesced()
+                self.queue.put(event)
+                return
+
+            if (
+                self.policy == OVERFLOW_COALESCE
+                and event.event_type == EVENT_STATE_CHANGED
+            ):
+                entity_id = event.data["entity_id"]
+                if entity_id in self._coalesced_events:
+                    self.coalesced += 1
+                self._coalesced_events[entity_id] = event
+                return
+
+            self.dropped += 1
+
+    def flush_coalesced(self) -> None:
+        """Put the coalesced events in the queue once it is below the mark.
+
+        Called from the recorder thread, so the coalesced events are not
+        held back until the next event comes in.
+        """
+        if not self._coalesced_events:
+            return
+
+        with self._lock:
+            if self.queue.qsize() < self.high_water_mark:
+                self._put_coalesced()
+
+    def _put_coalesced(self) -> None:
+        """Put the coalesced events in the queue, must hold the lock."""
+        if self._coalesced_events:
+            for coalesced_event in self._coalesced_events.values():
+                self.queue.put(coalesced_event)
+            self._coalesced_events = {}
+
+    def _spill(self, event: Event) -> None:
+        """Hand an event to the spill writer, must hold the lock."""
+        if not self._spilling:
+            _LOGGER.warning(
+                "Recorder queue reached %s events, spilling to %s",
+                self.high_water_mark,
+                self.spill_path,
+            )
+            self._spilling = True
+
+        if self._spill_writer is None:
+            self._spill_writer = threading.Thread(
+                target=self._write_spilled, name="RecorderSpill", daemon=True
+            )
+            self._spill_writer.start()
+
+        try:
+            self._spill_queue.put_nowait(event)
+        except queue_module.Full:
+            self.dropped += 1
+            return
+        self.spilled += 1
+
+    def _write_spilled(self) -> None:
+        """Append the spilled events to the spill file until stopped."""
+        stopped = False
+        while not stopped:
+            events = [self._spill_queue.get()]
+            # This thread is the only consumer
+            while not self._spill_queue.empty():
+                events.append(self._spill_queue.get_nowait())
+
+            lines = []
+            for event in events:
+                if event is None:
+                    stopped = True
+                    continue
+                try:
+                    lines.append(event.as_json())
+                except (TypeError, ValueError):
+                    _LOGGER.warning("Event is not JSON serializable: %s", event)
+                    with self._lock:
+                        self.dropped += 1
+                        self._spill_dropped += 1
+
+            if lines:
+                with self._file_lock:
+                    if self._spill_file is None:
+                        self._spill_file = open(self.spill_path, "a", encoding="utf-8")
+                    for line in lines:
+                        self._spill_file.write(line)
+                        self._spill_file.write("\n")
+                    self._spill_file.flush()
+
+            for _ in events:
+                self._spill_queue.task_done()
+            self._spill_written.set()
+
+    def close(self) -> None:
+        """Stop the spill writer once the spilled events are written.
+
+        Events left in the spill file are replayed by the next run.
+        """
+        with self._lock:
+            spill_writer, self._spill_writer = self._spill_writer, None
+        if spill_writer is not None:
+            self._spill_queue.put(None)
+            spill_writer.join()
+
+        with self._file_lock:
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+
+    def recover(self) -> None:
+        """Replay a spill file left behind by a previous run."""
+        with self._lock:
+            if os.path.exists(self.spill_path) or os.path.exists(
+                self.spill_path + REPLAY_POSTFIX
+            ):
+                self._spilling = True
+
+    def replay(self) -> Iterator[Event]:
+        """Yield the spilled events in order until none are left.
+
+        Events are put in the queue again once all spilled events have been
+        written and yielded. Must be called from the recorder thread when
+        the queue is empty.
+        """
+        replay_path = self.spill_path + REPLAY_POSTFIX
+
+        while self._spilling:
+            self._spill_written.clear()
+
+            if os.path.exists(replay_path):
+                yield from self._replay_file(replay_path)
+                continue
+
+            with self._file_lock:
+                if self._spill_file is not None:
+                    self._spill_file.close()
+                    self._spill_file = None
+                if os.path.exists(self.spill_path):
+                    os.replace(self.spill_path, replay_path)
+                    continue
+
+            with self._lock, self._file_lock:
+                if not self._spill_queue.unfinished_tasks and not os.path.exists(
+                    self.spill_path
+                ):
+                    # All spilled events were written and replayed
+                    self._spilling = False
+                    return
+
+            # Wait for the spill writer to write the spilled events
+            self._spill_written.wait(SPILL_WAIT)
+
+    def _replay_file(self, replay_path: str) -> Iterator[Event]:
+        """Yield the events of a spill file and remove it."""
+        with open(replay_path, encoding="utf-8") as replay_file:
+            for line in replay_file:
+                try:
+                    event = _event_from_json(line)
+                except (ValueError, KeyError, TypeError):
+                    _LOGGER.warning("Unable to replay spilled event: %s", line)
+                    continue
+                self.replayed += 1
+                yield event
+
+        os.remove(replay_path)
+
+
+def _event_from_json(line: str) -> Event:
+    """Restore an event written with Event.as_json."""
+    event_dict = json.loads(line)
+    data = event_dict["data"]
+    if event_dict["event_type"] == EVENT_STATE_CHANGED:
+        data["old_state"] = State.from_dict(data.get("old_state"))
+        data["new_state"] = State.from_dict(data.get("new_state"))
+    context = event_dict["context"]
+    return Event(
+        event_dict["event_type"],
+        data,
+        EventOrigin(event_dict["origin"]),
+        dt_util.parse_datetime(event_dict["time_fired"]),
+        Context(
+            id=context["id"],
+            user_id=context["user_id"],
+            parent_id=context["parent_id"],
+        ),
+    )
@@ -1,62 +1,92 @@
 """Purge old data helper."""
-from datetime import timedelta
+from datetime import datetime, timedelta
 import logging
 import time
+from typing import Set
 
+from sqlalchemy import func
 from sqlalchemy.exc import OperationalError, SQLAlchemyError
 
 import homeassistant.util.dt as dt_util
 
-from .models import Events, RecorderRuns, States
-from .util import execute, session_scope
+from .models import Events, RecorderRuns, StateAttributes, States, process_timestamp
+from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Rows deleted per statement, stays below the SQLite limit of bound parameters
+PURGE_BATCH_SIZE = 900
+# Seconds a purge task may delete rows before yielding to the event queue
+PURGE_TIME_SLICE = 0.5
+
+
+class PurgeProgress:
+    """Checkpoint of a purge spread over multiple purge tasks."""
+
+    def __init__(self, purge_days: int, purge_before: datetime) -> None:
+        """Initialize the purge progress."""
+        self.purge_days = purge_days
+        self.purge_before = purge_before
+        self.started = time.monotonic()
+        self.states_deleted = 0
+        self.events_deleted = 0
+        self.attributes_deleted = 0
+
+    @property
+    def rows_deleted(self) -> int:
+        """Return the number of states and events deleted."""
+        return self.states_deleted + self.events_deleted
+
+    @property
+    def rows_per_second(self) -> float:
+        """Return the number of rows deleted per second since the start."""
+        elapsed = time.monotonic() - self.started
+        return self.rows_deleted / elapsed if elapsed else 0.0
+
 
 def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
     """Purge events and states older than purge_days ago.
 
-    Cleans up an timeframe of an hour, based on the oldest record.
+    Cleans up an timeframe of an hour, based on the oldest record. Rows are
+    deleted in batches of PURGE_BATCH_SIZE, each committed on its own, and
+    the task yields after PURGE_TIME_SLICE seconds so the recorder can
+    process the event queue. Returns False if the purge has not finished.
     """
-    purge_before = dt_util.utcnow() - timedelta(days=purge_days)
+    progress = instance.purge_progress
+    if progress is None or progress.purge_days != purge_days:
+        progress = instance.purge_progress = PurgeProgress(
+            purge_days, dt_util.utcnow() - timedelta(days=purge_days)
+        )
+    purge_before = progress.purge_before
     _LOGGER.debug("Purging states and events before target %s", purge_before)
+    deadline = time.monotonic() + PURGE_TIME_SLICE
 
     try:
         with session_scope(session=instance.get_session()) as session:
             # Purge a max of 1 hour, based on the oldest states or events record
             batch_purge_before = purge_before
 
-            query = session.query(States).order_by(States.last_updated.asc()).limit(1)
-            states = execute(query, to_native=True, validate_entity_ids=False)
-            if states:
-                batch_purge_before = min(
-                    batch_purge_before,
-                    states[0].last_updated + timedelta(hours=1),
-                )
-
-            query = session.query(Events).order_by(Events.time_fired.asc()).limit(1)
-            events = execute(query, to_native=True)
-            if events:
-                batch_purge_before = min(
-                    batch_purge_before,
-                    events[0].time_fired + timedelta(hours=1),
-                )
+            for oldest in (
+                session.query(func.min(States.last_updated)).scalar(),
+                session.query(func.min(Events.time_fired)).scalar(),
+            ):
+                if oldest is not None:
+                    batch_purge_before = min(
+                        batch_purge_before,
+                        process_timestamp(oldest) + timedelta(hours=1),
+                    )
 
             _LOGGER.debug("Purging states and events before %s", batch_purge_before)
 
-            deleted_rows = (
-                session.query(States)
-                .filter(States.last_updated < batch_purge_before)
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s states", deleted_rows)
-
-            deleted_rows = (
-                session.query(Events)
-                .filter(Events.time_fired < batch_purge_before)
-                .delete(synchronize_session=False)
-            )
-            _LOGGER.debug("Deleted %s events", deleted_rows)
+            while not _purge_batch(session, progress, batch_purge_before):
+                if time.monotonic() >= deadline:
+                    _LOGGER.debug(
+                        "Purged %s states and %s events so far (%.0f rows/s)",
+                        progress.states_deleted,
+                        progress.events_deleted,
+                        progress.rows_per_second,
+                    )
+                    return False
 
             # If states or events purging isn't processing the purge_before yet,
             # return false, as we are not done yet.
@@ -72,6 +102,19 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
             )
             _LOGGER.debug("Deleted %s recorder_runs", deleted_rows)
 
+        if instance.history_cache is not None:
+            instance.history_cache.purge(purge_before)
+
+        _LOGGER.info(
+            "Purged %s states, %s state_attributes and %s events older than %s"
+            " (%.0f rows/s)",
+            progress.states_deleted,
+            progress.attributes_deleted,
+            progress.events_deleted,
+            purge_before,
+            progress.rows_per_second,
+        )
+
         if repack:
             # Execute sqlite or postgresql vacuum command to free up space on disk
             if instance.engine.driver in ("pysqlite", "postgresql"):
@@ -80,7 +123,9 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
             # Optimize mysql / mariadb tables to free up space on disk
             elif instance.engine.driver in ("mysqldb", "pymysql"):
                 _LOGGER.debug("Optimizing SQL DB to free space")
-                instance.engine.execute("OPTIMIZE TABLE states, events, recorder_runs")
+                instance.engine.execute(
+                    "OPTIMIZE TABLE states, state_attributes, events, recorder_runs"
+                )
 
     except OperationalError as err:
         # Retry when one of the following MySQL errors occurred:
@@ -99,4 +144,65 @@ def purge_old_data(instance, purge_days: int, repack: bool) -> bool:
         _LOGGER.warning("Error purging history: %s", err)
     except SQLAlchemyError as err:
         _LOGGER.warning("Error purging history: %s", err)
+    instance.purge_progress = None
     return True
+
+
+def _purge_batch(session, progress: PurgeProgress, purge_before: datetime) -> bool:
+    """Delete and commit one batch of rows, return True when none are left."""
+    state_ids = []
+    attributes_ids = set()
+    for state_id, attributes_id in (
+        session.query(States.state_id, States.attributes_id)
+        .filter(States.last_updated < purge_before)
+        .limit(PURGE_BATCH_SIZE)
+    ):
+        state_ids.append(state_id)
+        if attributes_id is not None:
+            attributes_ids.add(attributes_id)
+    if state_ids:
+        progress.states_deleted += (
+            session.query(States)
+            .filter(States.state_id.in_(state_ids))
+            .delete(synchronize_session=False)
+        )
+    if attributes_ids:
+        _purge_orphaned_attributes(session, progress, attributes_ids)
+
+    event_ids = []
+    # States reference their event, delete the events once the states are gone
+    if len(state_ids) < PURGE_BATCH_SIZE:
+        event_ids = [
+            event_id
+            for event_id, in session.query(Events.event_id)
+            .filter(Events.time_fired < purge_before)
+            .limit(PURGE_BATCH_SIZE - len(state_ids))
+        ]
+    if event_ids:
+        progress.events_deleted += (
+            session.query(Events)
+            .filter(Events.event_id.in_(event_ids))
+            .delete(synchronize_session=False)
+        )
+
+    # Checkpoint, the deleted rows stay deleted if the purge is interrupted
+    session.commit()
+    return len(state_ids) + len(event_ids) < PURGE_BATCH_SIZE
+
+
+def _purge_orphaned_attributes(
+    session, progress: PurgeProgress, attributes_ids: Set[int]
+) -> None:
+    """Delete the shared attributes of purged states no longer used by a state."""
+    attributes_ids.difference_update(
+        attributes_id
+        for attributes_id, in session.query(States.attributes_id)
+        .filter(States.attributes_id.in_(attributes_ids))
+        .distinct()
+    )
+    if attributes_ids:
+        progress.attributes_deleted += (
+            session.query(StateAttributes)
+            .filter(StateAttributes.attributes_id.in_(attributes_ids))
+            .delete(synchronize_session=False)
+        )
@@ -0,0 +1,62 @@
+"""Sensors for the recorder queue."""
+from homeassistant.helpers.entity import Entity
+
+from .const import DATA_INSTANCE
+
+UNIT_EVENTS = "events"
+
+SENSOR_TYPES = {
+    "queue_depth": "Recorder queue depth",
+    "spill_pending": "Recorder spilled events",
+    "dropped": "Recorder dropped events",
+    "coalesced": "Recorder coalesced events",
+}
+
+
+async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
+    """Set up the recorder queue sensors."""
+    if discovery_info is None:
+        return
+
+    instance = hass.data[DATA_INSTANCE]
+    async_add_entities(
+        [RecorderQueueSensor(instance, sensor_type) for sensor_type in SENSOR_TYPES],
+        True,
+    )
+
+
+class RecorderQueueSensor(Entity):
+    """Representation of a recorder queue metric."""
+
+    def __init__(self, instance, sensor_type):
+        """Initialize the sensor."""
+        self._instance = instance
+        self._sensor_type = sensor_type
+        self._state = None
+
+    @property
+    def name(self):
+        """Return the name of the sensor."""
+        return SENSOR_TYPES[self._sensor_type]
+
+    @property
+    def icon(self):
+        """Icon to display in the front end."""
+        return "mdi:database"
+
+    @property
+    def unit_of_measurement(self):
+        """Return the unit of measurement."""
+        return UNIT_EVENTS
+
+    @property
+    def state(self):
+        """Return the state of the sensor."""
+        return self._state
+
+    async def async_update(self):
+        """Update the state of the sensor."""
+        if self._sensor_type == "queue_depth":
+            self._state = self._instance.queue.qsize()
+        else:
+            self._state = getattr(self._instance.overflow, self._sensor_type)
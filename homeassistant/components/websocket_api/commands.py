@@ -15,7 +15,10 @@ from homeassistant.exceptions import (
 )
 from homeassistant.helpers import config_validation as cv, entity
 from homeassistant.helpers.event import TrackTemplate, async_track_template_result
-from homeassistant.helpers.service import async_get_all_descriptions
+from homeassistant.helpers.service import (
+    async_get_all_descriptions,
+    async_get_all_descriptions_json,
+)
 from homeassistant.helpers.template import Template
 from homeassistant.loader import IntegrationNotFound, async_get_integration
 
@@ -29,6 +32,7 @@ def async_register_commands(hass, async_reg):
     """Register commands."""
     async_reg(hass, handle_subscribe_events)
     async_reg(hass, handle_unsubscribe_events)
+    async_reg(hass, handle_subscribe_entities)
     async_reg(hass, handle_call_service)
     async_reg(hass, handle_get_states)
     async_reg(hass, handle_get_services)
@@ -40,6 +44,7 @@ def async_register_commands(hass, async_reg):
     async_reg(hass, handle_entity_source)
     async_reg(hass, handle_subscribe_trigger)
     async_reg(hass, handle_test_condition)
+    async_reg(hass, handle_supported_features)
 
 
 def pong_message(iden):
@@ -75,7 +80,12 @@ def handle_subscribe_events(hass, connection, msg):
             ):
                 return
 
-            connection.send_message(messages.cached_event_message(msg["id"], event))
+            # Superseded changes of the entity still waiting to be written
+            # are replaced if the client opted in to message coalescing
+            connection.send_message(
+                messages.cached_event_message(msg["id"], event),
+                (msg["id"], event.data["entity_id"]),
+            )
 
     else:
 
@@ -94,6 +104,64 @@ def handle_subscribe_events(hass, connection, msg):
     connection.send_message(messages.result_message(msg["id"]))
 
 
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "subscribe_entities",
+        vol.Optional("entity_ids"): cv.entity_ids,
+    }
+)
+def handle_subscribe_entities(hass, connection, msg):
+    """Handle subscribe entities command.
+
+    Sends the compressed states of the entities, then only the diffs of
+    their state changes.
+    """
+    entity_ids = set(msg.get("entity_ids", []))
+    entity_perm = connection.user.permissions.check_entity
+
+    @callback
+    def forward_entity_changes(event):
+        """Forward entity state changes to websocket."""
+        entity_id = event.data["entity_id"]
+        if entity_ids and entity_id not in entity_ids:
+            return
+
+        if not entity_perm(entity_id, POLICY_READ):
+            return
+
+        connection.send_message(messages.cached_state_diff_message(msg["id"], event))
+
+    # Changes fired after the states below were read are sent as diffs
+    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
+        EVENT_STATE_CHANGED, forward_entity_changes
+    )
+    connection.send_result(msg["id"])
+
+    if entity_ids:
+        states = [
+            state
+            for state in (hass.states.get(entity_id) for entity_id in entity_ids)
+            if state is not None
+        ]
+    else:
+        states = hass.states.async_all()
+    if not connection.user.permissions.access_all_entities("read"):
+        states = [state for state in states if entity_perm(state.entity_id, "read")]
+
+    connection.send_message(
+        messages.event_message(
+            msg["id"],
+            {
+                messages.ENTITY_EVENT_ADD: {
+                    state.entity_id: messages.compressed_state_dict(state)
+                    for state in states
+                }
+            },
+        )
+    )
+
+
 @callback
 @decorators.websocket_command(
     {
@@ -172,24 +240,38 @@ async def handle_call_service(hass, connection, msg):
 def handle_get_states(hass, connection, msg):
     """Handle get states command."""
     if connection.user.permissions.access_all_entities("read"):
-        states = hass.states.async_all()
+        entity_filter = None
     else:
         entity_perm = connection.user.permissions.check_entity
-        states = [
-            state
-            for state in hass.states.async_all()
-            if entity_perm(state.entity_id, "read")
-        ]
 
-    connection.send_message(messages.result_message(msg["id"], states))
+        def entity_filter(entity_id):
+            """Return if the user can read the entity."""
+            return entity_perm(entity_id, "read")
+
+    try:
+        states_json = hass.states.async_all_json(entity_filter)
+    except (ValueError, TypeError):
+        states = hass.states.async_all()
+        if entity_filter is not None:
+            states = [state for state in states if entity_filter(state.entity_id)]
+        connection.send_message(messages.result_message(msg["id"], states))
+        return
+
+    connection.send_message(messages.result_message_json(msg["id"], states_json))
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
 @decorators.async_response
 async def handle_get_services(hass, connection, msg):
     """Handle get services command."""
-    descriptions = await async_get_all_descriptions(hass)
-    connection.send_message(messages.result_message(msg["id"], descriptions))
+    try:
+        descriptions_json = await async_get_all_descriptions_json(hass)
+    except (ValueError, TypeError):
+        descriptions = await async_get_all_descriptions(hass)
+        connection.send_message(messages.result_message(msg["id"], descriptions))
+        return
+
+    connection.send_message(messages.result_message_json(msg["id"], descriptions_json))
 
 
 @callback
@@ -409,3 +491,16 @@ async def handle_test_condition(hass, connection, msg):
     connection.send_result(
         msg["id"], {"result": check_condition(hass, msg.get("variables"))}
     )
+
+
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "supported_features",
+        vol.Required("features"): {str: int},
+    }
+)
+def handle_supported_features(hass, connection, msg):
+    """Handle setting the protocol features supported by the client."""
+    connection.supported_features = msg["features"]
+    connection.send_result(msg["id"])
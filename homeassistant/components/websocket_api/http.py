@@ -2,7 +2,7 @@
 import asyncio
 from contextlib import suppress
 import logging
-from typing import Optional
+from typing import Any, Dict, Hashable, Optional
 
 from aiohttp import WSMsgType, web
 import async_timeout
@@ -16,6 +16,7 @@ from .auth import AuthPhase, auth_required_message
 from .const import (
     CANCELLATION_ERRORS,
     DATA_CONNECTIONS,
+    FEATURE_COALESCE_MESSAGES,
     MAX_PENDING_MSG,
     PENDING_MSG_PEAK,
     PENDING_MSG_PEAK_TIME,
@@ -50,6 +51,17 @@ class WebSocketAdapter(logging.LoggerAdapter):
         return f'[{self.extra["connid"]}] {msg}', kwargs
 
 
+class _CoalescedMessage:
+    """A queued message that is replaced by later messages with its key."""
+
+    __slots__ = ["key", "message"]
+
+    def __init__(self, key: Hashable, message: Any) -> None:
+        """Initialize the coalesced message."""
+        self.key = key
+        self.message = message
+
+
 class WebSocketHandler:
     """Handle an active websocket client connection."""
 
@@ -63,9 +75,36 @@ class WebSocketHandler:
         self._writer_task = None
         self._logger = WebSocketAdapter(_WS_LOGGER, {"connid": id(self)})
         self._peak_checker_unsub = None
+        self._connection = None
+        self._coalesced: Dict[Hashable, _CoalescedMessage] = {}
+
+    @property
+    def _coalesce_messages(self) -> bool:
+        """Return if the client opted in to message coalescing."""
+        return self._connection is not None and bool(
+            self._connection.supported_features.get(FEATURE_COALESCE_MESSAGES)
+        )
+
+    def _message_to_str(self, message) -> str:
+        """Return the JSON of a queued message."""
+        if isinstance(message, _CoalescedMessage):
+            # Later messages with this key are queued again
+            del self._coalesced[message.key]
+            message = message.message
+
+        self._logger.debug("Sending %s", message)
+
+        if not isinstance(message, str):
+            message = message_to_json(message)
+
+        return message
 
     async def _writer(self):
-        """Write outgoing messages."""
+        """Write outgoing messages.
+
+        If the client opted in to message coalescing, all queued messages
+        are sent as a single JSON array frame.
+        """
         # Exceptions if Socket disconnected or cancelled by connection handler
         with suppress(RuntimeError, ConnectionResetError, *CANCELLATION_ERRORS):
             while not self.wsock.closed:
@@ -73,12 +112,23 @@ class WebSocketHandler:
                 if message is None:
                     break
 
-                self._logger.debug("Sending %s", message)
+                if self._to_write.empty() or not self._coalesce_messages:
+                    await self.wsock.send_str(self._message_to_str(message))
+                    continue
+
+                messages = [self._message_to_str(message)]
+                closing = False
+                while not self._to_write.empty():
+                    message = self._to_write.get_nowait()
+                    if message is None:
+                        closing = True
+                        break
+                    messages.append(self._message_to_str(message))
 
-                if not isinstance(message, str):
-                    message = message_to_json(message)
+                await self.wsock.send_str(f"[{','.join(messages)}]")
 
-                await self.wsock.send_str(message)
+                if closing:
+                    break
 
         # Clean up the peaker checker when we shut down the writer
         if self._peak_checker_unsub:
@@ -86,13 +136,25 @@ class WebSocketHandler:
             self._peak_checker_unsub = None
 
     @callback
-    def _send_message(self, message):
+    def _send_message(self, message, coalesce_key: Optional[Hashable] = None):
         """Send a message to the client.
 
+        If the client opted in to message coalescing, a message with a
+        coalesce_key replaces the queued message with the same key.
+
         Closes connection if the client is not reading the messages.
 
         Async friendly.
         """
+        if coalesce_key is not None and self._coalesce_messages:
+            queued = self._coalesced.get(coalesce_key)
+            if queued is not None:
+                queued.message = message
+                return
+            message = self._coalesced[coalesce_key] = _CoalescedMessage(
+                coalesce_key, message
+            )
+
         try:
             self._to_write.put_nowait(message)
         except asyncio.QueueFull:
@@ -184,7 +246,7 @@ class WebSocketHandler:
                 raise Disconnect from err
 
             self._logger.debug("Received %s", msg_data)
-            connection = await auth.async_handle(msg_data)
+            connection = self._connection = await auth.async_handle(msg_data)
             self.hass.data[DATA_CONNECTIONS] = (
                 self.hass.data.get(DATA_CONNECTIONS, 0) + 1
             )
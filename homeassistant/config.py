@@ -1,6 +1,5 @@
 """Module to help with parsing and generating configuration files."""
 from collections import OrderedDict
-from distutils.version import LooseVersion  # pylint: disable=import-error
 import logging
 import os
 import re
@@ -51,7 +50,7 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_per_platform, extract_domain_configs
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity_values import EntityValues
-from homeassistant.loader import Integration, IntegrationNotFound
+from homeassistant.loader import Integration, IntegrationNotFound, lazy_import
 from homeassistant.requirements import (
     RequirementsNotFound,
     async_get_integration_with_requirements,
@@ -62,6 +61,9 @@ from homeassistant.util.yaml import SECRET_YAML, load_yaml
 
 _LOGGER = logging.getLogger(__name__)
 
+# Importing distutils imports setuptools, only needed when upgrading the config
+distutils_version = lazy_import("distutils.version")
+
 DATA_PERSISTENT_ERRORS = "bootstrap_persistent_errors"
 RE_YAML_ERROR = re.compile(r"homeassistant\.util\.yaml")
 RE_ASCII = re.compile(r"\033\[[^m]*m")
@@ -363,15 +365,15 @@ def process_ha_config_upgrade(hass: HomeAssistant) -> None:
         "Upgrading configuration directory from %s to %s", conf_version, __version__
     )
 
-    version_obj = LooseVersion(conf_version)
+    version_obj = distutils_version.LooseVersion(conf_version)
 
-    if version_obj < LooseVersion("0.50"):
+    if version_obj < distutils_version.LooseVersion("0.50"):
         # 0.50 introduced persistent deps dir.
         lib_path = hass.config.path("deps")
         if os.path.isdir(lib_path):
             shutil.rmtree(lib_path)
 
-    if version_obj < LooseVersion("0.92"):
+    if version_obj < distutils_version.LooseVersion("0.92"):
         # 0.92 moved google/tts.py to google_translate/tts.py
         config_path = hass.config.path(YAML_CONFIG_FILE)
 
@@ -387,7 +389,7 @@ def process_ha_config_upgrade(hass: HomeAssistant) -> None:
             except OSError:
                 _LOGGER.exception("Migrating to google_translate tts failed")
 
-    if version_obj < LooseVersion("0.94") and is_docker_env():
+    if version_obj < distutils_version.LooseVersion("0.94") and is_docker_env():
         # In 0.94 we no longer install packages inside the deps folder when
         # running inside a Docker container.
         lib_path = hass.config.path("deps")
@@ -212,6 +212,7 @@ EVENT_PLATFORM_DISCOVERED = "platform_discovered"
 EVENT_SERVICE_REGISTERED = "service_registered"
 EVENT_SERVICE_REMOVED = "service_removed"
 EVENT_STATE_CHANGED = "state_changed"
+EVENT_STATES_CHANGED = "states_changed"
 EVENT_THEMES_UPDATED = "themes_updated"
 EVENT_TIMER_OUT_OF_SYNC = "timer_out_of_sync"
 EVENT_TIME_CHANGED = "time_changed"
@@ -9,6 +9,7 @@ import datetime
 import enum
 import functools
 from ipaddress import ip_address
+import json
 import logging
 import os
 import pathlib
@@ -29,6 +30,7 @@ from typing import (
     Mapping,
     Optional,
     Set,
+    Tuple,
     TypeVar,
     Union,
     cast,
@@ -57,6 +59,7 @@ from homeassistant.const import (
     EVENT_SERVICE_REGISTERED,
     EVENT_SERVICE_REMOVED,
     EVENT_STATE_CHANGED,
+    EVENT_STATES_CHANGED,
     EVENT_TIME_CHANGED,
     EVENT_TIMER_OUT_OF_SYNC,
     LENGTH_METERS,
@@ -70,6 +73,7 @@ from homeassistant.exceptions import (
     ServiceNotFound,
     Unauthorized,
 )
+from homeassistant.helpers.json import JSONEncoder
 from homeassistant.util import location, network
 from homeassistant.util.async_ import fire_coroutine_threadsafe, run_callback_threadsafe
 import homeassistant.util.dt as dt_util
@@ -114,8 +118,13 @@ SOURCE_YAML = "yaml"
 # How long to wait until things that run on startup have to finish.
 TIMEOUT_EVENT_START = 15
 
+# Events that are not delivered to MATCH_ALL listeners
+DIRECT_ONLY_EVENTS = {EVENT_HOMEASSISTANT_CLOSE, EVENT_STATES_CHANGED}
+
 _LOGGER = logging.getLogger(__name__)
 
+_json_dump = functools.partial(json.dumps, cls=JSONEncoder, allow_nan=False)
+
 
 def split_entity_id(entity_id: str) -> List[str]:
     """Split a state entity_id into domain, object_id."""
@@ -590,7 +599,15 @@ class EventOrigin(enum.Enum):
 class Event:
     """Representation of an event within the bus."""
 
-    __slots__ = ["event_type", "data", "origin", "time_fired", "context"]
+    __slots__ = [
+        "event_type",
+        "data",
+        "origin",
+        "time_fired",
+        "context",
+        "_as_dict",
+        "_as_json",
+    ]
 
     def __init__(
         self,
@@ -606,6 +623,8 @@ class Event:
         self.origin = origin
         self.time_fired = time_fired or dt_util.utcnow()
         self.context: Context = context or Context()
+        self._as_dict: Optional[Dict[str, Any]] = None
+        self._as_json: Optional[str] = None
 
     def __hash__(self) -> int:
         """Make hashable."""
@@ -617,13 +636,50 @@ class Event:
 
         Async friendly.
         """
-        return {
-            "event_type": self.event_type,
-            "data": dict(self.data),
-            "origin": str(self.origin.value),
-            "time_fired": self.time_fired.isoformat(),
-            "context": self.context.as_dict(),
-        }
+        if not self._as_dict:
+            self._as_dict = {
+                "event_type": self.event_type,
+                "data": dict(self.data),
+                "origin": str(self.origin.value),
+                "time_fired": self.time_fired.isoformat(),
+                "context": self.context.as_dict(),
+            }
+        return self._as_dict
+
+    def as_json(self) -> str:
+        """Return a JSON representation of this Event.
+
+        The result is serialized once and shared by all consumers. States in
+        the event data reuse their own JSON representation.
+
+        Async friendly.
+        """
+        if self._as_json is None:
+            data = self.data
+            if all(isinstance(key, str) for key in data) and any(
+                isinstance(value, State) for value in data.values()
+            ):
+                data_json = ", ".join(
+                    f"{_json_dump(key)}: "
+                    + (
+                        value.as_json()
+                        if isinstance(value, State)
+                        else _json_dump(value)
+                    )
+                    for key, value in data.items()
+                )
+                data_json = f"{{{data_json}}}"
+            else:
+                data_json = _json_dump(data)
+
+            self._as_json = (
+                f'{{"event_type": {_json_dump(self.event_type)}, '
+                f'"data": {data_json}, '
+                f'"origin": {_json_dump(str(self.origin.value))}, '
+                f'"time_fired": {_json_dump(self.time_fired.isoformat())}, '
+                f'"context": {_json_dump(self.context.as_dict())}}}'
+            )
+        return self._as_json
 
     def __repr__(self) -> str:
         """Return the representation."""
@@ -651,6 +707,8 @@ class EventBus:
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: Dict[str, List[HassJob]] = {}
+        # Pre-merged MATCH_ALL + event type listeners, rebuilt on (un)subscribe
+        self._dispatch: Dict[str, Tuple[HassJob, ...]] = {}
         self._hass = hass
 
     @callback
@@ -691,24 +749,58 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        listeners = self._listeners.get(event_type, [])
+        listeners = self._dispatch.get(event_type)
+        if listeners is None:
+            listeners = self._async_build_dispatch(event_type)
 
-        # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
-        match_all_listeners = self._listeners.get(MATCH_ALL)
-        if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
-            listeners = match_all_listeners + listeners
+        if not listeners:
+            if event_type != EVENT_TIME_CHANGED and _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "Bus:Handling %s",
+                    Event(event_type, event_data, origin, time_fired, context),
+                )
+            return
 
         event = Event(event_type, event_data, origin, time_fired, context)
 
         if event_type != EVENT_TIME_CHANGED:
             _LOGGER.debug("Bus:Handling %s", event)
 
-        if not listeners:
-            return
-
         for job in listeners:
             self._hass.async_add_hass_job(job, event)
 
+    @callback
+    def _async_build_dispatch(self, event_type: str) -> Tuple[HassJob, ...]:
+        """Build the merged listener tuple for an event type.
+
+        Event types without any listener are not cached, so firing arbitrary
+        event types does not grow the dispatch table.
+        """
+        listeners = self._listeners.get(event_type)
+
+        # EVENT_HOMEASSISTANT_CLOSE and EVENT_STATES_CHANGED should go only
+        # to their own listeners
+        match_all_listeners = self._listeners.get(MATCH_ALL)
+        if match_all_listeners is None or event_type in DIRECT_ONLY_EVENTS:
+            if listeners is None:
+                return ()
+            merged = tuple(listeners)
+        elif listeners is None:
+            merged = tuple(match_all_listeners)
+        else:
+            merged = (*match_all_listeners, *listeners)
+
+        self._dispatch[event_type] = merged
+        return merged
+
+    @callback
+    def _async_invalidate_dispatch(self, event_type: str) -> None:
+        """Drop cached listener tuples affected by a change of event_type."""
+        if event_type == MATCH_ALL:
+            self._dispatch.clear()
+        else:
+            self._dispatch.pop(event_type, None)
+
     def listen(self, event_type: str, listener: Callable) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type.
 
@@ -739,6 +831,7 @@ class EventBus:
     @callback
     def _async_listen_job(self, event_type: str, hassjob: HassJob) -> CALLBACK_TYPE:
         self._listeners.setdefault(event_type, []).append(hassjob)
+        self._async_invalidate_dispatch(event_type)
 
         def remove_listener() -> None:
             """Remove the listener."""
@@ -805,6 +898,7 @@ class EventBus:
         """
         try:
             self._listeners[event_type].remove(hassjob)
+            self._async_invalidate_dispatch(event_type)
 
             # delete event_type list if empty
             if not self._listeners[event_type]:
@@ -838,6 +932,7 @@ class State:
         "domain",
         "object_id",
         "_as_dict",
+        "_as_json",
     ]
 
     def __init__(
@@ -873,6 +968,7 @@ class State:
         self.context = context or Context()
         self.domain, self.object_id = split_entity_id(self.entity_id)
         self._as_dict: Optional[Dict[str, Collection[Any]]] = None
+        self._as_json: Optional[str] = None
 
     @property
     def name(self) -> str:
@@ -905,6 +1001,17 @@ class State:
             }
         return self._as_dict
 
+    def as_json(self) -> str:
+        """Return a JSON representation of the State.
+
+        The result is serialized once and shared by all consumers.
+
+        Async friendly.
+        """
+        if self._as_json is None:
+            self._as_json = _json_dump(self.as_dict())
+        return self._as_json
+
     @classmethod
     def from_dict(cls, json_dict: Dict) -> Any:
         """Initialize a state from a dict.
@@ -968,6 +1075,13 @@ class StateMachine:
         self._reservations: Set[str] = set()
         self._bus = bus
         self._loop = loop
+        self._version = 0
+        self._all_json: Optional[Tuple[int, str]] = None
+
+    @property
+    def version(self) -> int:
+        """Return a counter that changes whenever a state is set or removed."""
+        return self._version
 
     def entity_ids(self, domain_filter: Optional[str] = None) -> List[str]:
         """List of entity ids that are being tracked."""
@@ -1038,6 +1152,40 @@ class StateMachine:
             state for state in self._states.values() if state.domain in domain_filter
         ]
 
+    @callback
+    def async_all_json(
+        self, entity_filter: Optional[Callable[[str], bool]] = None
+    ) -> str:
+        """Return a JSON array of all states matching the entity_id filter.
+
+        Each state is serialized once, the array of all states is joined
+        from them once per version of the state machine.
+
+        Raises ValueError or TypeError if a state is not JSON serializable.
+
+        This method must be run in the event loop.
+        """
+        if entity_filter is not None:
+            return (
+                "["
+                + ", ".join(
+                    state.as_json()
+                    for entity_id, state in self._states.items()
+                    if entity_filter(entity_id)
+                )
+                + "]"
+            )
+
+        all_json = self._all_json
+        if all_json is None or all_json[0] != self._version:
+            all_json = self._all_json = (
+                self._version,
+                "["
+                + ", ".join(state.as_json() for state in self._states.values())
+                + "]",
+            )
+        return all_json[1]
+
     def get(self, entity_id: str) -> Optional[State]:
         """Retrieve state of entity_id or None if not found.
 
@@ -1079,6 +1227,7 @@ class StateMachine:
         if old_state is None:
             return False
 
+        self._version += 1
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
             {"entity_id": entity_id, "old_state": old_state, "new_state": None},
@@ -1153,7 +1302,112 @@ class StateMachine:
 
         This method must be run in the event loop.
         """
-        entity_id = entity_id.lower()
+        state_changed = self._async_build_state(
+            entity_id.lower(), new_state, attributes, force_update, context
+        )
+        if state_changed is None:
+            return
+
+        old_state, state = state_changed
+        self._states[state.entity_id] = state
+        self._version += 1
+        self._bus.async_fire(
+            EVENT_STATE_CHANGED,
+            {"entity_id": state.entity_id, "old_state": old_state, "new_state": state},
+            EventOrigin.local,
+            state.context,
+            time_fired=state.last_updated,
+        )
+
+    def set_many(
+        self,
+        states: Mapping[str, Tuple[str, Optional[Dict]]],
+        force_update: bool = False,
+        context: Optional[Context] = None,
+    ) -> None:
+        """Set the state of many entities, add entities if they do not exist."""
+        run_callback_threadsafe(
+            self._loop, self.async_set_many, states, force_update, context
+        ).result()
+
+    @callback
+    def async_set_many(
+        self,
+        states: Mapping[str, Tuple[str, Optional[Dict]]],
+        force_update: bool = False,
+        context: Optional[Context] = None,
+    ) -> None:
+        """Set the state of many entities, add entities if they do not exist.
+
+        States maps an entity_id to a (state, attributes) tuple. All states
+        are validated before any of them is stored, so an invalid entry leaves
+        the state machine untouched.
+
+        Listeners of EVENT_STATES_CHANGED receive a single event with all
+        changes, EVENT_STATE_CHANGED listeners still receive one event per
+        changed entity.
+
+        This method must be run in the event loop.
+        """
+        if context is None:
+            context = Context()
+
+        now = dt_util.utcnow()
+
+        changes = []
+        for entity_id, (new_state, attributes) in states.items():
+            state_changed = self._async_build_state(
+                entity_id.lower(), new_state, attributes, force_update, context, now
+            )
+            if state_changed is not None:
+                changes.append(state_changed)
+
+        if not changes:
+            return
+
+        self._version += 1
+        events_data = []
+        for old_state, state in changes:
+            self._states[state.entity_id] = state
+            events_data.append(
+                {
+                    "entity_id": state.entity_id,
+                    "old_state": old_state,
+                    "new_state": state,
+                }
+            )
+
+        for event_data in events_data:
+            self._bus.async_fire(
+                EVENT_STATE_CHANGED,
+                event_data,
+                EventOrigin.local,
+                context,
+                time_fired=now,
+            )
+
+        self._bus.async_fire(
+            EVENT_STATES_CHANGED,
+            {"changes": events_data},
+            EventOrigin.local,
+            context,
+            time_fired=now,
+        )
+
+    @callback
+    def _async_build_state(
+        self,
+        entity_id: str,
+        new_state: str,
+        attributes: Optional[Dict],
+        force_update: bool,
+        context: Optional[Context],
+        now: Optional[datetime.datetime] = None,
+    ) -> Optional[Tuple[Optional[State], State]]:
+        """Build the new state for an entity without storing it.
+
+        Returns None if neither the state nor the attributes changed.
+        """
         new_state = str(new_state)
         attributes = attributes or {}
         old_state = self._states.get(entity_id)
@@ -1167,12 +1421,13 @@ class StateMachine:
             last_changed = old_state.last_changed if same_state else None
 
         if same_state and same_attr:
-            return
+            return None
 
         if context is None:
             context = Context()
 
-        now = dt_util.utcnow()
+        if now is None:
+            now = dt_util.utcnow()
 
         state = State(
             entity_id,
@@ -1183,14 +1438,7 @@ class StateMachine:
             context,
             old_state is None,
         )
-        self._states[entity_id] = state
-        self._bus.async_fire(
-            EVENT_STATE_CHANGED,
-            {"entity_id": entity_id, "old_state": old_state, "new_state": state},
-            EventOrigin.local,
-            context,
-            time_fired=now,
-        )
+        return old_state, state
 
 
 class Service:
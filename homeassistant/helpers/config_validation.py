@@ -28,7 +28,6 @@ from typing import (
 from urllib.parse import urlparse
 from uuid import UUID
 
-from pkg_resources import parse_version
 import voluptuous as vol
 import voluptuous_serialize
 
@@ -87,11 +86,15 @@ from homeassistant.helpers import (
     template as template_helper,
 )
 from homeassistant.helpers.logging import KeywordStyleAdapter
+from homeassistant.loader import lazy_import
 from homeassistant.util import sanitize_path, slugify as util_slugify
 import homeassistant.util.dt as dt_util
 
 # pylint: disable=invalid-name
 
+# Only used for deprecated options, importing it is slow
+pkg_resources = lazy_import("pkg_resources")
+
 TIME_PERIOD_ERROR = "offset {} should be format 'HH:MM', 'HH:MM:SS' or 'HH:MM:SS.F'"
 
 # Home Assistant types
@@ -765,7 +768,9 @@ def deprecated(
         if not invalidation_version:
             return
 
-        if parse_version(__version__) >= parse_version(invalidation_version):
+        if pkg_resources.parse_version(__version__) >= pkg_resources.parse_version(
+            invalidation_version
+        ):
             raise vol.Invalid(
                 warning.format(
                     key=key,
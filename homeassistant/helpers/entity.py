@@ -5,7 +5,7 @@ from datetime import datetime, timedelta
 import functools as ft
 import logging
 from timeit import default_timer as timer
-from typing import Any, Awaitable, Dict, Iterable, List, Optional
+from typing import Any, Awaitable, Dict, Hashable, Iterable, List, Optional
 
 from homeassistant.config import DATA_CUSTOMIZE
 from homeassistant.const import (
@@ -107,9 +107,15 @@ class Entity(ABC):
     # Protect for multiple updates
     _update_staged = False
 
+    # Seconds the last update took, without waiting for parallel updates
+    update_latency: Optional[float] = None
+
     # Process updates in parallel
     parallel_updates: Optional[asyncio.Semaphore] = None
 
+    # Coalesced requests per key, see async_request_call
+    _coalesced_requests: Optional[Dict[Hashable, "_CoalescedRequests"]] = None
+
     # Entry in the entity registry
     registry_entry: Optional[RegistryEntry] = None
 
@@ -453,6 +459,7 @@ class Entity(ABC):
         if self.parallel_updates:
             await self.parallel_updates.acquire()
 
+        start = timer()
         try:
             # pylint: disable=no-member
             if hasattr(self, "async_update"):
@@ -481,6 +488,7 @@ class Entity(ABC):
             )
             await task
         finally:
+            self.update_latency = timer() - start
             self._update_staged = False
             if self.parallel_updates:
                 self.parallel_updates.release()
@@ -655,8 +663,19 @@ class Entity(ABC):
         """Return the representation."""
         return f"<Entity {self.name}: {self.state}>"
 
-    async def async_request_call(self, coro: Awaitable) -> None:
-        """Process request batched."""
+    async def async_request_call(
+        self, coro: Awaitable, coalesce_key: Optional[Hashable] = None
+    ) -> None:
+        """Process request batched.
+
+        Requests with a coalesce key are processed one at a time. A request
+        still waiting for its turn is dropped when a newer request with the
+        same key comes in, as the newer request supersedes it.
+        """
+        if coalesce_key is not None:
+            await self._async_request_call_coalesced(coro, coalesce_key)
+            return
+
         if self.parallel_updates:
             await self.parallel_updates.acquire()
 
@@ -666,6 +685,41 @@ class Entity(ABC):
             if self.parallel_updates:
                 self.parallel_updates.release()
 
+    async def _async_request_call_coalesced(
+        self, coro: Awaitable, coalesce_key: Hashable
+    ) -> None:
+        """Process a request unless a newer one supersedes it while waiting."""
+        if self._coalesced_requests is None:
+            self._coalesced_requests = {}
+        requests = self._coalesced_requests.get(coalesce_key)
+        if requests is None:
+            requests = self._coalesced_requests[coalesce_key] = _CoalescedRequests()
+
+        token = object()
+        requests.latest = token
+
+        async with requests.lock:
+            if requests.latest is not token:
+                _LOGGER.debug(
+                    "Dropping request for %s superseded by a newer one", self.entity_id
+                )
+                coro.close()  # type: ignore
+                return
+            requests.latest = None
+            await self.async_request_call(coro)
+
+
+class _CoalescedRequests:
+    """Requests of an entity with the same coalesce key."""
+
+    __slots__ = ["lock", "latest"]
+
+    def __init__(self) -> None:
+        """Initialize the requests."""
+        self.lock = asyncio.Lock()
+        # Token of the newest request waiting for the lock
+        self.latest: Optional[object] = None
+
 
 class ToggleEntity(Entity):
     """An abstract class for entities that can be turned on and off."""
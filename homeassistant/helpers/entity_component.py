@@ -194,15 +194,20 @@ class EntityComponent:
         schema: Union[Dict[str, Any], vol.Schema],
         func: str,
         required_features: Optional[List[int]] = None,
+        coalesce: bool = False,
     ) -> None:
-        """Register an entity service."""
+        """Register an entity service.
+
+        With coalesce, a call that is still waiting for an entity is dropped
+        when a newer call of the service comes in.
+        """
         if isinstance(schema, dict):
             schema = cv.make_entity_service_schema(schema)
 
         async def handle_service(call: Callable) -> None:
             """Handle the service."""
             await self.hass.helpers.service.entity_service_call(
-                self._platforms.values(), func, call, required_features
+                self._platforms.values(), func, call, required_features, coalesce
             )
 
         self.hass.services.async_register(self.domain, name, handle_service, schema)
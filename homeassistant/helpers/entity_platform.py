@@ -1,10 +1,21 @@
 """Class to manage the entities for a single platform."""
 import asyncio
+from bisect import bisect_left
 from contextvars import ContextVar
 from datetime import datetime, timedelta
 from logging import Logger
+from math import ceil
 from types import ModuleType
-from typing import TYPE_CHECKING, Callable, Coroutine, Dict, Iterable, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+)
 
 from homeassistant import config_entries
 from homeassistant.const import ATTR_RESTORED, DEVICE_DEFAULT_NAME
@@ -37,6 +48,73 @@ PLATFORM_NOT_READY_RETRIES = 10
 DATA_ENTITY_PLATFORM = "entity_platform"
 PLATFORM_NOT_READY_BASE_WAIT_TIME = 30  # seconds
 
+DATA_POLLING_SCHEDULER = "entity_platform_polling_scheduler"
+# Fraction of the scan interval over which the first polls are spread
+POLL_SPREAD = 0.5
+# Consecutive polls leaving an entity unavailable before backing off
+POLL_FAILURES_BEFORE_BACKOFF = 3
+# Maximum number of scan intervals between polls of an entity
+MAX_POLL_BACKOFF = 8
+# Upper bounds in seconds of the poll latency histogram buckets
+POLL_LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60)
+# Fractional part of the golden ratio
+_GOLDEN_RATIO = 0.6180339887498949
+
+
+class PollingScheduler:
+    """Spread the polling of all entity platforms over their scan interval.
+
+    Platforms with the same scan interval would otherwise poll at the same
+    time. The delay of the first poll of each platform is shortened by a
+    fraction of the interval taken from the golden ratio sequence, which
+    keeps the polls spread out however many platforms there are.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the polling scheduler."""
+        self._platforms: Dict[timedelta, int] = {}
+
+    @callback
+    def async_first_poll_delay(self, scan_interval: timedelta) -> timedelta:
+        """Return the delay before the first poll of a platform."""
+        count = self._platforms.get(scan_interval, 0)
+        self._platforms[scan_interval] = count + 1
+        return scan_interval * (1 - POLL_SPREAD * ((count * _GOLDEN_RATIO) % 1))
+
+
+class PollLatencyHistogram:
+    """Histogram of the time it took to poll the entities of a platform."""
+
+    def __init__(self) -> None:
+        """Initialize the histogram."""
+        self.counts = [0] * (len(POLL_LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+
+    def record(self, latency: float) -> None:
+        """Record the latency in seconds of a poll."""
+        self.counts[bisect_left(POLL_LATENCY_BUCKETS, latency)] += 1
+        self.total += latency
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the histogram, the buckets are keyed by their upper bound."""
+        buckets = {
+            str(bound): count for bound, count in zip(POLL_LATENCY_BUCKETS, self.counts)
+        }
+        buckets["+Inf"] = self.counts[-1]
+        return {"buckets": buckets, "count": sum(self.counts), "sum": self.total}
+
+
+class _PollBackoff:
+    """Number of scan intervals between polls of an entity."""
+
+    __slots__ = ["intervals", "skip", "failures"]
+
+    def __init__(self) -> None:
+        """Initialize the backoff."""
+        self.intervals = 1
+        self.skip = 0
+        self.failures = 0
+
 
 class EntityPlatform:
     """Manage the entities for a single platform."""
@@ -62,6 +140,9 @@ class EntityPlatform:
         self.entity_namespace = entity_namespace
         self.config_entry: Optional[config_entries.ConfigEntry] = None
         self.entities: Dict[str, Entity] = {}  # pylint: disable=used-before-assignment
+        # Increasing number per entity id, in the order of entities
+        self.entity_order: Dict[str, int] = {}
+        self._entity_counter = 0
         self._tasks: List[asyncio.Future] = []
         # Stop tracking tasks after setup is completed
         self._setup_complete = False
@@ -70,6 +151,8 @@ class EntityPlatform:
         # Method to cancel the retry of setup
         self._async_cancel_retry_setup: Optional[CALLBACK_TYPE] = None
         self._process_updates: Optional[asyncio.Lock] = None
+        self._poll_backoff: Dict[str, _PollBackoff] = {}
+        self.poll_latency = PollLatencyHistogram()
 
         self.parallel_updates: Optional[asyncio.Semaphore] = None
 
@@ -334,11 +417,25 @@ class EntityPlatform:
         ):
             return
 
+        scheduler = self.hass.data.get(DATA_POLLING_SCHEDULER)
+        if scheduler is None:
+            scheduler = self.hass.data[DATA_POLLING_SCHEDULER] = PollingScheduler()
+
+        self._async_unsub_polling = async_call_later(
+            self.hass,
+            scheduler.async_first_poll_delay(self.scan_interval).total_seconds(),
+            self._async_start_polling,
+        )
+
+    @callback
+    def _async_start_polling(self, now: datetime) -> None:
+        """Poll the entities and keep polling every scan interval."""
         self._async_unsub_polling = async_track_time_interval(
             self.hass,
             self._update_entity_states,
             self.scan_interval,
         )
+        self.hass.async_create_task(self._update_entity_states(now))
 
     async def _async_add_entity(
         self, entity, update_before_add, entity_registry, device_registry
@@ -493,6 +590,8 @@ class EntityPlatform:
 
         entity_id = entity.entity_id
         self.entities[entity_id] = entity
+        self.entity_order[entity_id] = self._entity_counter
+        self._entity_counter += 1
 
         if not restored:
             # Reserve the state in the state machine
@@ -502,7 +601,13 @@ class EntityPlatform:
             # has a chance to finish.
             self.hass.states.async_reserve(entity.entity_id)
 
-        entity.async_on_remove(lambda: self.entities.pop(entity_id))
+        @callback
+        def remove_entity() -> None:
+            """Remove the entity from the platform."""
+            self.entities.pop(entity_id)
+            self.entity_order.pop(entity_id)
+
+        entity.async_on_remove(remove_entity)
 
         await entity.add_to_platform_finish()
 
@@ -538,6 +643,7 @@ class EntityPlatform:
     async def async_remove_entity(self, entity_id: str) -> None:
         """Remove entity id from platform."""
         await self.entities[entity_id].async_remove()
+        self._poll_backoff.pop(entity_id, None)
 
         # Clean up polling job if no longer needed
         if self._async_unsub_polling is not None and not any(
@@ -560,10 +666,14 @@ class EntityPlatform:
         )
 
     @callback
-    def async_register_entity_service(self, name, schema, func, required_features=None):
+    def async_register_entity_service(
+        self, name, schema, func, required_features=None, coalesce=False
+    ):
         """Register an entity service.
 
         Services will automatically be shared by all platforms of the same domain.
+        With coalesce, a call that is still waiting for an entity is dropped
+        when a newer call of the service comes in.
         """
         if self.hass.services.has_service(self.platform_name, name):
             return
@@ -583,6 +693,7 @@ class EntityPlatform:
                 func,
                 call,
                 required_features,
+                coalesce,
             )
 
         self.hass.services.async_register(
@@ -613,11 +724,60 @@ class EntityPlatform:
             for entity in self.entities.values():
                 if not entity.should_poll:
                     continue
-                tasks.append(entity.async_update_ha_state(True))
+                backoff = self._poll_backoff.get(entity.entity_id)
+                if backoff is not None and backoff.skip:
+                    backoff.skip -= 1
+                    continue
+                tasks.append(self._async_poll_entity(entity))
 
             if tasks:
                 await asyncio.gather(*tasks)
 
+    async def _async_poll_entity(self, entity: "Entity") -> None:
+        """Poll an entity and adapt its interval to the cost of the update.
+
+        Entities that take longer than the scan interval to update are polled
+        less often. So are entities that stay unavailable, doubling the
+        interval up to MAX_POLL_BACKOFF scan intervals.
+        """
+        # Measured by the entity, as the update may wait for parallel updates
+        entity.update_latency = None
+        await entity.async_update_ha_state(True)
+        latency = entity.update_latency
+        if latency is None:
+            # Another update of the entity was in progress
+            latency = 0
+        else:
+            self.poll_latency.record(latency)
+
+        entity_id = entity.entity_id
+        backoff = self._poll_backoff.get(entity_id)
+        if entity.available:
+            failures = 0
+        else:
+            failures = backoff.failures + 1 if backoff is not None else 1
+
+        intervals = ceil(latency / self.scan_interval.total_seconds()) or 1
+        if failures >= POLL_FAILURES_BEFORE_BACKOFF:
+            intervals = max(
+                intervals, 2 ** (failures - POLL_FAILURES_BEFORE_BACKOFF + 1)
+            )
+        intervals = min(intervals, MAX_POLL_BACKOFF)
+
+        if intervals == 1 and not failures:
+            self._poll_backoff.pop(entity_id, None)
+            return
+
+        if backoff is None:
+            backoff = self._poll_backoff[entity_id] = _PollBackoff()
+        if intervals != backoff.intervals:
+            self.logger.debug(
+                "Polling %s every %s scan intervals", entity_id, intervals
+            )
+        backoff.intervals = intervals
+        backoff.skip = intervals - 1
+        backoff.failures = failures
+
 
 current_platform: ContextVar[Optional[EntityPlatform]] = ContextVar(
     "current_platform", default=None
@@ -638,3 +798,19 @@ def async_get_platforms(
     platforms: List[EntityPlatform] = hass.data[DATA_ENTITY_PLATFORM][integration_name]
 
     return platforms
+
+
+@callback
+def async_get_poll_latency(hass: HomeAssistantType) -> List[Dict[str, Any]]:
+    """Return the poll latency histograms of the polling platforms."""
+    return [
+        {
+            "domain": platform.domain,
+            "platform": platform.platform_name,
+            "scan_interval": platform.scan_interval.total_seconds(),
+            **platform.poll_latency.as_dict(),
+        }
+        for platforms in hass.data.get(DATA_ENTITY_PLATFORM, {}).values()
+        for platform in platforms
+        if any(platform.poll_latency.counts)
+    ]
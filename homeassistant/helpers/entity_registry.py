@@ -127,7 +127,9 @@ class EntityRegistry:
         self.hass = hass
         self.entities: Dict[str, RegistryEntry]
         self._index: Dict[Tuple[str, str, str], str] = {}
-        self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
+        self._store = hass.helpers.storage.Store(
+            STORAGE_VERSION, STORAGE_KEY, compact=True
+        )
         self.hass.bus.async_listen(
             EVENT_DEVICE_REGISTRY_UPDATED, self.async_device_modified
         )
@@ -271,7 +273,7 @@ class EntityRegistry:
         )
         self._register_entry(entity)
         _LOGGER.info("Registered new %s.%s entity: %s", domain, platform, entity_id)
-        self.async_schedule_save()
+        self.async_schedule_save(entity_id)
 
         self.hass.bus.async_fire(
             EVENT_ENTITY_REGISTRY_UPDATED, {"action": "create", "entity_id": entity_id}
@@ -286,7 +288,7 @@ class EntityRegistry:
         self.hass.bus.async_fire(
             EVENT_ENTITY_REGISTRY_UPDATED, {"action": "remove", "entity_id": entity_id}
         )
-        self.async_schedule_save()
+        self.async_schedule_save(entity_id)
 
     async def async_device_modified(self, event: Event) -> None:
         """Handle the removal or update of a device.
@@ -416,7 +418,7 @@ class EntityRegistry:
         new = attr.evolve(old, **changes)
         self._register_entry(new)
 
-        self.async_schedule_save()
+        self.async_schedule_save(old.entity_id, entity_id)
 
         data = {"action": "update", "entity_id": entity_id, "changes": list(changes)}
 
@@ -469,35 +471,38 @@ class EntityRegistry:
         self._rebuild_index()
 
     @callback
-    def async_schedule_save(self) -> None:
-        """Schedule saving the entity registry."""
-        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+    def async_schedule_save(self, *entity_ids: str) -> None:
+        """Schedule saving the entity registry.
+
+        If the changed or removed entities are passed, only the changes are
+        appended to the journal of the store.
+        """
+        if not entity_ids:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+            return
+
+        self._store.async_delay_save_journal(
+            self._data_to_save,
+            [
+                (
+                    "entities",
+                    "entity_id",
+                    entity_id,
+                    _entry_to_dict(self.entities[entity_id])
+                    if entity_id in self.entities
+                    else None,
+                )
+                for entity_id in dict.fromkeys(entity_ids)
+            ],
+            SAVE_DELAY,
+        )
 
     @callback
     def _data_to_save(self) -> Dict[str, Any]:
         """Return data of entity registry to store in a file."""
         data = {}
 
-        data["entities"] = [
-            {
-                "entity_id": entry.entity_id,
-                "config_entry_id": entry.config_entry_id,
-                "device_id": entry.device_id,
-                "area_id": entry.area_id,
-                "unique_id": entry.unique_id,
-                "platform": entry.platform,
-                "name": entry.name,
-                "icon": entry.icon,
-                "disabled_by": entry.disabled_by,
-                "capabilities": entry.capabilities,
-                "supported_features": entry.supported_features,
-                "device_class": entry.device_class,
-                "unit_of_measurement": entry.unit_of_measurement,
-                "original_name": entry.original_name,
-                "original_icon": entry.original_icon,
-            }
-            for entry in self.entities.values()
-        ]
+        data["entities"] = [_entry_to_dict(entry) for entry in self.entities.values()]
 
         return data
 
@@ -546,6 +551,27 @@ async def async_get_registry(hass: HomeAssistantType) -> EntityRegistry:
     return reg
 
 
+def _entry_to_dict(entry: RegistryEntry) -> Dict[str, Any]:
+    """Return the stored data of a registry entry."""
+    return {
+        "entity_id": entry.entity_id,
+        "config_entry_id": entry.config_entry_id,
+        "device_id": entry.device_id,
+        "area_id": entry.area_id,
+        "unique_id": entry.unique_id,
+        "platform": entry.platform,
+        "name": entry.name,
+        "icon": entry.icon,
+        "disabled_by": entry.disabled_by,
+        "capabilities": entry.capabilities,
+        "supported_features": entry.supported_features,
+        "device_class": entry.device_class,
+        "unit_of_measurement": entry.unit_of_measurement,
+        "original_name": entry.original_name,
+        "original_icon": entry.original_icon,
+    }
+
+
 @callback
 def async_entries_for_device(
     registry: EntityRegistry, device_id: str
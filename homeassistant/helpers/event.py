@@ -4,6 +4,8 @@ import copy
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import functools as ft
+import heapq
+import itertools
 import logging
 import time
 from typing import (
@@ -62,6 +64,15 @@ TRACK_STATE_REMOVED_DOMAIN_LISTENER = "track_state_removed_domain_listener"
 TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS = "track_entity_registry_updated_callbacks"
 TRACK_ENTITY_REGISTRY_UPDATED_LISTENER = "track_entity_registry_updated_listener"
 
+TRACK_TEMPLATE_INDEX = "track_template_index"
+
+DATA_TIMER_SCHEDULER = "timer_scheduler"
+DATA_TIME_PATTERN_GROUPS = "time_pattern_groups"
+
+# Rebuild the timer heap when more than half of it and at least this many
+# timers are cancelled
+TIMER_COMPACT_MIN = 100
+
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
 _ENTITIES_LISTENER = "entities"
@@ -730,6 +741,139 @@ def async_track_template(
 track_template = threaded_listener_factory(async_track_template)
 
 
+class _TemplateTrackerIndex:
+    """Route state changes to the templates that reference them.
+
+    All template trackers share one state_changed listener. Each template
+    is indexed by the entity ids and domains it references, or as tracking
+    all states, so a state change is only checked against the templates
+    that can be affected by it.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the template tracker index."""
+        self.hass = hass
+        self._entities: Dict[str, Dict[_TrackTemplateResultInfo, Set[Template]]] = {}
+        self._domains: Dict[str, Dict[_TrackTemplateResultInfo, Set[Template]]] = {}
+        self._all_states: Dict[_TrackTemplateResultInfo, Set[Template]] = {}
+        self._trackers: Dict[_TrackTemplateResultInfo, Dict[Template, TrackStates]] = {}
+        self._listener: Optional[CALLBACK_TYPE] = None
+
+    @callback
+    def async_update(
+        self,
+        tracker: "_TrackTemplateResultInfo",
+        template: Template,
+        track_states: TrackStates,
+    ) -> None:
+        """Replace the states tracked for a template of a tracker."""
+        templates = self._trackers.setdefault(tracker, {})
+        last_track_states = templates.get(template)
+        if last_track_states is not None:
+            if last_track_states == track_states:
+                return
+            self._remove(tracker, template, last_track_states)
+
+        templates[template] = track_states
+        if track_states.all_states:
+            self._all_states.setdefault(tracker, set()).add(template)
+        for entity_id in track_states.entities:
+            self._entities.setdefault(entity_id, {}).setdefault(tracker, set()).add(
+                template
+            )
+        for domain in track_states.domains:
+            self._domains.setdefault(domain, {}).setdefault(tracker, set()).add(
+                template
+            )
+
+        if self._listener is None:
+            self._listener = self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self._async_state_change_dispatcher
+            )
+
+    @callback
+    def async_remove(self, tracker: "_TrackTemplateResultInfo") -> None:
+        """Remove all templates of a tracker."""
+        for template, track_states in self._trackers.pop(tracker, {}).items():
+            self._remove(tracker, template, track_states)
+
+        if not self._trackers and self._listener is not None:
+            self._listener()
+            self._listener = None
+
+    @callback
+    def _remove(
+        self,
+        tracker: "_TrackTemplateResultInfo",
+        template: Template,
+        track_states: TrackStates,
+    ) -> None:
+        """Remove a template from the entity, domain and all states index."""
+        if track_states.all_states:
+            _discard_indexed_template(self._all_states, tracker, template)
+        for entity_id in track_states.entities:
+            trackers = self._entities[entity_id]
+            _discard_indexed_template(trackers, tracker, template)
+            if not trackers:
+                del self._entities[entity_id]
+        for domain in track_states.domains:
+            trackers = self._domains[domain]
+            _discard_indexed_template(trackers, tracker, template)
+            if not trackers:
+                del self._domains[domain]
+
+    @callback
+    def _async_state_change_dispatcher(self, event: Event) -> None:
+        """Refresh the templates that reference the changed entity."""
+        entity_id = event.data["entity_id"]
+        matches: Dict[_TrackTemplateResultInfo, Set[Template]] = {}
+        for trackers in (
+            self._entities.get(entity_id),
+            self._domains.get(split_entity_id(entity_id)[0]),
+            self._all_states,
+        ):
+            if not trackers:
+                continue
+            for tracker, templates in trackers.items():
+                matched = matches.get(tracker)
+                matches[tracker] = templates if matched is None else matched | templates
+
+        for tracker, templates in matches.items():
+            # A previous tracker may have removed this one
+            if tracker not in self._trackers:
+                continue
+            try:
+                tracker.async_refresh_templates(event, templates)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception(
+                    "Error while processing state changed for %s", entity_id
+                )
+
+
+@callback
+def _discard_indexed_template(
+    trackers: Dict["_TrackTemplateResultInfo", Set[Template]],
+    tracker: "_TrackTemplateResultInfo",
+    template: Template,
+) -> None:
+    """Discard a template of a tracker from an index entry."""
+    templates = trackers.get(tracker)
+    if templates is None:
+        return
+    templates.discard(template)
+    if not templates:
+        del trackers[tracker]
+
+
+@callback
+def _async_get_template_tracker_index(hass: HomeAssistant) -> _TemplateTrackerIndex:
+    """Return the template tracker index of hass."""
+    index: Optional[_TemplateTrackerIndex] = hass.data.get(TRACK_TEMPLATE_INDEX)
+    if index is None:
+        index = hass.data[TRACK_TEMPLATE_INDEX] = _TemplateTrackerIndex(hass)
+    return index
+
+
 class _TrackTemplateResultInfo:
     """Handle removal / refresh of tracker."""
 
@@ -751,7 +895,8 @@ class _TrackTemplateResultInfo:
 
         self._rate_limit = KeyedRateLimit(hass)
         self._info: Dict[Template, RenderInfo] = {}
-        self._track_state_changes: Optional[_TrackStateChangeFiltered] = None
+        self._index = _async_get_template_tracker_index(hass)
+        self._track_states: Dict[Template, TrackStates] = {}
         self._time_listeners: Dict[Template, Callable] = {}
 
     def async_setup(self, raise_on_template_error: bool) -> None:
@@ -770,9 +915,8 @@ class _TrackTemplateResultInfo:
                     exc_info=info.exception,
                 )
 
-        self._track_state_changes = async_track_state_change_filtered(
-            self.hass, _render_infos_to_track_states(self._info.values()), self._refresh
-        )
+        for template, info in self._info.items():
+            self._update_track_states(template, info)
         self._update_time_listeners()
         _LOGGER.debug(
             "Template group %s listens for %s",
@@ -783,9 +927,11 @@ class _TrackTemplateResultInfo:
     @property
     def listeners(self) -> Dict:
         """State changes that will cause a re-render."""
-        assert self._track_state_changes
+        track_states = _combine_track_states(self._track_states.values())
         return {
-            **self._track_state_changes.listeners,
+            _ALL_LISTENER: track_states.all_states,
+            _ENTITIES_LISTENER: track_states.entities,
+            _DOMAINS_LISTENER: track_states.domains,
             "time": bool(self._time_listeners),
         }
 
@@ -822,8 +968,7 @@ class _TrackTemplateResultInfo:
     @callback
     def async_remove(self) -> None:
         """Cancel the listener."""
-        assert self._track_state_changes
-        self._track_state_changes.async_remove()
+        self._index.async_remove(self)
         self._rate_limit.async_remove()
         for template in list(self._time_listeners):
             self._time_listeners.pop(template)()
@@ -833,6 +978,29 @@ class _TrackTemplateResultInfo:
         """Force recalculate the template."""
         self._refresh(None)
 
+    @callback
+    def _update_track_states(self, template: Template, info: RenderInfo) -> None:
+        """Index the states a template re-renders for."""
+        track_states = _render_infos_to_track_states([info])
+        self._track_states[template] = track_states
+        self._index.async_update(self, template, track_states)
+
+    @callback
+    def async_refresh_templates(self, event: Event, templates: Set[Template]) -> None:
+        """Refresh the templates that reference the entity of a state change."""
+        if len(self._track_states) == len(templates):
+            self._refresh(event)
+            return
+
+        self._refresh(
+            event,
+            track_templates=[
+                track_template_
+                for track_template_ in self._track_templates
+                if track_template_.template in templates
+            ],
+        )
+
     def _render_template_if_ready(
         self,
         track_template_: TrackTemplate,
@@ -917,7 +1085,7 @@ class _TrackTemplateResultInfo:
         rate limit was hit.
         """
         updates = []
-        info_changed = False
+        info_changed = set()
         now = event.time_fired if not replayed and event else dt_util.utcnow()
 
         for track_template_ in track_templates or self._track_templates:
@@ -928,23 +1096,20 @@ class _TrackTemplateResultInfo:
             template = track_template_.template
             self._setup_time_listener(template, self._info[template].has_time)
 
-            info_changed = True
+            info_changed.add(template)
 
             if isinstance(update, TrackTemplateResult):
                 updates.append(update)
 
         if info_changed:
-            assert self._track_state_changes
-            self._track_state_changes.async_update_listeners(
-                _render_infos_to_track_states(
-                    [
-                        _suppress_domain_all_in_render_info(self._info[template])
-                        if self._rate_limit.async_has_timer(template)
-                        else self._info[template]
-                        for template in self._info
-                    ]
+            for template in info_changed:
+                info = self._info[template]
+                self._update_track_states(
+                    template,
+                    _suppress_domain_all_in_render_info(info)
+                    if self._rate_limit.async_has_timer(template)
+                    else info,
                 )
-            )
             _LOGGER.debug(
                 "Template group %s listens for %s",
                 self._track_templates,
@@ -1117,6 +1282,112 @@ def async_track_point_in_time(
 track_point_in_time = threaded_listener_factory(async_track_point_in_time)
 
 
+class _Timer:
+    """A timer of the timer scheduler."""
+
+    __slots__ = ["action", "cancelled", "done"]
+
+    def __init__(self, action: Callable[[], None]) -> None:
+        """Initialize the timer."""
+        self.action = action
+        self.cancelled = False
+        self.done = False
+
+
+class _TimerScheduler:
+    """Run the point in time listeners from one heap.
+
+    Only the earliest timer is scheduled on the event loop. When it fires,
+    all timers that are due run in one batch, so timers set for the same
+    time share a single loop callback. Timers are only run once they are
+    due as measured by utcnow(), the loop may fire a little early.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the timer scheduler."""
+        self.hass = hass
+        self._heap: List[Tuple[float, int, _Timer]] = []
+        self._counter = itertools.count()
+        self._cancelled = 0
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._handle_when: Optional[float] = None
+        self._running = False
+
+    @callback
+    def async_schedule(self, when: float, action: Callable[[], None]) -> _Timer:
+        """Schedule action to run at the UTC timestamp when."""
+        timer = _Timer(action)
+        heapq.heappush(self._heap, (when, next(self._counter), timer))
+        if not self._running and (
+            self._handle_when is None or when < self._handle_when
+        ):
+            self._async_arm(when)
+        return timer
+
+    @callback
+    def async_cancel(self, timer: _Timer) -> None:
+        """Cancel a timer that has not run yet."""
+        if timer.cancelled or timer.done:
+            return
+        timer.cancelled = True
+        self._cancelled += 1
+        if self._cancelled > max(TIMER_COMPACT_MIN, len(self._heap) // 2):
+            self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+    @callback
+    def _async_arm(self, when: float) -> None:
+        """Schedule the loop callback for the timer due at when."""
+        if self._handle is not None:
+            self._handle.cancel()
+        loop = self.hass.loop
+        self._handle_when = when
+        self._handle = loop.call_at(loop.time() + when - time.time(), self._async_run)
+
+    @callback
+    def _async_run(self) -> None:
+        """Run the due timers and schedule the next one."""
+        self._handle = None
+        self._handle_when = None
+        now = time_tracker_utcnow().timestamp()
+        heap = self._heap
+        due = []
+        # Timers scheduled by the due ones run in a later batch
+        while heap and heap[0][0] <= now:
+            timer = heapq.heappop(heap)[2]
+            if timer.cancelled:
+                self._cancelled -= 1
+                continue
+            timer.done = True
+            due.append(timer)
+
+        self._running = True
+        try:
+            for timer in due:
+                try:
+                    timer.action()
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error running timer %s", timer.action)
+        finally:
+            self._running = False
+
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+            self._cancelled -= 1
+        if heap:
+            self._async_arm(heap[0][0])
+
+
+@callback
+def _async_get_timer_scheduler(hass: HomeAssistant) -> _TimerScheduler:
+    """Return the timer scheduler of hass."""
+    scheduler: Optional[_TimerScheduler] = hass.data.get(DATA_TIMER_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[DATA_TIMER_SCHEDULER] = _TimerScheduler(hass)
+    return scheduler
+
+
 @callback
 @bind_hass
 def async_track_point_in_utc_time(
@@ -1132,37 +1403,16 @@ def async_track_point_in_utc_time(
     # having to figure out how to call the action every time its called.
     job = action if isinstance(action, HassJob) else HassJob(action)
 
-    cancel_callback: Optional[asyncio.TimerHandle] = None
-
-    @callback
-    def run_action() -> None:
-        """Call the action."""
-        nonlocal cancel_callback
-
-        now = time_tracker_utcnow()
-
-        # Depending on the available clock support (including timer hardware
-        # and the OS kernel) it can happen that we fire a little bit too early
-        # as measured by utcnow(). That is bad when callbacks have assumptions
-        # about the current time. Thus, we rearm the timer for the remaining
-        # time.
-        delta = (utc_point_in_time - now).total_seconds()
-        if delta > 0:
-            _LOGGER.debug("Called %f seconds too early, rearming", delta)
-
-            cancel_callback = hass.loop.call_later(delta, run_action)
-            return
-
-        hass.async_run_hass_job(job, utc_point_in_time)
-
-    delta = utc_point_in_time.timestamp() - time.time()
-    cancel_callback = hass.loop.call_later(delta, run_action)
+    scheduler = _async_get_timer_scheduler(hass)
+    timer = scheduler.async_schedule(
+        utc_point_in_time.timestamp(),
+        ft.partial(hass.async_run_hass_job, job, utc_point_in_time),
+    )
 
     @callback
     def unsub_point_in_time_listener() -> None:
-        """Cancel the call_later."""
-        assert cancel_callback is not None
-        cancel_callback.cancel()
+        """Cancel the timer."""
+        scheduler.async_cancel(timer)
 
     return unsub_point_in_time_listener
 
@@ -1344,40 +1594,100 @@ def async_track_utc_time_change(
     matching_minutes = dt_util.parse_time_expression(minute, 0, 59)
     matching_hours = dt_util.parse_time_expression(hour, 0, 23)
 
-    def calculate_next(now: datetime) -> datetime:
-        """Calculate and set the next time the trigger should fire."""
-        localized_now = dt_util.as_local(now) if local else now
-        return dt_util.find_next_time_expression_time(
-            localized_now, matching_seconds, matching_minutes, matching_hours
+    # Listeners of the same pattern share the timer and the calculation
+    # of the next time
+    pattern = (
+        tuple(matching_seconds),
+        tuple(matching_minutes),
+        tuple(matching_hours),
+        local,
+    )
+    groups: Dict[Tuple, _TimePatternGroup] = hass.data.setdefault(
+        DATA_TIME_PATTERN_GROUPS, {}
+    )
+    group = groups.get(pattern)
+    if group is None:
+        group = groups[pattern] = _TimePatternGroup(
+            hass, pattern, matching_seconds, matching_minutes, matching_hours, local
         )
 
-    time_listener: Optional[CALLBACK_TYPE] = None
+    return group.async_add(job)
 
-    @callback
-    def pattern_time_change_listener(_: datetime) -> None:
-        """Listen for matching time_changed events."""
-        nonlocal time_listener
 
-        now = time_tracker_utcnow()
-        hass.async_run_hass_job(job, dt_util.as_local(now) if local else now)
+class _TimePatternGroup:
+    """Listeners of one time pattern, fired together."""
 
-        time_listener = async_track_point_in_utc_time(
-            hass,
-            pattern_time_change_listener,
-            calculate_next(now + timedelta(seconds=1)),
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        pattern: Tuple,
+        matching_seconds: List[int],
+        matching_minutes: List[int],
+        matching_hours: List[int],
+        local: bool,
+    ) -> None:
+        """Initialize the time pattern group."""
+        self.hass = hass
+        self.pattern = pattern
+        self.matching_seconds = matching_seconds
+        self.matching_minutes = matching_minutes
+        self.matching_hours = matching_hours
+        self.local = local
+        self.jobs: Dict[int, HassJob] = {}
+        self._counter = itertools.count()
+        self._time_listener: Optional[CALLBACK_TYPE] = None
+
+    def _calculate_next(self, now: datetime) -> datetime:
+        """Calculate the next time the pattern matches."""
+        localized_now = dt_util.as_local(now) if self.local else now
+        return dt_util.find_next_time_expression_time(
+            localized_now,
+            self.matching_seconds,
+            self.matching_minutes,
+            self.matching_hours,
         )
 
-    time_listener = async_track_point_in_utc_time(
-        hass, pattern_time_change_listener, calculate_next(dt_util.utcnow())
-    )
-
     @callback
-    def unsub_pattern_time_change_listener() -> None:
-        """Cancel the time listener."""
-        assert time_listener is not None
-        time_listener()
+    def async_add(self, job: HassJob) -> CALLBACK_TYPE:
+        """Add a listener and return a function to remove it."""
+        key = next(self._counter)
+        self.jobs[key] = job
+        if self._time_listener is None:
+            self._time_listener = async_track_point_in_utc_time(
+                self.hass,
+                self._async_pattern_time_change_listener,
+                self._calculate_next(dt_util.utcnow()),
+            )
 
-    return unsub_pattern_time_change_listener
+        @callback
+        def unsub_pattern_time_change_listener() -> None:
+            """Remove the listener, cancel the timer when it was the last."""
+            if self.jobs.pop(key, None) is None or self.jobs:
+                return
+            assert self._time_listener is not None
+            self._time_listener()
+            self._time_listener = None
+            del self.hass.data[DATA_TIME_PATTERN_GROUPS][self.pattern]
+
+        return unsub_pattern_time_change_listener
+
+    @callback
+    def _async_pattern_time_change_listener(self, _: datetime) -> None:
+        """Run the listeners and schedule the next match."""
+        now = time_tracker_utcnow()
+        fire_time = dt_util.as_local(now) if self.local else now
+        for job in list(self.jobs.values()):
+            try:
+                self.hass.async_run_hass_job(job, fire_time)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running time pattern listener %s", job)
+
+        if self.jobs:
+            self._time_listener = async_track_point_in_utc_time(
+                self.hass,
+                self._async_pattern_time_change_listener,
+                self._calculate_next(now + timedelta(seconds=1)),
+            )
 
 
 track_utc_time_change = threaded_listener_factory(async_track_utc_time_change)
@@ -1457,6 +1767,19 @@ def _render_infos_to_track_states(render_infos: Iterable[RenderInfo]) -> TrackSt
     return TrackStates(False, *_entities_domains_from_render_infos(render_infos))
 
 
+@callback
+def _combine_track_states(track_states: Iterable[TrackStates]) -> TrackStates:
+    """Create a TrackStates dataclass tracking the states of all of them."""
+    entities: Set[str] = set()
+    domains: Set[str] = set()
+    for track_states_ in track_states:
+        if track_states_.all_states:
+            return TrackStates(True, set(), set())
+        entities.update(track_states_.entities)
+        domains.update(track_states_.domains)
+    return TrackStates(False, entities, domains)
+
+
 @callback
 def _event_triggers_rerender(event: Event, info: RenderInfo) -> bool:
     """Determine if a template should be re-rendered from an event."""
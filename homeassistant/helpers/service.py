@@ -1,6 +1,7 @@
 """Service calling related helpers."""
 import asyncio
 from functools import partial, wraps
+import json
 import logging
 from typing import (
     TYPE_CHECKING,
@@ -26,6 +27,10 @@ from homeassistant.const import (
     CONF_SERVICE_TEMPLATE,
     ENTITY_MATCH_ALL,
     ENTITY_MATCH_NONE,
+    EVENT_HOMEASSISTANT_STARTED,
+    EVENT_SERVICE_REGISTERED,
+    EVENT_SERVICE_REMOVED,
+    __version__,
 )
 import homeassistant.core as ha
 from homeassistant.exceptions import (
@@ -36,6 +41,7 @@ from homeassistant.exceptions import (
 )
 from homeassistant.helpers import template
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.json import JSONEncoder
 from homeassistant.helpers.template import Template
 from homeassistant.helpers.typing import ConfigType, HomeAssistantType, TemplateVarsType
 from homeassistant.loader import (
@@ -60,6 +66,18 @@ CONF_SERVICE_DATA_TEMPLATE = "data_template"
 _LOGGER = logging.getLogger(__name__)
 
 SERVICE_DESCRIPTION_CACHE = "service_description_cache"
+SERVICE_DESCRIPTION_INDEX = "service_description_index"
+SERVICE_DESCRIPTION_JSON = "service_description_json"
+AREA_ENTITY_IDS_CACHE = "service_area_entity_ids_cache"
+DATA_ENTITY_REFRESH_BATCH = "service_entity_refresh_batch"
+
+# Platforms with fewer entities than this times the targeted entity ids are
+# scanned instead of looking up the entity ids
+PLATFORM_SCAN_RATIO = 8
+
+DESCRIPTION_INDEX_STORAGE_KEY = "core.service_descriptions"
+DESCRIPTION_INDEX_STORAGE_VERSION = 1
+DESCRIPTION_INDEX_SAVE_DELAY = 10
 
 
 @bind_hass
@@ -240,32 +258,78 @@ async def async_extract_entity_ids(
             hass.helpers.device_registry.async_get_registry(),
             hass.helpers.entity_registry.async_get_registry(),
         )
+        area_entity_ids = _async_get_area_entity_ids(hass, dev_reg, ent_reg)
 
-        extracted.update(
-            entry.entity_id
-            for area_id in area_ids
-            for entry in hass.helpers.entity_registry.async_entries_for_area(
-                ent_reg, area_id
-            )
-        )
+        for area_id in area_ids:
+            extracted.update(area_entity_ids.get(area_id, ()))
 
-        devices = [
-            device
-            for area_id in area_ids
-            for device in hass.helpers.device_registry.async_entries_for_area(
-                dev_reg, area_id
-            )
-        ]
-        extracted.update(
-            entry.entity_id
-            for device in devices
-            for entry in hass.helpers.entity_registry.async_entries_for_device(
-                ent_reg, device.id
-            )
-            if not entry.area_id
+    return extracted
+
+
+@ha.callback
+def _async_get_area_entity_ids(
+    hass: HomeAssistantType, dev_reg: Any, ent_reg: Any
+) -> Dict[str, Set[str]]:
+    """Return the entity ids in each area.
+
+    An entity is in the area assigned to it, or else in the area of its
+    device. The result is cached until the device or entity registry is
+    updated.
+    """
+    cache = hass.data.get(AREA_ENTITY_IDS_CACHE)
+
+    if cache is None:
+
+        @ha.callback
+        def clear_cache(_event: ha.Event) -> None:
+            """Clear the cache when a registry is updated."""
+            hass.data[AREA_ENTITY_IDS_CACHE] = {}
+
+        hass.bus.async_listen(
+            hass.helpers.device_registry.EVENT_DEVICE_REGISTRY_UPDATED, clear_cache
         )
+        hass.bus.async_listen(
+            hass.helpers.entity_registry.EVENT_ENTITY_REGISTRY_UPDATED, clear_cache
+        )
+        cache = hass.data[AREA_ENTITY_IDS_CACHE] = {}
 
-    return extracted
+    # The registries are only replaced in tests
+    key = (id(dev_reg), id(ent_reg))
+    area_entity_ids: Optional[Dict[str, Set[str]]] = cache.get(key)
+
+    if area_entity_ids is None:
+        device_area_ids = {
+            device.id: device.area_id
+            for device in dev_reg.devices.values()
+            if device.area_id
+        }
+        area_entity_ids = {}
+        for entry in ent_reg.entities.values():
+            area_id = entry.area_id or device_area_ids.get(entry.device_id)
+            if area_id:
+                area_entity_ids.setdefault(area_id, set()).add(entry.entity_id)
+        cache.clear()
+        cache[key] = area_entity_ids
+
+    return area_entity_ids
+
+
+def _get_platform_entities(
+    platform: "EntityPlatform", entity_ids: Set[str]
+) -> List["Entity"]:
+    """Return the entities of a platform with one of the entity ids.
+
+    The entities are returned in the order of the platform.
+    """
+    entities = platform.entities
+    if len(entity_ids) * PLATFORM_SCAN_RATIO >= len(entities):
+        return [
+            entity for entity in entities.values() if entity.entity_id in entity_ids
+        ]
+    found = [entities[entity_id] for entity_id in entity_ids if entity_id in entities]
+    if len(found) > 1:
+        found.sort(key=lambda entity: platform.entity_order[entity.entity_id])
+    return found
 
 
 def _load_services_file(hass: HomeAssistantType, integration: Integration) -> JSON_TYPE:
@@ -284,11 +348,123 @@ def _load_services_file(hass: HomeAssistantType, integration: Integration) -> JS
         return {}
 
 
-def _load_services_files(
-    hass: HomeAssistantType, integrations: Iterable[Integration]
-) -> List[JSON_TYPE]:
-    """Load service files for multiple intergrations."""
-    return [_load_services_file(hass, integration) for integration in integrations]
+def _load_indexed_services_files(
+    hass: HomeAssistantType,
+    integrations: Iterable[Integration],
+    index: Dict[str, Dict[str, Any]],
+) -> List[Tuple[Optional[float], Dict[str, Any], bool]]:
+    """Load the service files that changed since they were indexed.
+
+    Returns the modification time, the descriptions and if they were loaded
+    from the file for each integration.
+    """
+    results = []
+    for integration in integrations:
+        try:
+            mtime: Optional[float] = (
+                (integration.file_path / "services.yaml").stat().st_mtime
+            )
+        except OSError:
+            mtime = None
+
+        indexed = index.get(integration.domain)
+        if mtime is not None and indexed is not None and indexed["mtime"] == mtime:
+            results.append((mtime, indexed["services"], False))
+            continue
+
+        content = _load_services_file(hass, integration)
+        services = {}
+        if isinstance(content, dict):
+            for service, yaml_description in content.items():
+                if not isinstance(yaml_description, dict):
+                    yaml_description = {}
+                services[service] = {
+                    "description": yaml_description.get("description", ""),
+                    "fields": yaml_description.get("fields", {}),
+                }
+        results.append((mtime, services, True))
+    return results
+
+
+class _DescriptionIndex:
+    """Descriptions parsed from the services.yaml files of previous runs.
+
+    The descriptions of a domain are reused as long as the modification time
+    of its services.yaml file is the same. The index is dropped when Home
+    Assistant is upgraded.
+    """
+
+    def __init__(self, hass: HomeAssistantType) -> None:
+        """Initialize the index."""
+        # pylint: disable=import-outside-toplevel
+        from homeassistant.helpers.storage import Store
+
+        self.hass = hass
+        self._store = Store(
+            hass,
+            DESCRIPTION_INDEX_STORAGE_VERSION,
+            DESCRIPTION_INDEX_STORAGE_KEY,
+            private=True,
+            compact=True,
+        )
+        self._domains: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+
+    async def async_load_services_files(
+        self, integrations: List[Integration]
+    ) -> List[Dict[str, Any]]:
+        """Return the descriptions in the services.yaml files of integrations."""
+        if not self._loaded:
+            data = await self._store.async_load()
+            self._loaded = True
+            if isinstance(data, dict) and data.get("version") == __version__:
+                for domain, indexed in data["domains"].items():
+                    self._domains.setdefault(domain, indexed)
+
+        results = await self.hass.async_add_executor_job(
+            _load_indexed_services_files, self.hass, integrations, self._domains
+        )
+
+        changed = False
+        contents = []
+        for integration, (mtime, services, loaded) in zip(integrations, results):
+            contents.append(services)
+            if loaded and mtime is not None:
+                self._domains[integration.domain] = {
+                    "mtime": mtime,
+                    "services": services,
+                }
+                changed = True
+
+        if changed:
+            self._store.async_delay_save(
+                self._data_to_save, DESCRIPTION_INDEX_SAVE_DELAY
+            )
+
+        return contents
+
+    @ha.callback
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the data of the index to store."""
+        return {"version": __version__, "domains": self._domains}
+
+
+class _DescriptionsJson:
+    """Serialized descriptions of all services."""
+
+    __slots__ = ["generation", "json"]
+
+    def __init__(self) -> None:
+        """Initialize the serialized descriptions."""
+        # Increased when a service is registered, removed or described
+        self.generation = 0
+        self.json: Optional[str] = None
+
+    @ha.callback
+    def async_invalidate(self, _: Optional[ha.Event] = None) -> None:
+        """Drop the serialized descriptions."""
+        self.generation += 1
+        self.json = None
 
 
 @bind_hass
@@ -318,9 +494,11 @@ async def async_get_all_descriptions(
             *(async_get_integration(hass, domain) for domain in missing),
         )
 
-        contents = await hass.async_add_executor_job(
-            _load_services_files, hass, integrations
-        )
+        index = hass.data.get(SERVICE_DESCRIPTION_INDEX)
+        if index is None:
+            index = hass.data[SERVICE_DESCRIPTION_INDEX] = _DescriptionIndex(hass)
+
+        contents = await index.async_load_services_files(integrations)
 
         for domain, content in zip(missing, contents):
             loaded[domain] = content
@@ -352,6 +530,51 @@ async def async_get_all_descriptions(
     return descriptions
 
 
+@bind_hass
+async def async_get_all_descriptions_json(hass: HomeAssistantType) -> str:
+    """Return the descriptions for all service calls serialized as JSON.
+
+    The JSON is reused until a service is registered, removed or described.
+
+    Raises ValueError or TypeError if a description is not JSON serializable.
+    """
+    descriptions_json: Optional[_DescriptionsJson] = hass.data.get(
+        SERVICE_DESCRIPTION_JSON
+    )
+    if descriptions_json is None:
+        descriptions_json = hass.data[SERVICE_DESCRIPTION_JSON] = _DescriptionsJson()
+        hass.bus.async_listen(
+            EVENT_SERVICE_REGISTERED, descriptions_json.async_invalidate
+        )
+        hass.bus.async_listen(EVENT_SERVICE_REMOVED, descriptions_json.async_invalidate)
+
+    if descriptions_json.json is not None:
+        return descriptions_json.json
+
+    generation = descriptions_json.generation
+    result = json.dumps(
+        await async_get_all_descriptions(hass), cls=JSONEncoder, allow_nan=False
+    )
+    if descriptions_json.generation == generation:
+        descriptions_json.json = result
+    return result
+
+
+@ha.callback
+@bind_hass
+def async_build_descriptions_on_start(hass: HomeAssistantType) -> None:
+    """Build the descriptions of all services once Home Assistant started."""
+
+    async def _async_build(_: ha.Event) -> None:
+        """Build the descriptions in the background."""
+        try:
+            await async_get_all_descriptions_json(hass)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.debug("Unable to build the service descriptions", exc_info=True)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _async_build)
+
+
 @ha.callback
 @bind_hass
 def async_set_service_schema(
@@ -367,6 +590,10 @@ def async_set_service_schema(
 
     hass.data[SERVICE_DESCRIPTION_CACHE][f"{domain}.{service}"] = description
 
+    descriptions_json = hass.data.get(SERVICE_DESCRIPTION_JSON)
+    if descriptions_json is not None:
+        descriptions_json.async_invalidate()
+
 
 @bind_hass
 async def entity_service_call(
@@ -375,10 +602,14 @@ async def entity_service_call(
     func: Union[str, Callable[..., Any]],
     call: ha.ServiceCall,
     required_features: Optional[Iterable[int]] = None,
+    coalesce: bool = False,
 ) -> None:
     """Handle an entity service call.
 
     Calls all platforms simultaneously.
+
+    With coalesce, a call of the service that is still waiting for its turn
+    to be handled by an entity is dropped when a newer one comes in.
     """
     if call.context.user_id:
         user = await hass.auth.async_get_user(call.context.user_id)
@@ -417,13 +648,7 @@ async def entity_service_call(
             if target_all_entities:
                 entity_candidates.extend(platform.entities.values())
             else:
-                entity_candidates.extend(
-                    [
-                        entity
-                        for entity in platform.entities.values()
-                        if entity.entity_id in entity_ids
-                    ]
-                )
+                entity_candidates.extend(_get_platform_entities(platform, entity_ids))
 
     elif target_all_entities:
         # If we target all entities, we will select all entities the user
@@ -440,10 +665,7 @@ async def entity_service_call(
     else:
         for platform in platforms:
             platform_entities = []
-            for entity in platform.entities.values():
-
-                if entity.entity_id not in entity_ids:
-                    continue
+            for entity in _get_platform_entities(platform, entity_ids):
 
                 if not entity_perms(entity.entity_id, POLICY_CONTROL):
                     raise Unauthorized(
@@ -486,10 +708,17 @@ async def entity_service_call(
     if not entities:
         return
 
+    coalesce_key = (call.domain, call.service) if coalesce else None
+
+    # asyncio.wait wraps coroutines in tasks anyway, and newer Python versions
+    # no longer accept coroutines, so the tasks are created for every call.
     done, pending = await asyncio.wait(
         [
-            entity.async_request_call(
-                _handle_entity_call(hass, entity, func, data, call.context)
+            hass.async_create_task(
+                entity.async_request_call(
+                    _handle_entity_call(hass, entity, func, data, call.context),
+                    coalesce_key,
+                )
             )
             for entity in entities
         ]
@@ -498,7 +727,7 @@ async def entity_service_call(
     for future in done:
         future.result()  # pop exception if have
 
-    tasks = []
+    polling_entities = []
 
     for entity in entities:
         if not entity.should_poll:
@@ -507,13 +736,65 @@ async def entity_service_call(
         # Context expires if the turn on commands took a long time.
         # Set context again so it's there when we update
         entity.async_set_context(call.context)
-        tasks.append(entity.async_update_ha_state(True))
+        polling_entities.append(entity)
+
+    if polling_entities:
+        await _async_refresh_entities(hass, polling_entities)
+
+
+class _EntityRefreshBatch:
+    """Polling entities to refresh after service calls."""
+
+    __slots__ = ["entities", "tasks"]
+
+    def __init__(self, tasks: asyncio.Future) -> None:
+        """Initialize the batch."""
+        self.entities: Dict[str, "Entity"] = {}
+        # Resolves to the refresh task of each entity once the batch started
+        self.tasks = tasks
+
+
+async def _async_refresh_entities(
+    hass: HomeAssistantType, entities: List["Entity"]
+) -> None:
+    """Refresh polling entities after a service call.
 
-    if tasks:
-        done, pending = await asyncio.wait(tasks)
-        assert not pending
-        for future in done:
-            future.result()  # pop exception if have
+    The refreshes of service calls handled at the same time are batched
+    into one pass, which refreshes each entity once. Each call only waits
+    for and raises the errors of the refreshes of its own entities.
+    """
+    batch: Optional[_EntityRefreshBatch] = hass.data.get(DATA_ENTITY_REFRESH_BATCH)
+    if batch is None:
+        batch = hass.data[DATA_ENTITY_REFRESH_BATCH] = _EntityRefreshBatch(
+            hass.loop.create_future()
+        )
+        # Runs after the service calls finishing in this loop iteration
+        hass.async_create_task(_async_refresh_batch(hass, batch))
+
+    for entity in entities:
+        batch.entities[entity.entity_id] = entity
+
+    tasks = await asyncio.shield(batch.tasks)
+    done, pending = await asyncio.wait([tasks[entity.entity_id] for entity in entities])
+    assert not pending
+    for future in done:
+        future.result()  # pop exception if have
+
+
+async def _async_refresh_batch(
+    hass: HomeAssistantType, batch: _EntityRefreshBatch
+) -> None:
+    """Refresh the entities of a batch."""
+    del hass.data[DATA_ENTITY_REFRESH_BATCH]
+
+    tasks = {
+        entity_id: hass.async_create_task(entity.async_update_ha_state(True))
+        for entity_id, entity in batch.entities.items()
+    }
+    batch.tasks.set_result(tasks)
+    # The errors are raised in the service calls, which may have been
+    # cancelled before they retrieved them.
+    await asyncio.gather(*tasks.values(), return_exceptions=True)
 
 
 async def _handle_entity_call(
@@ -1,9 +1,11 @@
 """Helper to help store data."""
 import asyncio
+import json
 from json import JSONEncoder
 import logging
 import os
-from typing import Any, Callable, Dict, List, Optional, Type, Union
+import secrets
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type, Union
 
 from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
 from homeassistant.core import CALLBACK_TYPE, CoreState, HomeAssistant, callback
@@ -17,6 +19,37 @@ from homeassistant.util import json as json_util
 STORAGE_DIR = ".storage"
 _LOGGER = logging.getLogger(__name__)
 
+JOURNAL_POSTFIX = ".journal"
+# Key of the data written to disk holding the id its journal records refer to
+JOURNAL_ID_KEY = "journal_id"
+# Number of journal records after which the journal is compacted into the data
+JOURNAL_COMPACT_SIZE = 500
+
+# A change of an item in a list of dicts of the stored data:
+# (list key, item key field, item key, item or None if removed)
+# In the journal on disk each record is prefixed with the journal id of the
+# data it applies to.
+JournalRecord = Tuple[str, str, Any, Optional[Dict[str, Any]]]
+
+
+def apply_journal_records(data: Dict, records: Iterable[JournalRecord]) -> None:
+    """Apply journal records to the stored data in place."""
+    lists: Dict[Tuple[str, str], Dict[Any, Dict]] = {}
+
+    for list_key, key_field, key, item in records:
+        items = lists.get((list_key, key_field))
+        if items is None:
+            items = lists[(list_key, key_field)] = {
+                existing[key_field]: existing for existing in data.get(list_key, [])
+            }
+        if item is None:
+            items.pop(key, None)
+        else:
+            items[key] = item
+
+    for (list_key, _), items in lists.items():
+        data[list_key] = list(items.values())
+
 
 @bind_hass
 async def async_migrator(
@@ -72,8 +105,12 @@ class Store:
         private: bool = False,
         *,
         encoder: Optional[Type[JSONEncoder]] = None,
+        compact: bool = False,
     ):
-        """Initialize storage class."""
+        """Initialize storage class.
+
+        Set compact to write the data without indentation.
+        """
         self.version = version
         self.key = key
         self.hass = hass
@@ -84,12 +121,25 @@ class Store:
         self._write_lock = asyncio.Lock()
         self._load_task: Optional[asyncio.Future] = None
         self._encoder = encoder
+        self._compact = compact
+        self._journal_data_func: Optional[Callable[[], Dict]] = None
+        self._journal_pending: List[JournalRecord] = []
+        # Records in the journal on disk, None if the data has to be written
+        # before the journal can be appended to
+        self._journal_size: Optional[int] = None
+        # Journal id of the data on disk, new for every write of the data
+        self._journal_id: Optional[str] = None
 
     @property
     def path(self):
         """Return the config path."""
         return self.hass.config.path(STORAGE_DIR, self.key)
 
+    @property
+    def journal_path(self):
+        """Return the path of the journal."""
+        return self.path + JOURNAL_POSTFIX
+
     async def async_load(self) -> Union[Dict, List, None]:
         """Load data.
 
@@ -121,12 +171,19 @@ class Store:
             if "data_func" in data:
                 data["data"] = data.pop("data_func")()
         else:
-            data = await self.hass.async_add_executor_job(
-                json_util.load_json, self.path
+            data, journal_id, journal_size = await self.hass.async_add_executor_job(
+                self._load_data
             )
 
             if data == {}:
                 return None
+            if data["version"] == self.version:
+                self._journal_id = journal_id
+                self._journal_size = journal_size
+
+        if self._journal_pending:
+            apply_journal_records(data["data"], self._journal_pending)
+
         if data["version"] == self.version:
             stored = data["data"]
         else:
@@ -140,6 +197,45 @@ class Store:
 
         return stored
 
+    def _load_data(self) -> Tuple[Dict, Optional[str], Optional[int]]:
+        """Load the data and apply the journal.
+
+        Returns the data, its journal id and the number of records in the
+        journal, None if the journal can't be appended to.
+        """
+        data = json_util.load_json(self.path)
+        journal_id = data.pop(JOURNAL_ID_KEY, None) if data else None
+
+        try:
+            with open(self.journal_path, encoding="utf-8") as journal_file:
+                lines = journal_file.readlines()
+        except FileNotFoundError:
+            return data, journal_id, 0
+        except OSError as err:
+            _LOGGER.error("Error reading journal for %s: %s", self.key, err)
+            return data, journal_id, 0
+
+        records = []
+        journal_size: Optional[int] = len(lines)
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Interrupted while appending, the rest was never written.
+                # Records appended after the torn line would be lost, write
+                # all data next time instead.
+                _LOGGER.warning("Ignoring incomplete journal of %s", self.key)
+                journal_size = None
+                break
+            # Records of older data are left when interrupted after writing
+            # the data and before removing the journal, they are included.
+            if record[0] == journal_id:
+                records.append(record[1:])
+
+        if data and records:
+            apply_journal_records(data["data"], records)
+        return data, journal_id, journal_size
+
     async def async_save(self, data: Union[Dict, List]) -> None:
         """Save data."""
         self._data = {"version": self.version, "key": self.key, "data": data}
@@ -165,6 +261,31 @@ class Store:
             self.hass, delay, self._async_callback_delayed_write
         )
 
+    @callback
+    def async_delay_save_journal(
+        self,
+        data_func: Callable[[], Dict],
+        records: Iterable[JournalRecord],
+        delay: float = 0,
+    ) -> None:
+        """Save changes to items of the data with an optional delay.
+
+        The changes are appended to a journal instead of writing all data.
+        Once the journal grows large, it is compacted by writing the data
+        returned by data_func.
+        """
+        self._journal_data_func = data_func
+        self._journal_pending.extend(records)
+
+        self._async_ensure_final_write_listener()
+
+        if self.hass.state == CoreState.stopping or self._unsub_delay_listener:
+            return
+
+        self._unsub_delay_listener = async_call_later(
+            self.hass, delay, self._async_callback_delayed_write
+        )
+
     @callback
     def _async_ensure_final_write_listener(self):
         """Ensure that we write if we quit before delay has passed."""
@@ -207,11 +328,29 @@ class Store:
             self._async_cleanup_delay_listener()
             self._async_cleanup_final_write_listener()
 
+            if self._data is None and self._journal_pending:
+                if (
+                    self._journal_size is not None
+                    and self._journal_size + len(self._journal_pending)
+                    <= JOURNAL_COMPACT_SIZE
+                ):
+                    await self._async_write_journal()
+                    return
+
+                # Compact the journal
+                self._data = {
+                    "version": self.version,
+                    "key": self.key,
+                    "data_func": self._journal_data_func,
+                }
+
             if self._data is None:
                 # Another write already consumed the data
                 return
 
             data = self._data
+            # The data includes all changes
+            self._journal_pending = []
 
             if "data_func" in data:
                 data["data"] = data.pop("data_func")()
@@ -224,14 +363,67 @@ class Store:
                 )
             except (json_util.SerializationError, json_util.WriteError) as err:
                 _LOGGER.error("Error writing config for %s: %s", self.key, err)
+            else:
+                self._journal_size = 0
+
+    async def _async_write_journal(self) -> None:
+        """Append the pending records to the journal, must hold the lock."""
+        records = self._journal_pending
+        self._journal_pending = []
+
+        try:
+            await self.hass.async_add_executor_job(
+                self._write_journal, self.journal_path, records
+            )
+        except (TypeError, ValueError, OSError) as err:
+            _LOGGER.error("Error writing journal for %s: %s", self.key, err)
+            # Write all data next time
+            self._journal_size = None
+        else:
+            self._journal_size += len(records)  # type: ignore
 
     def _write_data(self, path: str, data: Dict) -> None:
         """Write the data."""
         if not os.path.isdir(os.path.dirname(path)):
             os.makedirs(os.path.dirname(path))
 
+        # The data includes the changes in the journal. The new journal id
+        # makes sure the records left in the journal are not applied to the
+        # data if interrupted before the journal is removed.
+        journal_id = secrets.token_hex(8)
+
         _LOGGER.debug("Writing data for %s to %s", self.key, path)
-        json_util.save_json(path, data, self._private, encoder=self._encoder)
+        json_util.save_json(
+            path,
+            {**data, JOURNAL_ID_KEY: journal_id},
+            self._private,
+            encoder=self._encoder,
+            compact=self._compact,
+        )
+        self._journal_id = journal_id
+
+        try:
+            os.unlink(path + JOURNAL_POSTFIX)
+        except FileNotFoundError:
+            pass
+
+    def _write_journal(self, path: str, records: List[JournalRecord]) -> None:
+        """Append records to the journal."""
+        lines = "".join(
+            json.dumps(
+                [self._journal_id, *record], separators=(",", ":"), cls=self._encoder
+            )
+            + "\n"
+            for record in records
+        )
+        _LOGGER.debug("Appending %s records for %s to %s", len(records), self.key, path)
+        fd = os.open(
+            path,
+            os.O_WRONLY | os.O_APPEND | os.O_CREAT,
+            0o600 if self._private else 0o644,
+        )
+        with open(fd, "a", encoding="utf-8") as journal_file:
+            journal_file.write(lines)
 
     async def _async_migrate_func(self, old_version, old_data):
         """Migrate to the new version."""
@@ -242,7 +434,11 @@ class Store:
         self._async_cleanup_delay_listener()
         self._async_cleanup_final_write_listener()
 
-        try:
-            await self.hass.async_add_executor_job(os.unlink, self.path)
-        except FileNotFoundError:
-            pass
+        self._journal_pending = []
+        self._journal_size = None
+
+        for path in (self.path, self.journal_path):
+            try:
+                await self.hass.async_add_executor_job(os.unlink, path)
+            except FileNotFoundError:
+                pass
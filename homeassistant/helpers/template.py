@@ -5,13 +5,29 @@ import base64
 import collections.abc
 from datetime import datetime, timedelta
 from functools import partial, wraps
+import hashlib
 import json
 import logging
+import marshal
 import math
 from operator import attrgetter
 import random
 import re
-from typing import Any, Dict, Generator, Iterable, Optional, Type, Union
+import sys
+import threading
+from types import CodeType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 from urllib.parse import urlencode as urllib_urlencode
 import weakref
 
@@ -26,10 +42,12 @@ from homeassistant.const import (
     ATTR_LATITUDE,
     ATTR_LONGITUDE,
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_CLOSE,
     LENGTH_METERS,
     STATE_UNKNOWN,
+    __version__,
 )
-from homeassistant.core import State, callback, split_entity_id, valid_entity_id
+from homeassistant.core import Event, State, callback, split_entity_id, valid_entity_id
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers import location as loc_helper
 from homeassistant.helpers.typing import HomeAssistantType, TemplateVarsType
@@ -38,6 +56,9 @@ from homeassistant.util import convert, dt as dt_util, location as loc_util
 from homeassistant.util.async_ import run_callback_threadsafe
 from homeassistant.util.thread import ThreadWithException
 
+if TYPE_CHECKING:
+    from homeassistant.helpers.storage import Store
+
 # mypy: allow-untyped-calls, allow-untyped-defs
 # mypy: no-check-untyped-defs, no-warn-return-any
 
@@ -47,6 +68,7 @@ DATE_STR_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 _RENDER_INFO = "template.render_info"
 _ENVIRONMENT = "template.environment"
+_STATES_SNAPSHOT = "template.states_snapshot"
 
 _RE_JINJA_DELIMITERS = re.compile(r"\{%|\{\{|\{#")
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
@@ -70,6 +92,10 @@ _COLLECTABLE_STATE_ATTRIBUTES = {
 ALL_STATES_RATE_LIMIT = timedelta(minutes=1)
 DOMAIN_STATES_RATE_LIMIT = timedelta(seconds=1)
 
+CODE_CACHE_STORAGE_KEY = "template.code_cache"
+CODE_CACHE_STORAGE_VERSION = 1
+CODE_CACHE_SAVE_DELAY = 60
+
 
 @bind_hass
 def attach(hass: HomeAssistantType, obj: Any) -> None:
@@ -527,9 +553,14 @@ class Template:
 
         env = self._env
 
-        self._compiled = jinja2.Template.from_code(
-            env, self._compiled_code, env.globals, None
-        )
+        # Identical templates share the compiled template of the environment
+        compiled = env.compiled_templates.get(self.template)
+        if compiled is None:
+            compiled = env.compiled_templates[
+                self.template
+            ] = jinja2.Template.from_code(env, self._compiled_code, env.globals, None)
+
+        self._compiled = compiled
 
         return self._compiled
 
@@ -756,10 +787,39 @@ def _collect_state(hass: HomeAssistantType, entity_id: str) -> None:
         entity_collect.entities.add(entity_id)
 
 
-def _state_generator(hass: HomeAssistantType, domain: Optional[str]) -> Generator:
-    """State generator for a domain or all states."""
-    for state in sorted(hass.states.async_all(domain), key=attrgetter("entity_id")):
-        yield TemplateState(hass, state, collect=False)
+class _StatesSnapshot:
+    """Sorted template states of the state machine at one version."""
+
+    __slots__ = ("version", "domains")
+
+    def __init__(self, version: int) -> None:
+        """Initialize the states snapshot."""
+        self.version = version
+        self.domains: Dict[Optional[str], Tuple[TemplateState, ...]] = {}
+
+
+def _state_generator(hass: HomeAssistantType, domain: Optional[str]) -> Iterator:
+    """State iterator for a domain or all states.
+
+    The sorted states are shared by all templates rendered in the same
+    iteration of the event loop until a state changes.
+    """
+    version = hass.states.version
+    snapshot: Optional[_StatesSnapshot] = hass.data.get(_STATES_SNAPSHOT)
+    if snapshot is None or snapshot.version != version:
+        if snapshot is None:
+            hass.loop.call_soon(hass.data.pop, _STATES_SNAPSHOT, None)
+        snapshot = hass.data[_STATES_SNAPSHOT] = _StatesSnapshot(version)
+
+    states = snapshot.domains.get(domain)
+    if states is None:
+        states = snapshot.domains[domain] = tuple(
+            TemplateState(hass, state, collect=False)
+            for state in sorted(
+                hass.states.async_all(domain), key=attrgetter("entity_id")
+            )
+        )
+    return iter(states)
 
 
 def _get_state_if_valid(
@@ -1297,6 +1357,7 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         super().__init__()
         self.hass = hass
         self.template_cache = weakref.WeakValueDictionary()
+        self.compiled_templates = weakref.WeakValueDictionary()
         self.filters["round"] = forgiving_round
         self.filters["multiply"] = multiply
         self.filters["log"] = logarithm
@@ -1406,9 +1467,126 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         cached = self.template_cache.get(source)
 
         if cached is None:
-            cached = self.template_cache[source] = super().compile(source)
+            cached = _CODE_CACHE.get(self, source)
+            if cached is None:
+                cached = super().compile(source)
+                _CODE_CACHE.add(self, source, cached)
+            self.template_cache[source] = cached
+
+        return cached
+
+
+class TemplateCodeCache:
+    """Compiled template code of all environments, persisted across restarts.
+
+    The code is stored marshalled in .storage, keyed by a hash of the
+    template and the kind of environment that compiled it. The cache is
+    dropped when Home Assistant, Jinja or Python is upgraded. Only the code
+    used since the cache was loaded is saved, so removed templates expire.
+    Templates are also compiled in executor threads, the lock guards the
+    code and the keys used.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the template code cache."""
+        self._code: Dict[str, str] = {}
+        self._used: Set[str] = set()
+        self._lock = threading.Lock()
+        self._hass: Optional[HomeAssistantType] = None
+        self._store: Optional["Store"] = None
+        self._save_pending = False
+
+    @staticmethod
+    def _key(env: TemplateEnvironment, source: str) -> str:
+        """Return the cache key of a template source."""
+        kind = "hass" if env.hass is not None else "static"
+        return hashlib.sha256(f"{kind}:{source}".encode()).hexdigest()
+
+    def get(self, env: TemplateEnvironment, source: str) -> Optional[CodeType]:
+        """Return the cached code of a template source."""
+        key = self._key(env, source)
+        with self._lock:
+            code = self._code.get(key)
+        if code is None:
+            return None
 
+        try:
+            cached = marshal.loads(base64.b64decode(code))
+        except (ValueError, EOFError, TypeError):
+            with self._lock:
+                self._code.pop(key, None)
+            return None
+
+        with self._lock:
+            self._used.add(key)
         return cached
 
+    def add(self, env: TemplateEnvironment, source: str, code: CodeType) -> None:
+        """Add the compiled code of a template source."""
+        if self._hass is None:
+            return
+
+        key = self._key(env, source)
+        code_str = base64.b64encode(marshal.dumps(code)).decode()
+        with self._lock:
+            self._code[key] = code_str
+            self._used.add(key)
+            schedule_save = not self._save_pending
+            self._save_pending = True
+        if schedule_save:
+            self._hass.add_job(self._async_schedule_save)
+
+    async def async_load(self, hass: HomeAssistantType) -> None:
+        """Load the cached code and save new code to the storage of hass."""
+        # pylint: disable=import-outside-toplevel
+        from homeassistant.helpers.storage import Store
+
+        store = Store(
+            hass, CODE_CACHE_STORAGE_VERSION, CODE_CACHE_STORAGE_KEY, private=True
+        )
+        data = await store.async_load()
+        if isinstance(data, dict) and data.get("version") == _code_cache_version():
+            with self._lock:
+                for key, code in data["code"].items():
+                    self._code.setdefault(key, code)
+
+        self._hass = hass
+        self._store = store
+
+        @callback
+        def _async_detach(_: Event) -> None:
+            """Stop saving to the storage of hass."""
+            if self._hass is hass:
+                self._hass = None
+                self._store = None
+                self._save_pending = False
 
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_detach)
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Save the cache once templates stopped being compiled."""
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_save, CODE_CACHE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the code used since the cache was loaded."""
+        with self._lock:
+            self._save_pending = False
+            code = {key: self._code[key] for key in self._used if key in self._code}
+        return {"version": _code_cache_version(), "code": code}
+
+
+def _code_cache_version() -> str:
+    """Return the versions that invalidate the template code cache."""
+    return f"{__version__}-{jinja2.__version__}-{sys.implementation.cache_tag}"
+
+
+_CODE_CACHE = TemplateCodeCache()
 _NO_HASS_ENV = TemplateEnvironment(None)
+
+
+async def async_load_code_cache(hass: HomeAssistantType) -> None:
+    """Load the compiled templates of a previous run."""
+    await _CODE_CACHE.async_load(hass)
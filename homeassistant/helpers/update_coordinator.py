@@ -3,7 +3,17 @@ import asyncio
 from datetime import datetime, timedelta
 import logging
 from time import monotonic
-from typing import Awaitable, Callable, Generic, List, Optional, TypeVar
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+)
 import urllib.error
 
 import aiohttp
@@ -37,13 +47,22 @@ class DataUpdateCoordinator(Generic[T]):
         update_interval: Optional[timedelta] = None,
         update_method: Optional[Callable[[], Awaitable[T]]] = None,
         request_refresh_debouncer: Optional[Debouncer] = None,
+        group: Optional["DataUpdateCoordinatorGroup"] = None,
     ):
-        """Initialize global data updater."""
+        """Initialize global data updater.
+
+        A coordinator in a group fetches its data with the group and refreshes
+        on the update interval of the group.
+        """
         self.hass = hass
         self.logger = logger
         self.name = name
         self.update_method = update_method
         self.update_interval = update_interval
+        self.group = group
+
+        if group is not None:
+            self.update_interval = group.update_interval
 
         self.data: Optional[T] = None
 
@@ -89,19 +108,30 @@ class DataUpdateCoordinator(Generic[T]):
         """Remove data update."""
         self._listeners.remove(update_callback)
 
-        if not self._listeners and self._unsub_refresh:
+        if not self._listeners:
+            self._async_unsub_refresh()
+
+    @callback
+    def _async_unsub_refresh(self) -> None:
+        """Cancel the scheduled refresh."""
+        if self._unsub_refresh:
             self._unsub_refresh()
             self._unsub_refresh = None
 
+        if self.group is not None:
+            self.group.async_unschedule_refresh(self)
+
     @callback
     def _schedule_refresh(self) -> None:
         """Schedule a refresh."""
         if self.update_interval is None:
             return
 
-        if self._unsub_refresh:
-            self._unsub_refresh()
-            self._unsub_refresh = None
+        self._async_unsub_refresh()
+
+        if self.group is not None:
+            self.group.async_schedule_refresh(self)
+            return
 
         # We _floor_ utcnow to create a schedule on a rounded second,
         # minimizing the time between the point and the real activation.
@@ -127,15 +157,15 @@ class DataUpdateCoordinator(Generic[T]):
 
     async def _async_update_data(self) -> Optional[T]:
         """Fetch the latest data from the source."""
+        if self.group is not None:
+            return await self.group.async_fetch(self)
         if self.update_method is None:
             raise NotImplementedError("Update method not implemented")
         return await self.update_method()
 
     async def async_refresh(self) -> None:
         """Refresh data."""
-        if self._unsub_refresh:
-            self._unsub_refresh()
-            self._unsub_refresh = None
+        self._async_unsub_refresh()
 
         self._debounced_refresh.async_cancel()
         start = monotonic()
@@ -195,9 +225,7 @@ class DataUpdateCoordinator(Generic[T]):
     @callback
     def async_set_updated_data(self, data: T) -> None:
         """Manually update data, notify listeners and reset refresh interval."""
-        if self._unsub_refresh:
-            self._unsub_refresh()
-            self._unsub_refresh = None
+        self._async_unsub_refresh()
 
         self._debounced_refresh.async_cancel()
 
@@ -215,6 +243,124 @@ class DataUpdateCoordinator(Generic[T]):
             update_callback()
 
 
+class DataUpdateCoordinatorGroup(Generic[T]):
+    """Class to fetch the data of multiple coordinators in one call.
+
+    The coordinators in the group refresh at the same time. Their pending
+    fetches are merged into one call of the update method, which receives
+    the coordinators and returns their data in the same order. An exception
+    returned in place of the data only fails the update of that coordinator.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        logger: logging.Logger,
+        *,
+        name: str,
+        update_interval: Optional[timedelta],
+        update_method: Callable[
+            [List[DataUpdateCoordinator[T]]], Awaitable[Sequence[Any]]
+        ],
+    ):
+        """Initialize the coordinator group."""
+        self.hass = hass
+        self.logger = logger
+        self.name = name
+        self.update_interval = update_interval
+        self.update_method = update_method
+        # Number of calls of the update method and of coordinator fetches
+        # merged into them
+        self.calls = 0
+        self.fetches = 0
+
+        self._job = HassJob(self._handle_refresh_interval)
+        self._unsub_refresh: Optional[CALLBACK_TYPE] = None
+        self._scheduled: Dict[DataUpdateCoordinator[T], None] = {}
+        self._pending: Dict[DataUpdateCoordinator[T], asyncio.Future] = {}
+
+    @callback
+    def async_schedule_refresh(self, coordinator: DataUpdateCoordinator[T]) -> None:
+        """Refresh a coordinator on the next refresh of the group."""
+        self._scheduled[coordinator] = None
+
+        if self._unsub_refresh or self.update_interval is None:
+            return
+
+        self._unsub_refresh = event.async_track_point_in_utc_time(
+            self.hass,
+            self._job,
+            utcnow().replace(microsecond=0) + self.update_interval,
+        )
+
+    @callback
+    def async_unschedule_refresh(self, coordinator: DataUpdateCoordinator[T]) -> None:
+        """Do not refresh a coordinator on the next refresh of the group."""
+        self._scheduled.pop(coordinator, None)
+
+        if not self._scheduled and self._unsub_refresh:
+            self._unsub_refresh()
+            self._unsub_refresh = None
+
+    async def _handle_refresh_interval(self, _now: datetime) -> None:
+        """Handle a refresh interval occurrence."""
+        self._unsub_refresh = None
+        coordinators = list(self._scheduled)
+        self._scheduled.clear()
+        await asyncio.gather(
+            *(coordinator.async_refresh() for coordinator in coordinators)
+        )
+
+    async def async_fetch(self, coordinator: DataUpdateCoordinator[T]) -> T:
+        """Fetch the data of a coordinator together with the other pending ones."""
+        future = self._pending.get(coordinator)
+        if future is None:
+            if not self._pending:
+                # Runs after the fetches started in this loop iteration
+                self.hass.async_create_task(self._async_fetch_pending())
+            future = self._pending[coordinator] = self.hass.loop.create_future()
+        return await future  # type: ignore
+
+    async def _async_fetch_pending(self) -> None:
+        """Fetch the data of the pending coordinators in one call."""
+        pending = self._pending
+        self._pending = {}
+        coordinators = list(pending)
+        self.calls += 1
+        self.fetches += len(coordinators)
+        start = monotonic()
+
+        try:
+            results = await self.update_method(coordinators)
+            if len(results) != len(coordinators):
+                raise UpdateFailed(
+                    f"Expected data for {len(coordinators)} coordinators, "
+                    f"got {len(results)}"
+                )
+        except asyncio.CancelledError:
+            for future in pending.values():
+                future.cancel()
+            raise
+        except Exception as err:  # pylint: disable=broad-except
+            results = [err] * len(coordinators)
+
+        self.logger.debug(
+            "Finished fetching %s data for %s coordinators in %.3f seconds",
+            self.name,
+            len(coordinators),
+            monotonic() - start,
+        )
+
+        for future, result in zip(pending.values(), results):
+            if future.done():
+                # The refresh of the coordinator was cancelled
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
 class CoordinatorEntity(entity.Entity):
     """A class for entities using DataUpdateCoordinator."""
 
@@ -9,8 +9,12 @@ import functools as ft
 import importlib
 import json
 import logging
+import os
 import pathlib
+from stat import S_ISREG
 import sys
+import threading
+from timeit import default_timer as timer
 from types import ModuleType
 from typing import (
     TYPE_CHECKING,
@@ -25,6 +29,8 @@ from typing import (
     cast,
 )
 
+from homeassistant.const import __version__
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.generated.mqtt import MQTT
 from homeassistant.generated.ssdp import SSDP
 from homeassistant.generated.zeroconf import HOMEKIT, ZEROCONF
@@ -32,6 +38,7 @@ from homeassistant.generated.zeroconf import HOMEKIT, ZEROCONF
 # Typing imports that create a circular dependency
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.storage import Store
 
 CALLABLE_T = TypeVar("CALLABLE_T", bound=Callable)  # pylint: disable=invalid-name
 
@@ -40,6 +47,8 @@ _LOGGER = logging.getLogger(__name__)
 DATA_COMPONENTS = "components"
 DATA_INTEGRATIONS = "integrations"
 DATA_CUSTOM_COMPONENTS = "custom_components"
+DATA_MANIFEST_INDEX = "manifest_index"
+DATA_IMPORT_PROFILE = "import_profile"
 PACKAGE_CUSTOM_COMPONENTS = "custom_components"
 PACKAGE_BUILTIN = "homeassistant.components"
 CUSTOM_WARNING = (
@@ -52,6 +61,84 @@ _UNDEF = object()
 
 MAX_LOAD_CONCURRENTLY = 4
 
+# Time spent importing nested integration modules, per thread
+_IMPORT_STACK = threading.local()
+
+MANIFEST_INDEX_STORAGE_KEY = "core.manifest_index"
+MANIFEST_INDEX_STORAGE_VERSION = 1
+MANIFEST_INDEX_SAVE_DELAY = 30
+
+
+class LazyModule(ModuleType):
+    """A module that is only imported when one of its attributes is used.
+
+    Keeps heavy modules out of the import time of modules that only need
+    them in some code paths. Thread safe, as the import lock is held while
+    the module is imported.
+    """
+
+    def __getattr__(self, attr: str) -> Any:
+        """Import the module and fetch an attribute."""
+        return getattr(importlib.import_module(self.__name__), attr)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Return a module that is imported when an attribute is first used."""
+    return sys.modules.get(name) or LazyModule(name)
+
+
+def _import_integration_module(
+    hass: "HomeAssistant", domain: str, name: str
+) -> ModuleType:
+    """Import a module of an integration and profile the import.
+
+    Like python -X importtime, the cumulative time includes the modules
+    imported by the module. The self time of an integration excludes the
+    modules of other integrations imported through the loader meanwhile.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    stack = getattr(_IMPORT_STACK, "stack", None)
+    if stack is None:
+        stack = _IMPORT_STACK.stack = []
+
+    start = timer()
+    stack.append(0.0)
+    try:
+        return importlib.import_module(name)
+    finally:
+        nested = stack.pop()
+        cumulative = timer() - start
+        if stack:
+            stack[-1] += cumulative
+        profile = hass.data.setdefault(DATA_IMPORT_PROFILE, {})
+        entry = profile.get(domain)
+        if entry is None:
+            entry = profile[domain] = {
+                "domain": domain,
+                "cumulative": 0.0,
+                "self": 0.0,
+                "modules": [],
+            }
+        entry["cumulative"] += cumulative
+        entry["self"] += cumulative - nested
+        entry["modules"].append(name)
+
+
+def async_get_import_profile(hass: "HomeAssistant") -> List[Dict[str, Any]]:
+    """Return the import times of the integrations, slowest first.
+
+    Each entry has the domain, the cumulative and self import time in
+    seconds and the names of the imported modules.
+    """
+    return sorted(
+        hass.data.get(DATA_IMPORT_PROFILE, {}).values(),
+        key=lambda entry: entry["self"],
+        reverse=True,
+    )
+
 
 def manifest_from_legacy_module(domain: str, module: ModuleType) -> Dict:
     """Generate a manifest from a legacy module."""
@@ -65,6 +152,144 @@ def manifest_from_legacy_module(domain: str, module: ModuleType) -> Dict:
     }
 
 
+class ManifestIndex:
+    """Manifests and sub directories of the integration paths.
+
+    The index is persisted in .storage so a start does not have to read
+    and parse every manifest again. A manifest is only read again when the
+    modification time or size of its file changed, the sub directories of
+    a path only when the modification time of the path changed. The index
+    is dropped when Home Assistant is upgraded.
+    """
+
+    def __init__(
+        self,
+        hass: "HomeAssistant",
+        store: "Optional[Store]",
+        data: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Initialize the manifest index."""
+        if data is None or data.get("version") != __version__:
+            data = {}
+        self._hass = hass
+        self._store = store
+        self._manifests: Dict[str, Dict[str, Any]] = data.get("manifests", {})
+        self._directories: Dict[str, Dict[str, Any]] = data.get("directories", {})
+        self._save_pending = False
+
+    def load_manifest(self, manifest_path: pathlib.Path) -> Optional[Dict[str, Any]]:
+        """Return the manifest at a path, None if there is no manifest.
+
+        Raises ValueError if the manifest is not valid JSON.
+        Must be run in the executor.
+        """
+        key = str(manifest_path)
+        try:
+            stat_result = manifest_path.stat()
+        except OSError:
+            stat_result = None
+        if stat_result is None or not S_ISREG(stat_result.st_mode):
+            if self._manifests.pop(key, None) is not None:
+                self._schedule_save()
+            return None
+
+        entry = self._manifests.get(key)
+        if (
+            entry is None
+            or entry["mtime"] != stat_result.st_mtime_ns
+            or entry["size"] != stat_result.st_size
+        ):
+            entry = self._manifests[key] = {
+                "mtime": stat_result.st_mtime_ns,
+                "size": stat_result.st_size,
+                "manifest": json.loads(manifest_path.read_text()),
+            }
+            self._schedule_save()
+
+        return dict(entry["manifest"])
+
+    def list_sub_directories(self, path: str) -> List[str]:
+        """Return the names of the sub directories of a path.
+
+        Must be run in the executor.
+        """
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            if self._directories.pop(path, None) is not None:
+                self._schedule_save()
+            return []
+
+        entry = self._directories.get(path)
+        if entry is None or entry["mtime"] != mtime:
+            entry = self._directories[path] = {
+                "mtime": mtime,
+                "names": sorted(
+                    entry.name
+                    for entry in pathlib.Path(path).iterdir()
+                    if entry.is_dir()
+                ),
+            }
+            self._schedule_save()
+
+        return list(entry["names"])
+
+    def _schedule_save(self) -> None:
+        """Schedule saving the index, thread safe."""
+        if self._store is not None and not self._save_pending:
+            self._save_pending = True
+            self._hass.add_job(self._async_schedule_save)
+
+    async def _async_schedule_save(self) -> None:
+        """Save the index once integrations stopped being resolved."""
+        assert self._store is not None
+        self._store.async_delay_save(self._data_to_save, MANIFEST_INDEX_SAVE_DELAY)
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the data of the index to save."""
+        self._save_pending = False
+        return {
+            "version": __version__,
+            "manifests": dict(self._manifests),
+            "directories": dict(self._directories),
+        }
+
+
+async def async_get_manifest_index(hass: "HomeAssistant") -> ManifestIndex:
+    """Return the manifest index, loaded from .storage."""
+    idx_or_evt = hass.data.get(DATA_MANIFEST_INDEX)
+
+    if idx_or_evt is None:
+        evt = hass.data[DATA_MANIFEST_INDEX] = asyncio.Event()
+
+        # pylint: disable=import-outside-toplevel
+        from homeassistant.helpers.storage import Store
+
+        store = None
+        data = None
+        if hass.config.config_dir is not None:
+            store = Store(
+                hass,
+                MANIFEST_INDEX_STORAGE_VERSION,
+                MANIFEST_INDEX_STORAGE_KEY,
+                private=True,
+            )
+            try:
+                data = cast(Optional[Dict[str, Any]], await store.async_load())
+            except HomeAssistantError as err:
+                _LOGGER.warning("Unable to load the manifest index: %s", err)
+
+        index = hass.data[DATA_MANIFEST_INDEX] = ManifestIndex(hass, store, data)
+        evt.set()
+        return index
+
+    if isinstance(idx_or_evt, asyncio.Event):
+        await idx_or_evt.wait()
+        return cast(ManifestIndex, hass.data[DATA_MANIFEST_INDEX])
+
+    return cast(ManifestIndex, idx_or_evt)
+
+
 async def _async_get_custom_components(
     hass: "HomeAssistant",
 ) -> Dict[str, "Integration"]:
@@ -77,14 +302,11 @@ async def _async_get_custom_components(
     except ImportError:
         return {}
 
-    def get_sub_directories(paths: List[str]) -> List[pathlib.Path]:
-        """Return all sub directories in a set of paths."""
-        return [
-            entry
-            for path in paths
-            for entry in pathlib.Path(path).iterdir()
-            if entry.is_dir()
-        ]
+    index = await async_get_manifest_index(hass)
+
+    def get_sub_directories(paths: List[str]) -> List[str]:
+        """Return the names of all sub directories in a set of paths."""
+        return [name for path in paths for name in index.list_sub_directories(path)]
 
     dirs = await hass.async_add_executor_job(
         get_sub_directories, custom_components.__path__
@@ -93,7 +315,7 @@ async def _async_get_custom_components(
     integrations = await asyncio.gather(
         *(
             hass.async_add_executor_job(
-                Integration.resolve_from_root, hass, custom_components, comp.name
+                Integration.resolve_from_root, hass, custom_components, comp
             )
             for comp in dirs
         )
@@ -228,14 +450,22 @@ class Integration:
         cls, hass: "HomeAssistant", root_module: ModuleType, domain: str
     ) -> "Optional[Integration]":
         """Resolve an integration from a root module."""
+        index = hass.data.get(DATA_MANIFEST_INDEX)
+        if not isinstance(index, ManifestIndex):
+            index = None
+
         for base in root_module.__path__:  # type: ignore
             manifest_path = pathlib.Path(base) / domain / "manifest.json"
 
-            if not manifest_path.is_file():
-                continue
-
             try:
-                manifest = json.loads(manifest_path.read_text())
+                if index is not None:
+                    manifest = index.load_manifest(manifest_path)
+                    if manifest is None:
+                        continue
+                elif manifest_path.is_file():
+                    manifest = json.loads(manifest_path.read_text())
+                else:
+                    continue
             except ValueError as err:
                 _LOGGER.error(
                     "Error parsing manifest.json file at %s: %s", manifest_path, err
@@ -413,7 +643,9 @@ class Integration:
         """Return the component."""
         cache = self.hass.data.setdefault(DATA_COMPONENTS, {})
         if self.domain not in cache:
-            cache[self.domain] = importlib.import_module(self.pkg_path)
+            cache[self.domain] = _import_integration_module(
+                self.hass, self.domain, self.pkg_path
+            )
         return cache[self.domain]  # type: ignore
 
     def get_platform(self, platform_name: str) -> ModuleType:
@@ -426,7 +658,9 @@ class Integration:
 
     def _import_platform(self, platform_name: str) -> ModuleType:
         """Import the platform."""
-        return importlib.import_module(f"{self.pkg_path}.{platform_name}")
+        return _import_integration_module(
+            self.hass, self.domain, f"{self.pkg_path}.{platform_name}"
+        )
 
     def __repr__(self) -> str:
         """Text representation of class."""
@@ -435,6 +669,9 @@ class Integration:
 
 async def async_get_integration(hass: "HomeAssistant", domain: str) -> Integration:
     """Get an integration."""
+    if not isinstance(hass.data.get(DATA_MANIFEST_INDEX), ManifestIndex):
+        await async_get_manifest_index(hass)
+
     cache = hass.data.get(DATA_INTEGRATIONS)
     if cache is None:
         if not _async_mount_config_dir(hass):
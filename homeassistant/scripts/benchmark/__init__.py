@@ -3,16 +3,24 @@ import argparse
 import asyncio
 import collections
 from contextlib import suppress
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 import logging
+import os
+from tempfile import TemporaryDirectory
 from timeit import default_timer as timer
 from typing import Callable, Dict, TypeVar
 
 from homeassistant import core
 from homeassistant.components.websocket_api.const import JSON_DUMP
-from homeassistant.const import ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED
+from homeassistant.const import (
+    ATTR_NOW,
+    EVENT_STATE_CHANGED,
+    EVENT_TIME_CHANGED,
+    MATCH_ALL,
+)
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
+from homeassistant.helpers.event import DATA_TIMER_SCHEDULER
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.util import dt as dt_util
 
@@ -85,6 +93,43 @@ async def fire_events(hass):
     return timer() - start
 
 
+@benchmark
+async def fire_events_mixed_listeners(hass):
+    """Fire a million events across mixed listener setups."""
+    count = 0
+    expected = 0
+    event = asyncio.Event()
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+        if count == expected:
+            event.set()
+
+    # No listeners, one listener, many listeners and a MATCH_ALL listener
+    event_types = ["benchmark_none", "benchmark_single", "benchmark_many"]
+    hass.bus.async_listen("benchmark_single", listener)
+    for _ in range(10):
+        hass.bus.async_listen("benchmark_many", listener)
+    hass.bus.async_listen(MATCH_ALL, listener)
+
+    per_type = {"benchmark_none": 1, "benchmark_single": 2, "benchmark_many": 11}
+    for idx in range(10 ** 6):
+        expected += per_type[event_types[idx % 3]]
+
+    start = timer()
+
+    for idx in range(10 ** 6):
+        hass.bus.async_fire(event_types[idx % 3])
+
+    await event.wait()
+
+    return timer() - start
+
+
 @benchmark
 async def time_changed_helper(hass):
     """Run a million events through time changed helper."""
@@ -113,6 +158,85 @@ async def time_changed_helper(hass):
     return timer() - start
 
 
+@benchmark
+async def time_pattern_triggers(hass):
+    """Fire 10k time pattern listeners a hundred times."""
+    # pylint: disable=import-outside-toplevel
+    from unittest.mock import patch
+
+    count = 0
+    event = asyncio.Event()
+    listeners = 10 ** 4
+    rounds = 100
+
+    @core.callback
+    def listener(_):
+        """Handle time pattern."""
+        nonlocal count
+        count += 1
+
+        if count == listeners * rounds:
+            event.set()
+
+    for _ in range(listeners):
+        hass.helpers.event.async_track_utc_time_change(listener, second="*")
+
+    scheduler = hass.data[DATA_TIMER_SCHEDULER]
+    now = dt_util.utcnow()
+
+    start = timer()
+
+    with patch("homeassistant.helpers.event.time_tracker_utcnow") as mock_utcnow:
+        for idx in range(1, rounds + 1):
+            mock_utcnow.return_value = now + timedelta(seconds=idx)
+            # pylint: disable=protected-access
+            scheduler._async_run()
+
+    await event.wait()
+
+    return timer() - start
+
+
+@benchmark
+async def track_template_result(hass):
+    """Run 10k state changes through 1500 tracked templates.
+
+    The templates are tracked in groups of ten, like the templates of a
+    template entity. Set TRACK_TEMPLATE_BENCHMARK_COUNT to change the number
+    of templates.
+    """
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers.event import TrackTemplate, async_track_template_result
+    from homeassistant.helpers.template import Template
+
+    templates = int(os.environ.get("TRACK_TEMPLATE_BENCHMARK_COUNT", 1500))
+
+    @core.callback
+    def listener(*_):
+        """Handle template result."""
+
+    for group in range(0, templates, 10):
+        track_templates = []
+        for idx in range(group, min(group + 10, templates)):
+            hass.states.async_set(f"sensor.template_{idx}", 0)
+            track_templates.append(
+                TrackTemplate(
+                    Template(f"{{{{ states('sensor.template_{idx}') }}}}", hass),
+                    None,
+                )
+            )
+        async_track_template_result(hass, track_templates, listener)
+
+    start = timer()
+
+    for idx in range(10 ** 4):
+        hass.states.async_set(f"sensor.template_{idx % templates}", idx)
+
+    await hass.async_block_till_done()
+
+    return timer() - start
+
+
 @benchmark
 async def state_changed_helper(hass):
     """Run a million events through state changed helper with 1000 entities."""
@@ -323,6 +447,319 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def manifest_index_cold(hass):
+    """Resolve 300 integrations without a saved manifest index."""
+    return await _manifest_index(hass, False)
+
+
+@benchmark
+async def manifest_index_warm(hass):
+    """Resolve 300 integrations with the manifest index saved by a first run."""
+    return await _manifest_index(hass, True)
+
+
+async def _manifest_index(hass, warm):
+    # pylint: disable=import-outside-toplevel
+    import pathlib
+
+    from homeassistant import components, loader
+
+    domains = sorted(
+        path.parent.name
+        for path in pathlib.Path(components.__path__[0]).glob("*/manifest.json")
+    )[:300]
+    logging.getLogger("homeassistant.loader").setLevel(logging.WARNING)
+
+    async def resolve(config_dir):
+        """Resolve the integrations with a new instance."""
+        run_hass = core.HomeAssistant()
+        run_hass.config.config_dir = config_dir
+        start = timer()
+        for domain in domains:
+            await loader.async_get_integration(run_hass, domain)
+        runtime = timer() - start
+        # Saves the manifest index
+        await run_hass.async_stop(force=True)
+        return runtime
+
+    with TemporaryDirectory() as config_dir:
+        runtime = await resolve(config_dir)
+        if warm:
+            runtime = await resolve(config_dir)
+        return runtime
+
+
+@benchmark
+async def entity_service_call(hass):
+    """Call an entity service on 3 of 400 entities 10k times."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers.entity import Entity
+    from homeassistant.helpers.entity_component import EntityComponent
+
+    class BenchmarkEntity(Entity):
+        """Entity with a service method."""
+
+        def __init__(self, idx):
+            """Initialize the entity."""
+            self._name = f"Entity {idx}"
+            self.calls = 0
+
+        @property
+        def name(self):
+            """Return the name of the entity."""
+            return self._name
+
+        @property
+        def should_poll(self):
+            """Do not poll."""
+            return False
+
+        async def async_turn_on(self):
+            """Handle the service call."""
+            self.calls += 1
+
+    component = EntityComponent(logging.getLogger(__name__), "light", hass)
+    entities = [BenchmarkEntity(idx) for idx in range(400)]
+    component.async_register_entity_service("turn_on", {}, "async_turn_on")
+    count = 10 ** 4
+
+    with TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        await component.async_add_entities(entities)
+        target = {"entity_id": [entity.entity_id for entity in entities[::150]]}
+
+        start = timer()
+        for _ in range(count):
+            await hass.services.async_call("light", "turn_on", target, blocking=True)
+        runtime = timer() - start
+
+    assert sum(entity.calls for entity in entities) == count * 3
+    return runtime
+
+
+@benchmark
+async def websocket_state_changed(hass):
+    """Send 10k state changes of 10 entities to 50 websocket clients.
+
+    Each client is subscribed to state_changed events. Set
+    WEBSOCKET_BENCHMARK_COALESCE=1 to have the clients opt in to message
+    coalescing.
+    """
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.auth.models import User
+    from homeassistant.components.websocket_api import commands, const, http
+    from homeassistant.components.websocket_api.connection import ActiveConnection
+
+    coalesce = os.environ.get("WEBSOCKET_BENCHMARK_COALESCE") == "1"
+    frames = 0
+
+    class MockWebSocket:
+        """Discard the sent frames."""
+
+        closed = False
+
+        async def send_str(self, message):
+            """Count a sent frame."""
+            nonlocal frames
+            frames += 1
+
+    handlers = []
+    writers = []
+    user = User(name="Benchmark", perm_lookup=None, is_owner=True, is_active=True)
+    for _ in range(50):
+        handler = http.WebSocketHandler(hass, None)
+        handler.wsock = MockWebSocket()
+        connection = handler._connection = ActiveConnection(
+            logging.getLogger(__name__), hass, handler._send_message, user, None
+        )
+        if coalesce:
+            connection.supported_features[const.FEATURE_COALESCE_MESSAGES] = 1
+        commands.handle_subscribe_events(
+            hass,
+            connection,
+            {"id": 1, "type": "subscribe_events", "event_type": EVENT_STATE_CHANGED},
+        )
+        handlers.append(handler)
+        writers.append(asyncio.create_task(handler._writer()))
+
+    start = timer()
+
+    for idx in range(10 ** 4):
+        hass.states.async_set(f"light.kitchen_{idx % 10}", idx)
+        if idx % 100 == 99:
+            # Let the writers flush
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+
+    await hass.async_block_till_done()
+    for handler in handlers:
+        handler._to_write.put_nowait(None)
+    await asyncio.gather(*writers)
+
+    assert frames
+    return timer() - start
+
+
+@benchmark
+async def recorder_insert_sqlite(hass):
+    """Record 100k state changes in an in-memory SQLite database."""
+    return await _recorder_insert(hass, "sqlite://")
+
+
+@benchmark
+async def recorder_insert_db_url(hass):
+    """Record 100k state changes in the database at RECORDER_BENCHMARK_DB_URL.
+
+    Point it to a local MySQL or PostgreSQL server. Without it, a SQLite
+    database file is used.
+    """
+    db_url = os.environ.get("RECORDER_BENCHMARK_DB_URL")
+    if db_url:
+        return await _recorder_insert(hass, db_url)
+
+    with TemporaryDirectory() as tmpdir:
+        return await _recorder_insert(
+            hass, f"sqlite:///{os.path.join(tmpdir, 'benchmark.db')}"
+        )
+
+
+async def _recorder_insert(hass, db_url):
+    # pylint: disable=import-outside-toplevel,protected-access
+    from homeassistant.components import recorder
+    from homeassistant.components.recorder import migration
+
+    instance = recorder.Recorder(
+        hass,
+        auto_purge=False,
+        keep_days=1,
+        commit_interval=1,
+        uri=db_url,
+        db_max_retries=1,
+        db_retry_wait=1,
+        entity_filter=lambda entity_id: True,
+        exclude_t=[],
+        db_integrity_check=False,
+    )
+
+    old_states = {}
+    events = []
+    for idx in range(10 ** 5):
+        entity_id = f"sensor.benchmark_{idx % 1000}"
+        new_state = core.State(entity_id, str(idx), {"unit_of_measurement": "W"})
+        events.append(
+            core.Event(
+                EVENT_STATE_CHANGED,
+                {
+                    "entity_id": entity_id,
+                    "old_state": old_states.get(entity_id),
+                    "new_state": new_state,
+                },
+            )
+        )
+        old_states[entity_id] = new_state
+
+    def _record():
+        instance._setup_connection()
+        migration.migrate_schema(instance)
+        instance._setup_run()
+        instance.event_session = instance.get_session()
+        instance.event_session.expire_on_commit = False
+
+        start = timer()
+        # Commit every 300 events, like a busy instance does every second
+        for idx, event in enumerate(events, 1):
+            instance._process_one_event(event)
+            if idx % 300 == 0:
+                instance._commit_event_session_or_retry()
+        instance._commit_event_session_or_retry()
+        runtime = timer() - start
+
+        instance._close_run()
+        instance._close_connection()
+        return runtime
+
+    return await hass.async_add_executor_job(_record)
+
+
+@benchmark
+async def recorder_purge_sqlite(hass):
+    """Purge half of a synthetic SQLite database with 50M rows.
+
+    Set RECORDER_PURGE_BENCHMARK_ROWS to use a smaller database.
+    """
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components import recorder
+    from homeassistant.components.recorder import migration, purge
+    from homeassistant.components.recorder.models import Events, States
+
+    rows = int(os.environ.get("RECORDER_PURGE_BENCHMARK_ROWS", 5 * 10 ** 7))
+
+    def _purge(instance):
+        instance._setup_connection()  # pylint: disable=protected-access
+        migration.migrate_schema(instance)
+
+        # Half of the rows are events, the other half their states,
+        # spread evenly over the last 60 days
+        now = dt_util.utcnow()
+        step = timedelta(days=60) / (rows // 2)
+        with instance.engine.begin() as connection:
+            for chunk_start in range(0, rows // 2, 10 ** 5):
+                chunk = range(chunk_start, min(chunk_start + 10 ** 5, rows // 2))
+                connection.execute(
+                    Events.__table__.insert(),
+                    [
+                        {
+                            "event_id": idx + 1,
+                            "event_type": EVENT_STATE_CHANGED,
+                            "event_data": "{}",
+                            "origin": "LOCAL",
+                            "time_fired": now - step * (rows // 2 - idx),
+                        }
+                        for idx in chunk
+                    ],
+                )
+                connection.execute(
+                    States.__table__.insert(),
+                    [
+                        {
+                            "state_id": idx + 1,
+                            "event_id": idx + 1,
+                            "entity_id": f"sensor.benchmark_{idx % 1000}",
+                            "domain": "sensor",
+                            "state": str(idx),
+                            "attributes": "{}",
+                            "last_changed": now - step * (rows // 2 - idx),
+                            "last_updated": now - step * (rows // 2 - idx),
+                        }
+                        for idx in chunk
+                    ],
+                )
+
+        start = timer()
+        while not purge.purge_old_data(instance, 30, repack=False):
+            pass
+        runtime = timer() - start
+
+        instance._close_connection()  # pylint: disable=protected-access
+        return runtime
+
+    with TemporaryDirectory() as tmpdir:
+        instance = recorder.Recorder(
+            hass,
+            auto_purge=False,
+            keep_days=30,
+            commit_interval=1,
+            uri=f"sqlite:///{os.path.join(tmpdir, 'benchmark.db')}",
+            db_max_retries=1,
+            db_retry_wait=1,
+            entity_filter=lambda entity_id: True,
+            exclude_t=[],
+            db_integrity_check=False,
+        )
+        return await hass.async_add_executor_job(_purge, instance)
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
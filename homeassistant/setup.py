@@ -1,9 +1,10 @@
 """All methods needed to bootstrap a Home Assistant instance."""
 import asyncio
+import contextlib
 import logging.handlers
 from timeit import default_timer as timer
 from types import ModuleType
-from typing import Awaitable, Callable, Optional, Set
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Set
 
 from homeassistant import config as conf_util, core, loader, requirements
 from homeassistant.config import async_notify_setup_error
@@ -17,21 +18,105 @@ _LOGGER = logging.getLogger(__name__)
 ATTR_COMPONENT = "component"
 
 DATA_SETUP_DONE = "setup_done"
+DATA_SETUP_IGNORE_AFTER_DEPS = "setup_ignore_after_deps"
 DATA_SETUP_STARTED = "setup_started"
+DATA_SETUP_TIMELINE = "setup_timeline"
 DATA_SETUP = "setup_tasks"
 DATA_DEPS_REQS = "deps_reqs_processed"
 
+# Phases of the setup timeline
+SETUP_PHASE_WAIT = "wait"
+SETUP_PHASE_REQUIREMENTS = "requirements"
+SETUP_PHASE_IMPORT = "import"
+SETUP_PHASE_SETUP = "setup"
+SETUP_PHASE_CONFIG_ENTRIES = "config_entries"
+
 SLOW_SETUP_WARNING = 10
 SLOW_SETUP_MAX_WAIT = 300
 
 
 @core.callback
-def async_set_domains_to_be_loaded(hass: core.HomeAssistant, domains: Set[str]) -> None:
+def async_set_domains_to_be_loaded(
+    hass: core.HomeAssistant,
+    domains: Set[str],
+    ignore_after_dependencies: Optional[Set[str]] = None,
+) -> None:
     """Set domains that are going to be loaded from the config.
 
-    This will allow us to properly handle after_dependencies.
+    This will allow us to properly handle after_dependencies. Domains in
+    ignore_after_dependencies do not wait for their after_dependencies.
     """
     hass.data[DATA_SETUP_DONE] = {domain: asyncio.Event() for domain in domains}
+    hass.data[DATA_SETUP_IGNORE_AFTER_DEPS] = ignore_after_dependencies or set()
+
+
+@contextlib.contextmanager
+def _record_setup_phase(
+    hass: core.HomeAssistant, domain: str, phase: str
+) -> Iterator[None]:
+    """Record how long a setup phase of an integration took."""
+    start = timer()
+    try:
+        yield
+    finally:
+        hass.data.setdefault(DATA_SETUP_TIMELINE, []).append(
+            {
+                "domain": domain,
+                "phase": phase,
+                "start": start,
+                "duration": timer() - start,
+            }
+        )
+
+
+@core.callback
+def async_get_setup_timeline(hass: core.HomeAssistant) -> List[Dict[str, Any]]:
+    """Return the recorded setup phases of the integrations.
+
+    Each phase has the domain, the phase name, the start as a
+    timeit.default_timer value and the duration in seconds.
+    """
+    return list(hass.data.get(DATA_SETUP_TIMELINE, []))
+
+
+def setup_timeline_to_chrome_trace(timeline: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Convert a setup timeline to the Chrome trace event format.
+
+    Every integration is shown as a thread with its setup phases.
+    """
+    if not timeline:
+        return {"traceEvents": []}
+
+    origin = min(phase["start"] for phase in timeline)
+    threads: Dict[str, int] = {}
+    events = []
+    for phase in timeline:
+        domain = phase["domain"]
+        tid = threads.get(domain)
+        if tid is None:
+            tid = threads[domain] = len(threads) + 1
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": 1,
+                    "tid": tid,
+                    "args": {"name": domain},
+                }
+            )
+        events.append(
+            {
+                "name": phase["phase"],
+                "cat": domain,
+                "ph": "X",
+                "ts": round((phase["start"] - origin) * 1000000),
+                "dur": round(phase["duration"] * 1000000),
+                "pid": 1,
+                "tid": tid,
+            }
+        )
+
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
 
 
 def setup_component(hass: core.HomeAssistant, domain: str, config: ConfigType) -> bool:
@@ -79,6 +164,8 @@ async def _async_process_dependencies(
 
     after_dependencies_tasks = {}
     to_be_loaded = hass.data.get(DATA_SETUP_DONE, {})
+    if integration.domain in hass.data.get(DATA_SETUP_IGNORE_AFTER_DEPS, ()):
+        to_be_loaded = {}
     for dep in integration.after_dependencies:
         if (
             dep not in dependencies_tasks
@@ -163,7 +250,8 @@ async def _async_setup_component(
     # Some integrations fail on import because they call functions incorrectly.
     # So we do it before validating config to catch these errors.
     try:
-        component = integration.get_component()
+        with _record_setup_phase(hass, domain, SETUP_PHASE_IMPORT):
+            component = integration.get_component()
     except ImportError as err:
         log_error(f"Unable to import component: {err}", integration.documentation)
         return False
@@ -195,40 +283,41 @@ async def _async_setup_component(
             SLOW_SETUP_WARNING,
         )
 
-    try:
-        if hasattr(component, "async_setup"):
-            task = component.async_setup(hass, processed_config)  # type: ignore
-        elif hasattr(component, "setup"):
-            # This should not be replaced with hass.async_add_executor_job because
-            # we don't want to track this task in case it blocks startup.
-            task = hass.loop.run_in_executor(
-                None, component.setup, hass, processed_config  # type: ignore
+    with _record_setup_phase(hass, domain, SETUP_PHASE_SETUP):
+        try:
+            if hasattr(component, "async_setup"):
+                task = component.async_setup(hass, processed_config)  # type: ignore
+            elif hasattr(component, "setup"):
+                # This should not be replaced with hass.async_add_executor_job because
+                # we don't want to track this task in case it blocks startup.
+                task = hass.loop.run_in_executor(
+                    None, component.setup, hass, processed_config  # type: ignore
+                )
+            else:
+                log_error("No setup function defined.")
+                hass.data[DATA_SETUP_STARTED].pop(domain)
+                return False
+
+            async with hass.timeout.async_timeout(SLOW_SETUP_MAX_WAIT, domain):
+                result = await task
+        except asyncio.TimeoutError:
+            _LOGGER.error(
+                "Setup of %s is taking longer than %s seconds."
+                " Startup will proceed without waiting any longer",
+                domain,
+                SLOW_SETUP_MAX_WAIT,
             )
-        else:
-            log_error("No setup function defined.")
             hass.data[DATA_SETUP_STARTED].pop(domain)
             return False
-
-        async with hass.timeout.async_timeout(SLOW_SETUP_MAX_WAIT, domain):
-            result = await task
-    except asyncio.TimeoutError:
-        _LOGGER.error(
-            "Setup of %s is taking longer than %s seconds."
-            " Startup will proceed without waiting any longer",
-            domain,
-            SLOW_SETUP_MAX_WAIT,
-        )
-        hass.data[DATA_SETUP_STARTED].pop(domain)
-        return False
-    except Exception:  # pylint: disable=broad-except
-        _LOGGER.exception("Error during setup of component %s", domain)
-        async_notify_setup_error(hass, domain, integration.documentation)
-        hass.data[DATA_SETUP_STARTED].pop(domain)
-        return False
-    finally:
-        end = timer()
-        if warn_task:
-            warn_task.cancel()
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error during setup of component %s", domain)
+            async_notify_setup_error(hass, domain, integration.documentation)
+            hass.data[DATA_SETUP_STARTED].pop(domain)
+            return False
+        finally:
+            end = timer()
+            if warn_task:
+                warn_task.cancel()
     _LOGGER.info("Setup of domain %s took %.1f seconds", domain, end - start)
 
     if result is False:
@@ -247,12 +336,12 @@ async def _async_setup_component(
     await asyncio.sleep(0)
     await hass.config_entries.flow.async_wait_init_flow_finish(domain)
 
-    await asyncio.gather(
-        *[
-            entry.async_setup(hass, integration=integration)
-            for entry in hass.config_entries.async_entries(domain)
-        ]
-    )
+    entries = hass.config_entries.async_entries(domain)
+    if entries:
+        with _record_setup_phase(hass, domain, SETUP_PHASE_CONFIG_ENTRIES):
+            await asyncio.gather(
+                *[entry.async_setup(hass, integration=integration) for entry in entries]
+            )
 
     hass.config.components.add(domain)
     hass.data[DATA_SETUP_STARTED].pop(domain)
@@ -335,14 +424,19 @@ async def async_process_deps_reqs(
     elif integration.domain in processed:
         return
 
-    if not await _async_process_dependencies(hass, config, integration):
+    with _record_setup_phase(hass, integration.domain, SETUP_PHASE_WAIT):
+        dependencies_set_up = await _async_process_dependencies(
+            hass, config, integration
+        )
+    if not dependencies_set_up:
         raise HomeAssistantError("Could not set up all dependencies.")
 
     if not hass.config.skip_pip and integration.requirements:
-        async with hass.timeout.async_freeze(integration.domain):
-            await requirements.async_get_integration_with_requirements(
-                hass, integration.domain
-            )
+        with _record_setup_phase(hass, integration.domain, SETUP_PHASE_REQUIREMENTS):
+            async with hass.timeout.async_freeze(integration.domain):
+                await requirements.async_get_integration_with_requirements(
+                    hass, integration.domain
+                )
 
     processed.add(integration.domain)
 
@@ -8,8 +8,6 @@ import sys
 from typing import Optional
 from urllib.parse import urlparse
 
-import pkg_resources
-
 if sys.version_info[:2] >= (3, 8):
     from importlib.metadata import (  # pylint: disable=no-name-in-module,import-error
         PackageNotFoundError,
@@ -43,6 +41,9 @@ def is_installed(package: str) -> bool:
     Returns True when the requirement is met.
     Returns False when the package is not installed or doesn't meet req.
     """
+    # Importing pkg_resources is slow, only do it when checking requirements
+    import pkg_resources  # pylint: disable=import-outside-toplevel
+
     try:
         req = pkg_resources.Requirement.parse(package)
     except ValueError:
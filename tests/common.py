@@ -205,6 +205,9 @@ async def async_test_home_assistant(loop):
     hass.config.media_dirs = {"local": get_test_config_dir("media")}
     hass.config.skip_pip = True
 
+    # Don't persist the manifest index in the test config dir
+    hass.data[loader.DATA_MANIFEST_INDEX] = loader.ManifestIndex(hass, None, None)
+
     hass.config_entries = config_entries.ConfigEntries(hass, {})
     hass.config_entries._entries = []
     hass.config_entries._store._async_ensure_stop_listener = lambda: None
@@ -932,6 +935,13 @@ def mock_storage(data=None):
         # To ensure that the data can be serialized
         data[store.key] = json.loads(json.dumps(data_to_write, cls=store._encoder))
 
+    def mock_write_journal(store, path, records):
+        """Mock version of write journal, applies the records to the data."""
+        _LOGGER.info("Writing journal to %s: %s", store.key, records)
+        storage.apply_journal_records(
+            data[store.key]["data"], json.loads(json.dumps(records, cls=store._encoder))
+        )
+
     async def mock_remove(store):
         """Remove data."""
         data.pop(store.key, None)
@@ -944,6 +954,10 @@ def mock_storage(data=None):
         "homeassistant.helpers.storage.Store._write_data",
         side_effect=mock_write_data,
         autospec=True,
+    ), patch(
+        "homeassistant.helpers.storage.Store._write_journal",
+        side_effect=mock_write_journal,
+        autospec=True,
     ), patch(
         "homeassistant.helpers.storage.Store.async_remove",
         side_effect=mock_remove,
@@ -954,7 +968,7 @@ def mock_storage(data=None):
 
 async def flush_store(store):
     """Make sure all delayed writes of a store are written."""
-    if store._data is None:
+    if store._data is None and not store._journal_pending:
         return
 
     store._async_cleanup_final_write_listener()
@@ -27,6 +27,23 @@ async def test_api_list_state_entities(hass, mock_api_client):
     hass.states.async_set("test.entity", "hello")
     resp = await mock_api_client.get(const.URL_API_STATES)
     assert resp.status == 200
+    assert resp.headers["Vary"] == "Accept-Encoding"
+    json = await resp.json()
+
+    remote_data = [ha.State.from_dict(item) for item in json]
+    assert remote_data == hass.states.async_all()
+
+
+async def test_api_list_state_entities_gzip(hass, mock_api_client):
+    """Test a large snapshot of all states is sent compressed."""
+    hass.states.async_set("test.entity", "hello", {"attr": "x" * 100})
+    with patch("homeassistant.components.api.STATES_GZIP_MIN_SIZE", 100):
+        resp = await mock_api_client.get(
+            const.URL_API_STATES, headers={"Accept-Encoding": "gzip"}
+        )
+    assert resp.status == 200
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert resp.headers["Vary"] == "Accept-Encoding"
     json = await resp.json()
 
     remote_data = [ha.State.from_dict(item) for item in json]
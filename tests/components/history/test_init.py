@@ -2,6 +2,7 @@
 # pylint: disable=protected-access,invalid-name
 from copy import copy
 from datetime import timedelta
+from functools import partial
 import json
 import unittest
 
@@ -27,6 +28,7 @@ class TestComponentHistory(unittest.TestCase):
     def setUp(self):  # pylint: disable=invalid-name
         """Set up things to be run when tests are started."""
         self.hass = get_test_home_assistant()
+        self.recorder_config = None
         self.addCleanup(self.tear_down_cleanup)
 
     def tear_down_cleanup(self):
@@ -35,7 +37,7 @@ class TestComponentHistory(unittest.TestCase):
 
     def init_recorder(self):
         """Initialize the recorder."""
-        init_recorder_component(self.hass)
+        init_recorder_component(self.hass, self.recorder_config)
         self.hass.start()
         wait_recording_done(self.hass)
 
@@ -607,6 +609,42 @@ class TestComponentHistory(unittest.TestCase):
         )
         assert list(hist.keys()) == entity_ids
 
+    def test_get_significant_states_from_cache(self):
+        """Test the history cache returns the same states as the database."""
+        self.recorder_config = {recorder.CONF_HISTORY_CACHE_SIZE: 1}
+        zero, four, _ = self.record_states()
+        one_and_half = zero + timedelta(seconds=1.5)
+        entity_ids = ["thermostat.test", "media_player.test", "media_player.test3"]
+        instance = self.hass.data[recorder.DATA_INSTANCE]
+        history_cache = instance.history_cache
+
+        # The cache does not hold the states before it started
+        assert (
+            history_cache.get_significant_states(entity_ids, zero, four, True, ())
+            is None
+        )
+
+        for kwargs in (
+            {},
+            {"minimal_response": True},
+            {"significant_changes_only": False},
+            {"include_start_time_state": False},
+        ):
+            # The database is not queried
+            with patch.dict(self.hass.data, {history.HISTORY_BAKERY: None}), patch(
+                "homeassistant.components.history._get_states_with_session",
+                side_effect=AssertionError,
+            ):
+                hist = history.get_significant_states(
+                    self.hass, one_and_half, four, entity_ids, **kwargs
+                )
+
+            instance.history_cache = None
+            assert hist == history.get_significant_states(
+                self.hass, one_and_half, four, entity_ids, **kwargs
+            )
+            instance.history_cache = history_cache
+
     def test_get_significant_states_only(self):
         """Test significant states when significant_states_only is set."""
         self.test_setup()
@@ -1008,3 +1046,63 @@ async def test_entity_ids_limit_via_api_with_skip_initial_state(hass, hass_clien
     assert len(response_json) == 2
     assert response_json[0][0]["entity_id"] == "light.kitchen"
     assert response_json[1][0]["entity_id"] == "light.cow"
+
+
+async def test_fetch_period_api_streams_significant_states(hass, hass_client):
+    """Test the streamed history matches get_significant_states."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+    hass.states.async_set("light.unchanged", "on")
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    middle = dt_util.utcnow()
+    for state in ("on", "off", "off", "on"):
+        hass.states.async_set("light.kitchen", state, {"brightness": len(state)})
+        hass.states.async_set("climate.test", state)
+        await hass.async_block_till_done()
+        await hass.async_add_executor_job(trigger_db_commit, hass)
+        await hass.async_block_till_done()
+        await hass.async_add_executor_job(
+            hass.data[recorder.DATA_INSTANCE].block_till_done
+        )
+
+    client = await hass_client()
+    for query, entity_ids, kwargs in (
+        ("", None, {}),
+        ("?minimal_response", None, {"minimal_response": True}),
+        (
+            "?filter_entity_id=light.kitchen,climate.test,light.unchanged"
+            "&minimal_response",
+            ["light.kitchen", "climate.test", "light.unchanged"],
+            {"minimal_response": True},
+        ),
+    ):
+        for start_time in (start, middle):
+            expected = await hass.async_add_executor_job(
+                partial(
+                    history.get_significant_states,
+                    hass,
+                    start_time,
+                    start_time + timedelta(days=1),
+                    entity_ids,
+                    **kwargs,
+                )
+            )
+            with patch("homeassistant.components.http.view.STREAM_CHUNK_SIZE", 10):
+                response = await client.get(
+                    f"/api/history/period/{start_time.isoformat()}{query}"
+                )
+            assert response.status == 200
+            response_json = await response.json()
+            assert len(response_json) == 3
+            if entity_ids is None:
+                # Only the order of the requested entities is kept
+                response_json.sort(key=lambda states: states[0]["entity_id"])
+                expected = dict(sorted(expected.items()))
+            assert response_json == json.loads(
+                json.dumps(list(expected.values()), cls=JSONEncoder)
+            )
@@ -1,4 +1,5 @@
 """Tests for Home Assistant View."""
+from aiohttp import ClientPayloadError, web
 from aiohttp.web_exceptions import (
     HTTPBadRequest,
     HTTPInternalServerError,
@@ -8,7 +9,9 @@ import pytest
 import voluptuous as vol
 
 from homeassistant.components.http.view import (
+    STREAM_CHUNK_SIZE,
     HomeAssistantView,
+    json_fragments,
     request_handler_factory,
 )
 from homeassistant.exceptions import ServiceNotFound, Unauthorized
@@ -69,3 +72,30 @@ async def test_not_running(mock_request_with_stopping):
         Mock(requires_auth=False), AsyncMock(side_effect=Unauthorized)
     )(mock_request_with_stopping)
     assert response.status == 503
+
+
+async def test_json_stream_invalid_json(hass, aiohttp_client, caplog):
+    """Test streaming invalid JSON before and after the first chunk."""
+    items = ["x" * STREAM_CHUNK_SIZE, float("NaN")]
+
+    async def handler(request):
+        """Stream the items from the offset in the query."""
+        offset = int(request.query["offset"])
+        return await HomeAssistantView.json_stream(
+            request, lambda: json_fragments(items[offset:])
+        )
+
+    app = web.Application()
+    app["hass"] = hass
+    app.router.add_get("/", handler)
+    client = await aiohttp_client(app)
+
+    resp = await client.get("/", params={"offset": 1})
+    assert resp.status == 500
+    assert "Unable to serialize to JSON" in caplog.text
+
+    # The status was sent with the first chunk, so the response is aborted
+    resp = await client.get("/", params={"offset": 0})
+    assert resp.status == 200
+    with pytest.raises(ClientPayloadError):
+        await resp.read()
@@ -1,4 +1,6 @@
 """The tests for the Light component."""
+import asyncio
+
 import pytest
 import voluptuous as vol
 
@@ -663,6 +665,41 @@ async def test_light_brightness_pct_conversion(hass):
     assert data["brightness"] == 255, data
 
 
+async def test_light_turn_on_coalesced(hass):
+    """Test superseded turn on calls waiting for a light are dropped."""
+    platform = getattr(hass.components, "test.light")
+    platform.init()
+    entity = platform.ENTITIES[0]
+    assert await async_setup_component(
+        hass, light.DOMAIN, {light.DOMAIN: {CONF_PLATFORM: "test"}}
+    )
+    await hass.async_block_till_done()
+
+    release = asyncio.Event()
+    brightnesses = []
+
+    async def async_turn_on(**kwargs):
+        brightnesses.append(kwargs[light.ATTR_BRIGHTNESS])
+        await release.wait()
+
+    entity.async_turn_on = async_turn_on
+
+    for brightness in (10, 20, 30):
+        await hass.services.async_call(
+            "light",
+            "turn_on",
+            {"entity_id": entity.entity_id, "brightness": brightness},
+        )
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    assert brightnesses == [10]
+
+    release.set()
+    await hass.async_block_till_done()
+    assert brightnesses == [10, 30]
+
+
 def test_deprecated_base_class(caplog):
     """Test deprecated base class."""
 
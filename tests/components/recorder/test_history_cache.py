@@ -0,0 +1,137 @@
+"""The tests for the recorder history cache."""
+from datetime import timedelta
+
+from homeassistant.components.recorder.history_cache import (
+    HISTORY_CACHE_WINDOW,
+    HistoryCache,
+)
+from homeassistant.util import dt as dt_util
+
+
+def _row(entity_id, state, last_updated, last_changed=None):
+    """Create a state row with its attributes JSON."""
+    return (
+        {
+            "entity_id": entity_id,
+            "state": state,
+            "last_changed": last_changed or last_updated,
+            "last_updated": last_updated,
+        },
+        "{}",
+    )
+
+
+def test_significant_states():
+    """Test the states at and after the start time are returned."""
+    cache = HistoryCache(10 ** 6)
+    now = dt_util.utcnow()
+    cache.add_rows(
+        [
+            _row("sensor.test", "1", now - timedelta(minutes=3)),
+            _row("sensor.test", "2", now - timedelta(minutes=2)),
+            # Only the attributes changed
+            _row(
+                "sensor.test",
+                "2",
+                now - timedelta(minutes=1),
+                now - timedelta(minutes=2),
+            ),
+            _row("climate.test", "heat", now - timedelta(minutes=3)),
+            _row("climate.test", "heat", now, now - timedelta(minutes=3)),
+        ]
+    )
+
+    start = now - timedelta(minutes=2, seconds=30)
+    start_states, states = cache.get_significant_states(
+        ["sensor.test", "climate.test"], start, None, True, ("climate",)
+    )
+    assert [(state.entity_id, state.state) for state in start_states] == [
+        ("climate.test", "heat"),
+        ("sensor.test", "1"),
+    ]
+    assert [(state.entity_id, state.last_updated) for state in states] == [
+        ("climate.test", now),
+        ("sensor.test", now - timedelta(minutes=2)),
+    ]
+
+    _, states = cache.get_significant_states(
+        ["sensor.test"], start, now - timedelta(minutes=1), False, ()
+    )
+    assert [state.state for state in states] == ["2"]
+
+    assert (
+        cache.get_significant_states(
+            ["sensor.test"], now - timedelta(minutes=3), None, True, ()
+        )
+        is None
+    )
+    assert cache.get_significant_states(["sensor.other"], start, None, True, ()) is None
+
+
+def test_rows_outside_window_are_dropped():
+    """Test only the last row before the window is kept."""
+    cache = HistoryCache(10 ** 6)
+    now = dt_util.utcnow()
+    cache.add_rows(
+        [
+            _row(
+                "sensor.test",
+                str(minutes),
+                now - HISTORY_CACHE_WINDOW - timedelta(minutes=minutes),
+            )
+            for minutes in (3, 2, 1)
+        ]
+    )
+    cache.add_rows([_row("sensor.test", "now", now)])
+
+    start_states, states = cache.get_significant_states(
+        ["sensor.test"],
+        now - HISTORY_CACHE_WINDOW - timedelta(seconds=30),
+        None,
+        True,
+        (),
+    )
+    assert [state.state for state in start_states] == ["1"]
+    assert [state.state for state in states] == ["now"]
+    assert (
+        cache.get_significant_states(
+            ["sensor.test"],
+            now - HISTORY_CACHE_WINDOW - timedelta(minutes=1, seconds=30),
+            None,
+            True,
+            (),
+        )
+        is None
+    )
+
+    cache.purge(now - timedelta(minutes=1))
+    assert (
+        cache.get_significant_states(
+            ["sensor.test"], now - timedelta(seconds=30), None, True, ()
+        )
+        is None
+    )
+
+
+def test_least_recently_queried_entities_are_evicted():
+    """Test entities are evicted when over the memory budget."""
+    cache = HistoryCache(10 ** 6)
+    now = dt_util.utcnow()
+    start = now - timedelta(seconds=30)
+    cache.add_rows(
+        [
+            _row(f"sensor.test_{idx}", "on", now - timedelta(minutes=1))
+            for idx in range(3)
+        ]
+    )
+    cache.get_significant_states(["sensor.test_0"], start, None, True, ())
+
+    cache.max_size = cache.size - 1
+    cache.add_rows([_row("sensor.test_0", "off", now)])
+
+    assert (
+        cache.get_significant_states(["sensor.test_1"], start, None, True, ()) is None
+    )
+    assert cache.get_significant_states(["sensor.test_0"], start, None, True, ())
+    assert cache.get_significant_states(["sensor.test_2"], start, None, True, ())
+    assert cache.size <= cache.max_size
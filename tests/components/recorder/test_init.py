@@ -2,7 +2,8 @@
 # pylint: disable=protected-access
 from datetime import datetime, timedelta
 
-from sqlalchemy.exc import OperationalError
+from sqlalchemy import event as sqlalchemy_event
+from sqlalchemy.exc import IntegrityError, OperationalError
 
 from homeassistant.components.recorder import (
     CONFIG_SCHEMA,
@@ -13,7 +14,12 @@ from homeassistant.components.recorder import (
     run_information_with_session,
 )
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import MATCH_ALL, STATE_LOCKED, STATE_UNLOCKED
 from homeassistant.core import Context, callback
@@ -55,17 +61,14 @@ def test_saving_state_with_exception(hass, hass_recorder, caplog):
     state = "restoring_from_db"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
-    def _throw_if_state_in_session(*args, **kwargs):
-        for obj in hass.data[DATA_INSTANCE].event_session:
-            if isinstance(obj, States):
-                raise OperationalError(
-                    "insert the state", "fake params", "forced to fail"
-                )
+    def _throw_if_state_pending(*args, **kwargs):
+        if hass.data[DATA_INSTANCE]._pending_states:
+            raise OperationalError("insert the state", "fake params", "forced to fail")
 
     with patch("time.sleep"), patch.object(
-        hass.data[DATA_INSTANCE].event_session,
-        "flush",
-        side_effect=_throw_if_state_in_session,
+        hass.data[DATA_INSTANCE],
+        "_insert_pending_rows",
+        side_effect=_throw_if_state_pending,
     ):
         hass.states.set(entity_id, "fail", attributes)
         wait_recording_done(hass)
@@ -85,6 +88,32 @@ def test_saving_state_with_exception(hass, hass_recorder, caplog):
     assert "Error saving events" not in caplog.text
 
 
+def test_saving_state_with_integrity_error(hass, hass_recorder, caplog):
+    """Test rows failing to save are not written again with later rows."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    insert_pending_rows = instance._insert_pending_rows
+
+    def _throw_once(*args, **kwargs):
+        instance._insert_pending_rows = insert_pending_rows
+        raise IntegrityError("insert the state", "fake params", "forced to fail")
+
+    instance._insert_pending_rows = _throw_once
+    hass.states.set("test.recorder", "fail")
+    wait_recording_done(hass)
+
+    assert "Error saving events" in caplog.text
+
+    caplog.clear()
+    hass.states.set("test.recorder", "saved")
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert [state.state for state in session.query(States)] == ["saved"]
+
+    assert "Error saving events" not in caplog.text
+
+
 def test_saving_event(hass, hass_recorder):
     """Test saving and restoring an event."""
     hass = hass_recorder()
@@ -403,6 +432,119 @@ def test_saving_sets_old_state(hass_recorder):
         assert states[3].old_state_id == states[1].state_id
 
 
+def test_saving_sets_old_state_same_commit(hass_recorder):
+    """Test saving sets old state for states inserted in the same commit."""
+    hass = hass_recorder()
+
+    hass.states.set("test.one", "on", {})
+    hass.states.set("test.one", "off", {})
+    hass.states.set("test.one", "on", {})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States))
+        events = list(session.query(Events).filter_by(event_type="state_changed"))
+        assert len(states) == 3
+
+        assert states[0].old_state_id is None
+        assert states[1].old_state_id == states[0].state_id
+        assert states[2].old_state_id == states[1].state_id
+        assert [state.event_id for state in states] == [
+            event.event_id for event in events
+        ]
+
+
+def test_saving_rows_in_bulk(hass_recorder):
+    """Test the rows of a commit are inserted with one statement per table."""
+    hass = hass_recorder()
+    inserts = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        if statement.startswith("INSERT"):
+            inserts.append((statement.split()[2], many))
+
+    engine = hass.data[DATA_INSTANCE].engine
+    sqlalchemy_event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    hass.states.set("test.one", "on", {"attr": 1})
+    hass.states.set("test.two", "on", {"attr": 2})
+    hass.states.set("test.one", "off", {"attr": 1})
+    wait_recording_done(hass)
+    sqlalchemy_event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert inserts == [("events", True), ("state_attributes", True), ("states", True)]
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States))
+        assert [state.state for state in states] == ["on", "on", "off"]
+        assert states[2].old_state_id == states[0].state_id
+        assert states[2].attributes_id == states[0].attributes_id
+
+
+def test_saving_state_retry_clears_keys(hass_recorder):
+    """Test the keys of rows failing to commit are not sent again."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    insert_pending_rows = instance._insert_pending_rows
+    commit = instance.event_session.commit
+    keys = []
+
+    def _insert_pending_rows():
+        keys.append(
+            [
+                (event_row.get("event_id"), state_row.get("state_id"))
+                for state_row, event_row, _, _ in instance._pending_states
+            ]
+        )
+        insert_pending_rows()
+
+    def _fail_once():
+        instance.event_session.commit = commit
+        raise OperationalError("commit", "fake params", "forced to fail")
+
+    with patch.object(instance, "db_retry_wait", 0), patch.object(
+        instance, "_insert_pending_rows", _insert_pending_rows
+    ):
+        instance.event_session.commit = _fail_once
+        hass.states.set("test.recorder", "on")
+        wait_recording_done(hass)
+
+    assert keys == [[(None, None)], [(None, None)]]
+
+    with session_scope(hass=hass) as session:
+        assert [state.state for state in session.query(States)] == ["on"]
+
+
+def test_saving_state_shares_attributes(hass_recorder):
+    """Test identical attributes are stored once."""
+    hass = hass_recorder()
+
+    attributes = {"friendly_name": "Test", "unit_of_measurement": "W"}
+    hass.states.set("test.one", "1", attributes)
+    hass.states.set("test.one", "2", attributes)
+    wait_recording_done(hass)
+    hass.states.set("test.one", "3", attributes)
+    hass.states.set("test.two", "4", {"friendly_name": "Other"})
+    wait_recording_done(hass)
+    # Attributes already stored are found after the cache was cleared
+    hass.data[DATA_INSTANCE]._state_attributes.clear()
+    hass.states.set("test.two", "5", {"friendly_name": "Other"})
+    wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StateAttributes).count() == 2
+        states = list(session.query(States))
+        assert len(states) == 5
+        assert all(state.attributes is None for state in states)
+        assert len({state.attributes_id for state in states}) == 2
+        assert [state.to_native().attributes for state in states] == [
+            attributes,
+            attributes,
+            attributes,
+            {"friendly_name": "Other"},
+            {"friendly_name": "Other"},
+        ]
+
+
 def test_saving_state_with_serializable_data(hass_recorder, caplog):
     """Test saving data that cannot be serialized does not crash."""
     hass = hass_recorder()
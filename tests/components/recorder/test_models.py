@@ -3,13 +3,14 @@ from datetime import datetime
 
 import pytest
 import pytz
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import scoped_session, sessionmaker
 
 from homeassistant.components.recorder.models import (
     Base,
     Events,
     RecorderRuns,
+    StateAttributes,
     States,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
@@ -128,6 +129,42 @@ def test_entity_ids():
     assert run.entity_ids(in_run2) == ["sensor.humidity"]
 
 
+def test_states_to_native_loads_attributes_with_states():
+    """Test the shared attributes are loaded in the query of the states."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = scoped_session(sessionmaker(bind=engine))
+
+    now = dt_util.utcnow()
+    for idx in range(3):
+        session.add(
+            States(
+                entity_id=f"sensor.test_{idx}",
+                state="on",
+                state_attributes=StateAttributes(shared_attrs=f'{{"idx": {idx}}}'),
+                last_changed=now,
+                last_updated=now,
+            )
+        )
+    session.commit()
+    session.expunge_all()
+
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    states = [state.to_native() for state in session.query(States)]
+
+    assert [state.attributes for state in states] == [
+        {"idx": 0},
+        {"idx": 1},
+        {"idx": 2},
+    ]
+    assert len(statements) == 1
+
+
 def test_states_from_native_invalid_entity_id():
     """Test loading a state from an invalid entity ID."""
     state = States()
@@ -0,0 +1,174 @@
+"""The tests for the recorder queue overflow handling."""
+import queue
+
+from homeassistant.components.recorder.overflow import (
+    OVERFLOW_COALESCE,
+    OVERFLOW_DROP,
+    OVERFLOW_SPILL,
+    QueueOverflow,
+)
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, State
+
+
+def _state_changed_event(entity_id, state, old_state=None):
+    """Create a state changed event."""
+    return Event(
+        EVENT_STATE_CHANGED,
+        {
+            "entity_id": entity_id,
+            "old_state": old_state,
+            "new_state": State(entity_id, state),
+        },
+    )
+
+
+def test_overflow_drop(tmp_path):
+    """Test events are dropped while over the high-water mark."""
+    event_queue = queue.SimpleQueue()
+    overflow = QueueOverflow(
+        event_queue, 2, OVERFLOW_DROP, str(tmp_path / "recorder.spill")
+    )
+
+    for idx in range(5):
+        overflow.put(Event("test_event", {"idx": idx}))
+
+    assert event_queue.qsize() == 2
+    assert overflow.dropped == 3
+
+
+def test_overflow_coalesce(tmp_path):
+    """Test only the latest state per entity is kept while over the mark."""
+    event_queue = queue.SimpleQueue()
+    overflow = QueueOverflow(
+        event_queue, 1, OVERFLOW_COALESCE, str(tmp_path / "recorder.spill")
+    )
+
+    overflow.put(_state_changed_event("light.kitchen", "on"))
+    overflow.put(_state_changed_event("light.kitchen", "off"))
+    overflow.put(_state_changed_event("light.bowl", "off"))
+    overflow.put(_state_changed_event("light.kitchen", "on"))
+    overflow.put(Event("test_event"))
+
+    assert event_queue.qsize() == 1
+    assert overflow.coalesced == 1
+    assert overflow.dropped == 1
+
+    event_queue.get()
+    overflow.put(Event("test_event"))
+
+    events = [event_queue.get() for _ in range(event_queue.qsize())]
+    assert [event.data.get("entity_id") for event in events] == [
+        "light.kitchen",
+        "light.bowl",
+        None,
+    ]
+    assert events[0].data["new_state"].state == "on"
+
+
+def test_overflow_coalesce_flush(tmp_path):
+    """Test coalesced events are put in the queue without a new event."""
+    event_queue = queue.SimpleQueue()
+    overflow = QueueOverflow(
+        event_queue, 1, OVERFLOW_COALESCE, str(tmp_path / "recorder.spill")
+    )
+
+    overflow.put(_state_changed_event("light.kitchen", "on"))
+    overflow.put(_state_changed_event("light.kitchen", "off"))
+    overflow.flush_coalesced()
+    assert event_queue.qsize() == 1
+
+    event_queue.get()
+    overflow.flush_coalesced()
+    assert event_queue.get_nowait().data["new_state"].state == "off"
+    assert event_queue.empty()
+
+
+def test_overflow_spill_and_replay(tmp_path):
+    """Test events are spilled to disk and replayed in order."""
+    spill_path = tmp_path / "recorder.spill"
+    event_queue = queue.SimpleQueue()
+    overflow = QueueOverflow(event_queue, 1, OVERFLOW_SPILL, str(spill_path))
+
+    first = _state_changed_event("light.kitchen", "on")
+    overflow.put(first)
+    spilled = [
+        _state_changed_event("light.kitchen", "off", first.data["new_state"]),
+        Event("test_event", {"some": "data"}),
+    ]
+    for event in spilled:
+        overflow.put(event)
+
+    assert event_queue.qsize() == 1
+    assert overflow.spilled == 2
+    assert overflow.spill_pending == 2
+    # Spilled events are written by the spill writer
+    overflow._spill_queue.join()
+    assert spill_path.exists()
+
+    event_queue.get()
+    # Events keep being spilled until all spilled events are replayed
+    overflow.put(Event("after_replay"))
+    assert event_queue.empty()
+
+    replayed = []
+    for event in overflow.replay():
+        replayed.append(event)
+        if event.event_type == "test_event":
+            # Spilled while replaying
+            overflow.put(Event("during_replay"))
+
+    assert [event.event_type for event in replayed] == [
+        EVENT_STATE_CHANGED,
+        "test_event",
+        "after_replay",
+        "during_replay",
+    ]
+    assert replayed[0] == spilled[0]
+    assert replayed[0].data["old_state"] == first.data["new_state"]
+    assert replayed[1] == spilled[1]
+    assert overflow.spill_pending == 0
+    assert not spill_path.exists()
+
+    # All spilled events were replayed, stop spilling
+    overflow.put(Event("test_event"))
+    assert event_queue.qsize() == 1
+    assert list(overflow.replay()) == []
+    overflow.close()
+
+
+def test_overflow_spill_queue_full(tmp_path):
+    """Test events are dropped when the spill writer falls behind."""
+    spill_path = tmp_path / "recorder.spill"
+    overflow = QueueOverflow(queue.SimpleQueue(), 0, OVERFLOW_SPILL, str(spill_path))
+
+    overflow._spill_queue = queue.Queue(1)
+    # Block the spill writer
+    with overflow._file_lock:
+        for idx in range(10):
+            overflow.put(Event("test_event", {"idx": idx}))
+
+    assert overflow.dropped >= 7
+    assert overflow.spilled + overflow.dropped == 10
+
+    replayed = [event.data["idx"] for event in overflow.replay()]
+    assert len(replayed) == overflow.spilled
+    assert replayed == sorted(replayed)
+    assert overflow.spill_pending == 0
+    overflow.close()
+
+
+def test_overflow_recover(tmp_path):
+    """Test a spill file of a previous run is replayed."""
+    spill_path = tmp_path / "recorder.spill"
+    overflow = QueueOverflow(queue.SimpleQueue(), 0, OVERFLOW_SPILL, str(spill_path))
+    overflow.put(Event("test_event"))
+    overflow.close()
+    del overflow
+
+    overflow = QueueOverflow(queue.SimpleQueue(), 10, OVERFLOW_SPILL, str(spill_path))
+    assert list(overflow.replay()) == []
+
+    overflow.recover()
+    assert [event.event_type for event in overflow.replay()] == ["test_event"]
+    overflow.close()
@@ -4,14 +4,19 @@ import json
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.models import Events, RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+)
 from homeassistant.components.recorder.purge import purge_old_data
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.util import dt as dt_util
 
 from .common import wait_recording_done
 
-from tests.async_mock import patch
+from tests.async_mock import call, patch
 
 
 def test_purge_old_states(hass, hass_recorder):
@@ -62,6 +67,64 @@ def test_purge_old_events(hass, hass_recorder):
         assert events.count() == 2
 
 
+def test_purge_old_states_in_batches(hass, hass_recorder):
+    """Test purging yields after each time slice and keeps its progress."""
+    hass = hass_recorder()
+    _add_test_states(hass)
+    instance = hass.data[DATA_INSTANCE]
+
+    with session_scope(hass=hass) as session, patch(
+        "homeassistant.components.recorder.purge.PURGE_BATCH_SIZE", 1
+    ), patch("homeassistant.components.recorder.purge.PURGE_TIME_SLICE", 0):
+        states = session.query(States)
+        assert states.count() == 6
+
+        finished = purge_old_data(instance, 4, repack=False)
+        assert not finished
+        assert states.count() == 5
+        progress = instance.purge_progress
+        assert progress.states_deleted == 1
+
+        while not purge_old_data(instance, 4, repack=False):
+            assert instance.purge_progress is progress
+
+        assert states.count() == 2
+        assert progress.states_deleted == 4
+        assert instance.purge_progress is None
+
+
+def test_purge_old_state_attributes(hass, hass_recorder):
+    """Test deleting the shared attributes only used by purged states."""
+    hass = hass_recorder()
+    _add_test_states(hass)
+    instance = hass.data[DATA_INSTANCE]
+
+    with session_scope(hass=hass) as session:
+        states = session.query(States).order_by(States.last_updated).all()
+        old_attributes = StateAttributes(shared_attrs='{"old": true}')
+        kept_attributes = StateAttributes(shared_attrs='{"kept": true}')
+        session.add_all([old_attributes, kept_attributes])
+        session.flush()
+        for state in states[:2]:
+            state.attributes_id = old_attributes.attributes_id
+        for state in (states[2], states[-1]):
+            state.attributes_id = kept_attributes.attributes_id
+        old_attributes_id = old_attributes.attributes_id
+        kept_attributes_id = kept_attributes.attributes_id
+
+    with patch("homeassistant.components.recorder.purge.PURGE_TIME_SLICE", 0):
+        while not purge_old_data(instance, 4, repack=False):
+            pass
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 2
+        assert [
+            attributes_id
+            for attributes_id, in session.query(StateAttributes.attributes_id)
+            if attributes_id in (old_attributes_id, kept_attributes_id)
+        ] == [kept_attributes_id]
+
+
 def test_purge_method(hass, hass_recorder):
     """Test purge method."""
     hass = hass_recorder()
@@ -123,8 +186,7 @@ def test_purge_method(hass, hass_recorder):
             hass.data[DATA_INSTANCE].block_till_done()
             wait_recording_done(hass)
             assert (
-                mock_logger.debug.mock_calls[5][1][0]
-                == "Vacuuming SQL DB to free space"
+                call("Vacuuming SQL DB to free space") in mock_logger.debug.mock_calls
             )
 
 
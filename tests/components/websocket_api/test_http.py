@@ -66,6 +66,53 @@ async def test_pending_msg_peak(hass, mock_low_peak, hass_ws_client, caplog):
     assert "Client unable to keep up with pending messages" in caplog.text
 
 
+async def test_coalesce_messages(hass, hass_ws_client):
+    """Test queued messages are sent as one frame once opted in."""
+    orig_handler = http.WebSocketHandler
+    instance = None
+
+    def instantiate_handler(*args):
+        nonlocal instance
+        instance = orig_handler(*args)
+        return instance
+
+    with patch(
+        "homeassistant.components.websocket_api.http.WebSocketHandler",
+        instantiate_handler,
+    ):
+        websocket_client = await hass_ws_client()
+
+    instance._send_message({"id": 1}, "key")
+    instance._send_message({"id": 2})
+    msg = await websocket_client.receive_json()
+    assert msg == {"id": 1}
+    msg = await websocket_client.receive_json()
+    assert msg == {"id": 2}
+
+    await websocket_client.send_json(
+        {
+            "id": 5,
+            "type": "supported_features",
+            "features": {const.FEATURE_COALESCE_MESSAGES: 1},
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["success"]
+
+    instance._send_message({"id": 6})
+    instance._send_message({"id": 7, "value": 1}, "key")
+    instance._send_message({"id": 8})
+    instance._send_message({"id": 7, "value": 2}, "key")
+    msg = await websocket_client.receive_json()
+    assert msg == [{"id": 6}, {"id": 7, "value": 2}, {"id": 8}]
+
+    # Sent messages are no longer replaced
+    instance._send_message({"id": 9, "value": 3}, "key")
+    msg = await websocket_client.receive_json()
+    assert msg == {"id": 9, "value": 3}
+
+
 async def test_non_json_message(hass, websocket_client, caplog):
     """Test trying to serialze non JSON objects."""
     bad_data = object()
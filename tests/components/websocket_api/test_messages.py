@@ -2,7 +2,9 @@
 
 from homeassistant.components.websocket_api.messages import (
     _cached_event_message as lru_event_cache,
+    _cached_state_diff_message as lru_state_diff_cache,
     cached_event_message,
+    cached_state_diff_message,
     message_to_json,
 )
 from homeassistant.const import EVENT_STATE_CHANGED
@@ -78,6 +80,34 @@ async def test_cached_event_message_with_different_idens(hass):
     assert cache_info.currsize == 1
 
 
+async def test_cached_state_diff_message(hass):
+    """Test that we cache state diff messages."""
+
+    events = []
+
+    @callback
+    def _event_listener(event):
+        events.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _event_listener)
+
+    hass.states.async_set("light.window", "on")
+    hass.states.async_set("light.window", "off")
+    await hass.async_block_till_done()
+
+    assert len(events) == 2
+    lru_state_diff_cache.cache_clear()
+
+    msg0 = cached_state_diff_message(2, events[0])
+    assert msg0 == cached_state_diff_message(2, events[0])
+    assert '"id": 2' in cached_state_diff_message(2, events[1])
+    assert '"id": 3' in cached_state_diff_message(3, events[1])
+
+    cache_info = lru_state_diff_cache.cache_info()
+    assert cache_info.hits == 2
+    assert cache_info.misses == 2
+
+
 async def test_message_to_json(caplog):
     """Test we can serialize websocket messages."""
 
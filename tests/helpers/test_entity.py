@@ -10,7 +10,7 @@ from homeassistant.const import ATTR_DEVICE_CLASS, STATE_UNAVAILABLE
 from homeassistant.core import Context
 from homeassistant.helpers import entity, entity_registry
 
-from tests.async_mock import MagicMock, PropertyMock, patch
+from tests.async_mock import AsyncMock, MagicMock, PropertyMock, patch
 from tests.common import (
     MockConfigEntry,
     MockEntity,
@@ -516,6 +516,54 @@ async def test_async_parallel_updates_with_two(hass):
         test_lock.release()
 
 
+async def test_async_request_call_coalesced(hass):
+    """Test a waiting request is dropped when superseded by a newer one."""
+    ent = entity.Entity()
+    ent.hass = hass
+    ent.entity_id = "light.test"
+    handled = []
+    release = asyncio.Event()
+
+    async def handle(value):
+        """Handle a request."""
+        await release.wait()
+        handled.append(value)
+
+    key = ("light", "turn_on")
+    tasks = [
+        hass.async_create_task(ent.async_request_call(handle(value), key))
+        for value in range(3)
+    ]
+    other = hass.async_create_task(
+        ent.async_request_call(handle("other"), ("light", "turn_off"))
+    )
+    await asyncio.sleep(0)
+
+    release.set()
+    await asyncio.gather(*tasks, other)
+
+    # The first request was running, the second one was superseded
+    assert sorted(handled, key=str) == [0, 2, "other"]
+
+
+async def test_update_latency_excludes_parallel_updates_wait(hass):
+    """Test the update latency does not include waiting for other updates."""
+    ent = entity.Entity()
+    ent.hass = hass
+    ent.entity_id = "sensor.test"
+    ent.async_update = AsyncMock()
+    ent.parallel_updates = asyncio.Semaphore(1)
+
+    await ent.parallel_updates.acquire()
+    update = hass.async_create_task(ent.async_device_update())
+    await asyncio.sleep(0.1)
+    ent.parallel_updates.release()
+    await update
+
+    assert ent.async_update.called
+    assert ent.update_latency < 0.1
+
+
 async def test_async_remove_no_platform(hass):
     """Test async_remove method when no platform set."""
     ent = entity.Entity()
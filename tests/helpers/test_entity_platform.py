@@ -53,6 +53,56 @@ async def test_polling_only_updates_entities_it_should_poll(hass):
     assert poll_ent.async_update.called
 
 
+async def test_polling_spread_over_scan_interval(hass):
+    """Test the first polls of platforms are spread over the scan interval."""
+    entities = []
+    for _ in range(2):
+        platform = MockEntityPlatform(hass, scan_interval=timedelta(seconds=20))
+        entity = MockEntity(should_poll=True)
+        entity.async_update = Mock()
+        await platform.async_add_entities([entity])
+        entities.append(entity)
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=14))
+    await hass.async_block_till_done()
+
+    assert not entities[0].async_update.called
+    assert entities[1].async_update.called
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=20))
+    await hass.async_block_till_done()
+
+    assert entities[0].async_update.called
+
+
+async def test_polling_backoff_unavailable_entity(hass):
+    """Test entities that stay unavailable are polled less often."""
+    platform = MockEntityPlatform(hass, scan_interval=timedelta(seconds=10))
+    entity = MockEntity(should_poll=True, available=False)
+    polls = []
+    entity.async_update = Mock()
+    await platform.async_add_entities([entity])
+
+    for tick in range(1, 19):
+        if tick == 10:
+            entity._values["available"] = True
+        entity.async_update.reset_mock()
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=10 * tick))
+        await hass.async_block_till_done()
+        if entity.async_update.called:
+            polls.append(tick)
+
+    assert polls == [1, 2, 3, 5, 9, 17, 18]
+
+    poll_latency = entity_platform.async_get_poll_latency(hass)
+    assert len(poll_latency) == 1
+    assert poll_latency[0]["domain"] == "test_domain"
+    assert poll_latency[0]["platform"] == "test_platform"
+    assert poll_latency[0]["scan_interval"] == 10
+    assert poll_latency[0]["count"] == 7
+    assert sum(poll_latency[0]["buckets"].values()) == 7
+
+
 async def test_polling_updates_entities_with_exception(hass):
     """Test the updated entities that not break with an exception."""
     component = EntityComponent(_LOGGER, DOMAIN, hass, timedelta(seconds=20))
@@ -152,6 +202,10 @@ async def test_set_scan_interval_via_platform(mock_track, hass):
 
     component.setup({DOMAIN: {"platform": "platform"}})
 
+    await hass.async_block_till_done()
+    assert not mock_track.called
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=30))
     await hass.async_block_till_done()
     assert mock_track.called
     assert timedelta(seconds=30) == mock_track.call_args[0][2]
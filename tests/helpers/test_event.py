@@ -8,15 +8,18 @@ import jinja2
 import pytest
 
 from homeassistant.components import sun
-from homeassistant.const import MATCH_ALL
+from homeassistant.const import EVENT_STATE_CHANGED, MATCH_ALL
 import homeassistant.core as ha
 from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.helpers.event import (
+    DATA_TIME_PATTERN_GROUPS,
+    TRACK_TEMPLATE_INDEX,
     TrackStates,
     TrackTemplate,
     TrackTemplateResult,
+    _event_triggers_rerender,
     async_call_later,
     async_track_point_in_time,
     async_track_point_in_utc_time,
@@ -125,6 +128,44 @@ async def test_track_point_in_time_drift_rearm(hass):
     assert len(specific_runs) == 1
 
 
+async def test_track_point_in_time_batched(hass, caplog):
+    """Test timers due at the same time share one loop callback."""
+    runs = []
+
+    now = dt_util.utcnow()
+    point_in_time = datetime(now.year + 1, 5, 24, 21, 59, 55, tzinfo=dt_util.UTC)
+
+    @callback
+    def failing_listener(_):
+        raise ValueError("boom")
+
+    handles_before = len(hass.loop._scheduled)
+    async_track_point_in_utc_time(hass, failing_listener, point_in_time)
+    for idx in range(3):
+        async_track_point_in_utc_time(
+            hass, callback(lambda x, idx=idx: runs.append(idx)), point_in_time
+        )
+    unsub = async_track_point_in_utc_time(
+        hass, callback(lambda x: runs.append("cancelled")), point_in_time
+    )
+    async_track_point_in_utc_time(
+        hass,
+        callback(lambda x: runs.append("later")),
+        point_in_time + timedelta(seconds=1),
+    )
+    assert len(hass.loop._scheduled) == handles_before + 1
+    unsub()
+
+    async_fire_time_changed(hass, point_in_time)
+    await hass.async_block_till_done()
+    assert runs == [0, 1, 2]
+    assert "Error running timer" in caplog.text
+
+    async_fire_time_changed(hass, point_in_time + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert runs == [0, 1, 2, "later"]
+
+
 async def test_track_state_change_from_to_state_match(hass):
     """Test track_state_change with from and to state matchers."""
     from_and_to_state_runs = []
@@ -1940,6 +1981,57 @@ async def test_track_template_result_refresh_cancel(hass):
     assert refresh_runs == ["duck"]
 
 
+async def test_async_track_template_result_routes_by_entity(hass):
+    """Test state changes only re-render the templates referencing them."""
+    template_light = Template("{{ states.light.kitchen.state }}", hass)
+    template_switch = Template("{{ states.switch.test.state }}", hass)
+    template_sensors = Template("{{ states.sensor | count }}", hass)
+    template_all = Template("{{ states | count }}", hass)
+    runs = []
+
+    @ha.callback
+    def refresh_listener(event, updates):
+        runs.append([update.template for update in updates])
+
+    info = async_track_template_result(
+        hass,
+        [
+            TrackTemplate(template_light, None),
+            TrackTemplate(template_switch, None),
+            TrackTemplate(template_sensors, None, timedelta(0)),
+        ],
+        refresh_listener,
+    )
+    info_all = async_track_template_result(
+        hass, [TrackTemplate(template_all, None)], ha.callback(lambda *_: None)
+    )
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == 1
+
+    checked = []
+    event_triggers_rerender = _event_triggers_rerender
+
+    def _check(event, info):
+        checked.append(info.template)
+        return event_triggers_rerender(event, info)
+
+    with patch("homeassistant.helpers.event._event_triggers_rerender", _check):
+        hass.states.async_set("light.kitchen", "on")
+        await hass.async_block_till_done()
+        assert checked == [template_light, template_all]
+
+        checked.clear()
+        hass.states.async_set("switch.test", "on")
+        await hass.async_block_till_done()
+        assert checked == [template_switch, template_all]
+
+    assert runs == [[template_light], [template_switch]]
+
+    info.async_remove()
+    info_all.async_remove()
+    assert EVENT_STATE_CHANGED not in hass.bus.async_listeners()
+    assert not hass.data[TRACK_TEMPLATE_INDEX]._trackers
+
+
 async def test_async_track_template_result_multiple_templates(hass):
     """Test tracking multiple templates."""
 
@@ -2677,6 +2769,53 @@ async def test_periodic_task_minute(hass):
     assert len(specific_runs) == 2
 
 
+async def test_periodic_task_shared_pattern(hass):
+    """Test listeners of the same time pattern are fired together."""
+    runs = []
+
+    now = dt_util.utcnow()
+
+    time_that_will_not_match_right_away = datetime(
+        now.year + 1, 5, 24, 11, 59, 55, tzinfo=dt_util.UTC
+    )
+
+    with patch(
+        "homeassistant.util.dt.utcnow", return_value=time_that_will_not_match_right_away
+    ):
+        unsubs = [
+            async_track_utc_time_change(
+                hass,
+                callback(lambda x, idx=idx: runs.append((idx, x))),
+                minute="/5",
+                second=0,
+            )
+            for idx in range(3)
+        ]
+    assert len(hass.data[DATA_TIME_PATTERN_GROUPS]) == 1
+
+    fire_time = datetime(now.year + 1, 5, 24, 12, 0, 0, 999999, tzinfo=dt_util.UTC)
+    async_fire_time_changed(hass, fire_time)
+    await hass.async_block_till_done()
+    assert runs == [(idx, fire_time) for idx in range(3)]
+
+    unsubs[1]()
+    runs.clear()
+    fire_time = datetime(now.year + 1, 5, 24, 12, 5, 0, 999999, tzinfo=dt_util.UTC)
+    async_fire_time_changed(hass, fire_time)
+    await hass.async_block_till_done()
+    assert runs == [(0, fire_time), (2, fire_time)]
+
+    unsubs[0]()
+    unsubs[2]()
+    assert not hass.data[DATA_TIME_PATTERN_GROUPS]
+
+    async_fire_time_changed(
+        hass, datetime(now.year + 1, 5, 24, 12, 10, 0, 999999, tzinfo=dt_util.UTC)
+    )
+    await hass.async_block_till_done()
+    assert len(runs) == 2
+
+
 async def test_periodic_task_hour(hass):
     """Test periodic tasks per hour."""
     specific_runs = []
@@ -1,6 +1,8 @@
 """Test service helpers."""
+import asyncio
 from collections import OrderedDict
 from copy import deepcopy
+import json
 import unittest
 
 import pytest
@@ -16,6 +18,7 @@ from homeassistant.const import (
     ENTITY_MATCH_NONE,
     STATE_OFF,
     STATE_ON,
+    __version__,
 )
 from homeassistant.helpers import (
     device_registry as dev_reg,
@@ -24,11 +27,15 @@ from homeassistant.helpers import (
     template,
 )
 import homeassistant.helpers.config_validation as cv
+from homeassistant.loader import async_get_integration
 from homeassistant.setup import async_setup_component
+from homeassistant.util.yaml import load_yaml
 
 from tests.async_mock import AsyncMock, Mock, patch
 from tests.common import (
     MockEntity,
+    MockEntityPlatform,
+    flush_store,
     get_test_home_assistant,
     mock_device_registry,
     mock_registry,
@@ -350,6 +357,21 @@ async def test_extract_entity_ids_from_area(hass, area_mock):
     )
 
 
+async def test_extract_entity_ids_from_area_registry_updated(hass, area_mock):
+    """Test the entities in an area are updated with the registries."""
+    call = ha.ServiceCall("light", "turn_on", {"area_id": "own-area"})
+    assert {"light.in_own_area"} == await service.async_extract_entity_ids(hass, call)
+
+    registry = await hass.helpers.entity_registry.async_get_registry()
+    registry.async_update_entity("light.no_area", area_id="own-area")
+    await hass.async_block_till_done()
+
+    assert {
+        "light.in_own_area",
+        "light.no_area",
+    } == await service.async_extract_entity_ids(hass, call)
+
+
 async def test_async_get_all_descriptions(hass):
     """Test async_get_all_descriptions."""
     group = hass.components.group
@@ -373,6 +395,67 @@ async def test_async_get_all_descriptions(hass):
     assert "fields" in descriptions[logger.DOMAIN]["set_level"]
 
 
+async def test_async_get_all_descriptions_index(hass, hass_storage):
+    """Test descriptions of unchanged services.yaml files are reused."""
+    integration = await async_get_integration(hass, "group")
+    mtime = (integration.file_path / "services.yaml").stat().st_mtime
+    hass_storage[service.DESCRIPTION_INDEX_STORAGE_KEY] = {
+        "version": service.DESCRIPTION_INDEX_STORAGE_VERSION,
+        "key": service.DESCRIPTION_INDEX_STORAGE_KEY,
+        "data": {
+            "version": __version__,
+            "domains": {
+                "group": {
+                    "mtime": mtime,
+                    "services": {"reload": {"description": "Indexed", "fields": {}}},
+                },
+                "logger": {
+                    "mtime": mtime - 1,
+                    "services": {"set_level": {"description": "Stale", "fields": {}}},
+                },
+            },
+        },
+    }
+    await async_setup_component(hass, "group", {"group": {}})
+    await async_setup_component(hass, "logger", {"logger": {}})
+
+    with patch(
+        "homeassistant.helpers.service.load_yaml", side_effect=load_yaml
+    ) as mock_load:
+        descriptions = await service.async_get_all_descriptions(hass)
+
+    assert descriptions["group"]["reload"]["description"] == "Indexed"
+    assert descriptions["logger"]["set_level"]["description"] != "Stale"
+    assert mock_load.call_count == 1
+
+    await flush_store(hass.data[service.SERVICE_DESCRIPTION_INDEX]._store)
+    data = hass_storage[service.DESCRIPTION_INDEX_STORAGE_KEY]["data"]
+    assert data["domains"]["logger"]["services"]["set_level"] == (
+        descriptions["logger"]["set_level"]
+    )
+
+
+async def test_async_get_all_descriptions_json(hass):
+    """Test the serialized descriptions are reused until services change."""
+    await async_setup_component(hass, "group", {"group": {}})
+    descriptions_json = await service.async_get_all_descriptions_json(hass)
+    assert json.loads(descriptions_json) == await service.async_get_all_descriptions(
+        hass
+    )
+    assert await service.async_get_all_descriptions_json(hass) is descriptions_json
+
+    hass.services.async_register("test_domain", "test_service", lambda call: None)
+    service.async_set_service_schema(
+        hass, "test_domain", "test_service", {"description": "Test service"}
+    )
+    await hass.async_block_till_done()
+
+    descriptions = json.loads(await service.async_get_all_descriptions_json(hass))
+    assert descriptions["test_domain"]["test_service"]["description"] == (
+        "Test service"
+    )
+
+
 async def test_call_with_required_features(hass, mock_entities):
     """Test service calls invoked only if entity has required features."""
     test_service_mock = AsyncMock(return_value=None)
@@ -461,6 +544,59 @@ async def test_call_with_sync_attr(hass, mock_entities):
     assert mock_method.mock_calls[0][2] == {}
 
 
+async def test_call_refreshes_polling_entities_once(hass, mock_entities):
+    """Test concurrent service calls refresh a polling entity once."""
+    for entity in mock_entities.values():
+        entity.hass = hass
+        entity._values["should_poll"] = True
+        entity.async_update_ha_state = AsyncMock()
+
+    await asyncio.gather(
+        *(
+            service.entity_service_call(
+                hass,
+                [Mock(entities=mock_entities)],
+                Mock(return_value=None),
+                ha.ServiceCall("test_domain", "test_service", {"entity_id": entity_id}),
+            )
+            for entity_id in ("light.kitchen", "light.kitchen", "light.bedroom")
+        )
+    )
+
+    assert mock_entities["light.kitchen"].async_update_ha_state.call_count == 1
+    assert mock_entities["light.bedroom"].async_update_ha_state.call_count == 1
+    assert mock_entities["light.bathroom"].async_update_ha_state.call_count == 0
+
+
+async def test_call_refresh_error_raised_in_own_call(hass, mock_entities):
+    """Test a failing refresh is only raised in the calls of the entity."""
+    for entity in mock_entities.values():
+        entity.hass = hass
+        entity._values["should_poll"] = True
+        entity.async_update_ha_state = AsyncMock()
+    mock_entities[
+        "light.kitchen"
+    ].async_update_ha_state.side_effect = exceptions.HomeAssistantError(
+        "refresh failed"
+    )
+
+    results = await asyncio.gather(
+        *(
+            service.entity_service_call(
+                hass,
+                [Mock(entities=mock_entities)],
+                Mock(return_value=None),
+                ha.ServiceCall("test_domain", "test_service", {"entity_id": entity_id}),
+            )
+            for entity_id in ("light.kitchen", "light.bedroom")
+        ),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[0], exceptions.HomeAssistantError)
+    assert results[1] is None
+
+
 async def test_call_context_user_not_exist(hass):
     """Check we don't allow deleted users to do things."""
     with pytest.raises(exceptions.UnknownUser) as err:
@@ -940,3 +1076,26 @@ async def test_extract_from_service_area_id(hass, area_mock):
         "light.diff_area",
         "light.in_area",
     ]
+
+
+async def test_call_entities_in_platform_order(hass):
+    """Test target entities are called in the order of the platform."""
+    platform = MockEntityPlatform(hass)
+    ids = [f"light.entity_{idx}" for idx in range(20)]
+    await platform.async_add_entities(
+        [MockEntity(entity_id=entity_id) for entity_id in ids]
+    )
+    calls = []
+
+    async def handle(entity, call):
+        calls.append(entity.entity_id)
+
+    for targets in (ids[17:2:-14], ids[15:2:-4], reversed(ids)):
+        calls.clear()
+        await service.entity_service_call(
+            hass,
+            [platform],
+            handle,
+            ha.ServiceCall("light", "turn_on", {"entity_id": list(targets)}),
+        )
+        assert calls and calls == sorted(calls, key=ids.index)
@@ -1,7 +1,9 @@
 """Tests for the storage helper."""
 import asyncio
 from datetime import timedelta
+from functools import partial
 import json
+import os
 
 import pytest
 
@@ -11,7 +13,7 @@ from homeassistant.const import (
 )
 from homeassistant.core import CoreState
 from homeassistant.helpers import storage
-from homeassistant.util import dt
+from homeassistant.util import dt, json as json_util
 
 from tests.async_mock import Mock, patch
 from tests.common import async_fire_time_changed
@@ -279,3 +281,140 @@ async def test_migrator_transforming_config(hass, store, hass_storage):
         "version": MOCK_VERSION,
         "data": data,
     }
+
+
+async def test_saving_journal(hass, hass_storage):
+    """Test changes are appended to the journal and compacted."""
+    items = {"a": {"id": "a", "value": 1}}
+
+    def data_func():
+        return {"items": list(items.values())}
+
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY)
+    # Without a journal to append to, all data is written
+    with patch.object(store, "_write_journal") as mock_write_journal:
+        store.async_delay_save_journal(data_func, [("items", "id", "a", items["a"])], 1)
+        async_fire_time_changed(hass, dt.utcnow() + timedelta(seconds=1))
+        await hass.async_block_till_done()
+
+    assert not mock_write_journal.called
+    assert hass_storage[MOCK_KEY]["data"] == {"items": [{"id": "a", "value": 1}]}
+
+    items["b"] = {"id": "b", "value": 2}
+    store.async_delay_save_journal(data_func, [("items", "id", "b", items["b"])], 1)
+    del items["a"]
+    store.async_delay_save_journal(data_func, [("items", "id", "a", None)], 1)
+    with patch.object(store, "_write_data") as mock_write_data:
+        async_fire_time_changed(hass, dt.utcnow() + timedelta(seconds=1))
+        await hass.async_block_till_done()
+
+    assert not mock_write_data.called
+    assert hass_storage[MOCK_KEY]["data"] == {"items": [{"id": "b", "value": 2}]}
+
+    items["b"]["value"] = 3
+    with patch.object(storage, "JOURNAL_COMPACT_SIZE", 2), patch.object(
+        store, "_write_journal"
+    ) as mock_write_journal:
+        store.async_delay_save_journal(data_func, [("items", "id", "b", items["b"])])
+        async_fire_time_changed(hass, dt.utcnow())
+        await hass.async_block_till_done()
+
+    assert not mock_write_journal.called
+    assert hass_storage[MOCK_KEY]["data"] == {"items": [{"id": "b", "value": 3}]}
+
+
+async def test_loading_journal(hass, tmp_path):
+    """Test the journal is applied when loading the data."""
+    hass.config.config_dir = str(tmp_path)
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY)
+    os.makedirs(os.path.dirname(store.path))
+    with open(store.path, "w") as fp:
+        json.dump(
+            {
+                "version": MOCK_VERSION,
+                "key": MOCK_KEY,
+                "data": {"items": [{"id": "a"}, {"id": "b"}], "other": 1},
+                "journal_id": "new",
+            },
+            fp,
+        )
+
+    with open(store.journal_path, "w") as fp:
+        # Left from the previous data
+        fp.write('["old","items","id","a",{"id":"a","x":1}]\n')
+        fp.write('["new","items","id","c",{"id":"c"}]\n["new","items","id","a",null]\n')
+        fp.write('["new","items","id","b",{"id":"b","x":1}]\n')
+        # Interrupted while appending
+        fp.write('["new","items","id","d",{"id"')
+
+    assert store._load_data() == (
+        {
+            "version": MOCK_VERSION,
+            "key": MOCK_KEY,
+            "data": {"items": [{"id": "b", "x": 1}, {"id": "c"}], "other": 1},
+        },
+        "new",
+        # Records appended after the torn line would be lost
+        None,
+    )
+
+
+def _disk_store(tmp_path):
+    """Return a store writing to tmp_path, without the mocked storage."""
+    hass = Mock(config=Mock(path=partial(os.path.join, str(tmp_path))))
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY)
+    os.makedirs(os.path.dirname(store.path))
+    return store
+
+
+def test_writing_data_removes_journal(tmp_path):
+    """Test the journal is only applied to the data written before it."""
+    store = _disk_store(tmp_path)
+    store._write_data(store.path, {"version": MOCK_VERSION, "data": {"items": []}})
+    store._write_journal(store.journal_path, [("items", "id", "a", {"id": "a"})])
+
+    # Interrupted before the data is written
+    with patch(
+        "homeassistant.helpers.storage.json_util.save_json",
+        side_effect=json_util.WriteError,
+    ), pytest.raises(json_util.WriteError):
+        store._write_data(store.path, {"version": MOCK_VERSION, "data": {}})
+
+    assert store._load_data()[0]["data"] == {"items": [{"id": "a"}]}
+
+    # Interrupted after the data is written, before the journal is removed
+    with patch(
+        "homeassistant.helpers.storage.os.unlink", side_effect=KeyboardInterrupt
+    ), pytest.raises(KeyboardInterrupt):
+        store._write_data(store.path, {"version": MOCK_VERSION, "data": {"items": []}})
+
+    store = storage.Store(store.hass, MOCK_VERSION, MOCK_KEY)
+    data, journal_id, journal_size = store._load_data()
+    assert data == {"version": MOCK_VERSION, "data": {"items": []}}
+    assert journal_size == 1
+
+    store._journal_id = journal_id
+    store._write_journal(store.journal_path, [("items", "id", "b", {"id": "b"})])
+    assert store._load_data()[0]["data"] == {"items": [{"id": "b"}]}
+
+    store._write_data(store.path, {"version": MOCK_VERSION, "data": {"items": []}})
+    assert os.listdir(os.path.dirname(store.path)) == [MOCK_KEY]
+    assert store._load_data() == (
+        {"version": MOCK_VERSION, "data": {"items": []}},
+        store._journal_id,
+        0,
+    )
+
+
+async def test_saving_journal_with_pending_save(hass, hass_storage):
+    """Test a pending save of all data includes the journal changes."""
+    store = storage.Store(hass, MOCK_VERSION, MOCK_KEY)
+    store.async_delay_save(lambda: MOCK_DATA2, 1)
+    store.async_delay_save_journal(
+        lambda: MOCK_DATA, [("items", "id", "a", {"id": "a"})], 1
+    )
+    async_fire_time_changed(hass, dt.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+
+    assert hass_storage[MOCK_KEY]["data"] == MOCK_DATA2
+    assert store._journal_pending == []
@@ -1,5 +1,6 @@
 """Test Home Assistant template helper methods."""
-from datetime import datetime
+import asyncio
+from datetime import datetime, timedelta
 import math
 import random
 
@@ -24,6 +25,7 @@ import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import UnitSystem
 
 from tests.async_mock import patch
+from tests.common import async_fire_time_changed
 
 
 def _set_up_units(hass):
@@ -1586,6 +1588,33 @@ def test_async_render_to_info_with_complex_branching(hass):
     assert info.rate_limit == template.DOMAIN_STATES_RATE_LIMIT
 
 
+async def test_domain_states_snapshot_shared_until_state_changes(hass):
+    """Test renders in the same tick share the sorted states of a domain."""
+    hass.states.async_set("sensor.b", "off")
+    hass.states.async_set("sensor.a", "on")
+    tpl = template.Template(
+        "{{ states.sensor | map(attribute='state') | join(',') }}", hass
+    )
+
+    with patch.object(
+        hass.states, "async_all", wraps=hass.states.async_all
+    ) as mock_all:
+        info = tpl.async_render_to_info()
+        info2 = render_to_info(hass, "{{ states.sensor | list | count }}")
+        assert mock_all.call_count == 1
+
+        assert_result_info(info, "on,off", [], ["sensor"])
+        assert_result_info(info2, 2, [], ["sensor"])
+
+        hass.states.async_set("sensor.c", "on")
+        assert tpl.async_render() == "on,off,on"
+        assert mock_all.call_count == 2
+
+        await hass.async_block_till_done()
+        assert tpl.async_render() == "on,off,on"
+        assert mock_all.call_count == 3
+
+
 async def test_async_render_to_info_with_wildcard_matching_entity_id(hass):
     """Test tracking template with a wildcard."""
     template_complex_str = r"""
@@ -2087,6 +2116,76 @@ async def test_cache_garbage_collection():
     )  # pylint: disable=protected-access
 
 
+async def test_identical_templates_share_compiled_template(hass):
+    """Test identical templates render with the same compiled template."""
+    tpl = template.Template("{{ 1 + 2 }}", hass)
+    tpl2 = template.Template("{{ 1 + 2 }}", hass)
+
+    assert tpl.async_render() == 3
+    assert tpl2.async_render() == 3
+    assert tpl._compiled is tpl2._compiled  # pylint: disable=protected-access
+
+
+async def test_code_cache_persisted(hass, hass_storage):
+    """Test compiled template code is saved and reused after a restart."""
+    template_string = "{{ 'code cache' | upper }}"
+    code_cache = template.TemplateCodeCache()
+
+    with patch.object(template, "_CODE_CACHE", code_cache):
+        await template.async_load_code_cache(hass)
+        tpl = template.Template(template_string, hass)
+        assert tpl.async_render() == "CODE CACHE"
+        await hass.async_block_till_done()
+
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=template.CODE_CACHE_SAVE_DELAY)
+        )
+        await hass.async_block_till_done()
+
+    data = hass_storage[template.CODE_CACHE_STORAGE_KEY]["data"]
+    assert data["version"] == template._code_cache_version()
+    assert len(data["code"]) == 1
+
+    code_cache = template.TemplateCodeCache()
+    hass.data.pop(template._ENVIRONMENT)
+    with patch.object(template, "_CODE_CACHE", code_cache), patch(
+        "jinja2.sandbox.ImmutableSandboxedEnvironment.compile"
+    ) as mock_compile:
+        await template.async_load_code_cache(hass)
+        tpl = template.Template(template_string, hass)
+        assert tpl.async_render() == "CODE CACHE"
+
+    assert not mock_compile.called
+
+    # Code cached by other versions is not used
+    hass_storage[template.CODE_CACHE_STORAGE_KEY]["data"]["version"] = "0.1-2.0-other"
+    code_cache = template.TemplateCodeCache()
+    with patch.object(template, "_CODE_CACHE", code_cache):
+        await template.async_load_code_cache(hass)
+    assert code_cache.get(template.TemplateEnvironment(hass), template_string) is None
+
+
+async def test_code_cache_saved_while_compiling(hass, hass_storage):
+    """Test the code cache can be saved while templates compile in threads."""
+    code_cache = template.TemplateCodeCache()
+    env = template.TemplateEnvironment(hass)
+
+    def _compile(start):
+        """Compile templates in an executor thread."""
+        for idx in range(start, start + 200):
+            code_cache.add(env, f"{{{{ {idx} }}}}", compile("1", "<test>", "eval"))
+
+    with patch.object(template, "_CODE_CACHE", code_cache):
+        await template.async_load_code_cache(hass)
+        jobs = [hass.async_add_executor_job(_compile, start) for start in (0, 200, 400)]
+        while not all(job.done() for job in jobs):
+            code_cache._data_to_save()
+            await asyncio.sleep(0)
+        await asyncio.gather(*jobs)
+
+    assert len(code_cache._data_to_save()["code"]) == 600
+
+
 def test_is_template_string():
     """Test is template string."""
     assert template.is_template_string("{{ x }}") is True
@@ -284,3 +284,66 @@ async def test_async_set_updated_data(crd):
     crd.async_set_updated_data(300)
     # We have created a new refresh listener
     assert crd._unsub_refresh is not old_refresh
+
+
+async def test_coordinator_group(hass, caplog):
+    """Test coordinators in a group fetch their data in one call."""
+    calls = []
+
+    async def update_method(coordinators):
+        calls.append([coordinator.name for coordinator in coordinators])
+        return [
+            update_coordinator.UpdateFailed("Account locked")
+            if coordinator.name == "two"
+            else len(calls)
+            for coordinator in coordinators
+        ]
+
+    group = update_coordinator.DataUpdateCoordinatorGroup[int](
+        hass,
+        _LOGGER,
+        name="test",
+        update_interval=DEFAULT_UPDATE_INTERVAL,
+        update_method=update_method,
+    )
+    coordinators = [
+        update_coordinator.DataUpdateCoordinator[int](
+            hass, _LOGGER, name=name, group=group
+        )
+        for name in ("one", "two", "three")
+    ]
+    assert coordinators[0].update_interval == DEFAULT_UPDATE_INTERVAL
+
+    for coordinator in coordinators:
+        coordinator.async_add_listener(Mock())
+
+    async_fire_time_changed(hass, utcnow() + DEFAULT_UPDATE_INTERVAL)
+    await hass.async_block_till_done()
+
+    assert calls == [["one", "two", "three"]]
+    assert [coordinator.data for coordinator in coordinators] == [1, None, 1]
+    assert [coordinator.last_update_success for coordinator in coordinators] == [
+        True,
+        False,
+        True,
+    ]
+    assert "Error fetching two data: Account locked" in caplog.text
+    assert group.calls == 1
+    assert group.fetches == 3
+
+    # Refreshes started at the same time are merged
+    await asyncio.gather(
+        coordinators[0].async_refresh(), coordinators[2].async_refresh()
+    )
+    assert calls[1] == ["one", "three"]
+    assert coordinators[0].data == 2
+
+    # A failing call fails all coordinators
+    group.update_method = AsyncMock(side_effect=aiohttp.ClientError("Offline"))
+    async_fire_time_changed(hass, utcnow() + DEFAULT_UPDATE_INTERVAL)
+    await hass.async_block_till_done()
+
+    assert group.update_method.call_count == 1
+    assert not any(coordinator.last_update_success for coordinator in coordinators)
+    assert group.calls == 3
+    assert group.fetches == 8
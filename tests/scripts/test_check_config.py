@@ -7,7 +7,7 @@ from homeassistant.config import YAML_CONFIG_FILE
 import homeassistant.scripts.check_config as check_config
 
 from tests.async_mock import patch
-from tests.common import get_test_config_dir, patch_yaml_files
+from tests.common import get_test_config_dir, mock_storage, patch_yaml_files
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,6 +30,13 @@ async def apply_stop_hass(stop_hass):
     """Make sure all hass are stopped."""
 
 
+@pytest.fixture(autouse=True)
+def apply_mock_storage():
+    """Don't write to the storage of the test config dir."""
+    with mock_storage():
+        yield
+
+
 def normalize_yaml_files(check_dict):
     """Remove configuration path from ['yaml_files']."""
     root = get_test_config_dir()
@@ -191,6 +191,38 @@ async def test_setup_after_deps_in_stage_1_ignored(hass):
     assert order == ["cloud", "an_after_dep", "normal_integration"]
 
 
+async def test_setup_stage_2_not_waiting_for_stage_1(hass):
+    """Test stage 2 integrations do not wait for unrelated stage 1 ones."""
+    # This test relies on this
+    assert "cloud" in bootstrap.STAGE_1_INTEGRATIONS
+    order = []
+    cloud_event = asyncio.Event()
+
+    async def async_setup_cloud(hass, config):
+        await cloud_event.wait()
+        order.append("cloud")
+        return True
+
+    async def async_setup_normal(hass, config):
+        order.append("normal_integration")
+        cloud_event.set()
+        return True
+
+    mock_integration(hass, MockModule(domain="cloud", async_setup=async_setup_cloud))
+    mock_integration(
+        hass,
+        MockModule(domain="normal_integration", async_setup=async_setup_normal),
+    )
+
+    await bootstrap._async_set_up_integrations(
+        hass, {"cloud": {}, "normal_integration": {}}
+    )
+
+    assert "normal_integration" in hass.config.components
+    assert "cloud" in hass.config.components
+    assert order == ["normal_integration", "cloud"]
+
+
 async def test_setup_after_deps_via_platform(hass):
     """Test after_dependencies set up via platform."""
     order = []
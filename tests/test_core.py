@@ -3,6 +3,7 @@
 import asyncio
 from datetime import datetime, timedelta
 import functools
+import json
 import logging
 import os
 from tempfile import TemporaryDirectory
@@ -26,6 +27,7 @@ from homeassistant.const import (
     EVENT_SERVICE_REGISTERED,
     EVENT_SERVICE_REMOVED,
     EVENT_STATE_CHANGED,
+    EVENT_STATES_CHANGED,
     EVENT_TIME_CHANGED,
     EVENT_TIMER_OUT_OF_SYNC,
     MATCH_ALL,
@@ -37,6 +39,7 @@ from homeassistant.exceptions import (
     InvalidStateError,
     ServiceNotFound,
 )
+from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
@@ -336,6 +339,34 @@ def test_state_as_dict():
     assert state.as_dict() is state.as_dict()
 
 
+def test_state_as_json():
+    """Test a State as JSON."""
+    state = ha.State("happy.happy", "on", {"pig": "dog"})
+    assert json.loads(state.as_json()) == state.as_dict()
+    assert state.as_json() is state.as_json()
+
+
+def test_event_as_json():
+    """Test an Event as JSON reuses the JSON of states in the data."""
+    state = ha.State("happy.happy", "on", {"pig": "dog"})
+    event = ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "happy.happy", "old_state": None, "new_state": state},
+    )
+    expected = event.as_dict()
+    expected["data"] = {
+        "entity_id": "happy.happy",
+        "old_state": None,
+        "new_state": state.as_dict(),
+    }
+    assert json.loads(event.as_json()) == expected
+    assert event.as_json() is event.as_json()
+    assert state.as_json() in event.as_json()
+
+    event = ha.Event("some_type", {"some": "attr"})
+    assert json.loads(event.as_json()) == event.as_dict()
+
+
 async def test_eventbus_add_remove_listener(hass):
     """Test remove_listener method."""
     old_count = len(hass.bus.async_listeners())
@@ -471,6 +502,50 @@ async def test_eventbus_coroutine_event_listener(hass):
     assert len(coroutine_calls) == 1
 
 
+async def test_eventbus_dispatch_match_all_changes(hass):
+    """Test cached dispatch follows MATCH_ALL and event type (un)subscribes."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        calls.append(("type", event.event_type))
+
+    @ha.callback
+    def match_all_listener(event):
+        calls.append(("all", event.event_type))
+
+    unsub = hass.bus.async_listen("test_dispatch", listener)
+    hass.bus.async_fire("test_dispatch")
+    await hass.async_block_till_done()
+    assert calls == [("type", "test_dispatch")]
+
+    calls.clear()
+    unsub_all = hass.bus.async_listen(MATCH_ALL, match_all_listener)
+    hass.bus.async_fire("test_dispatch")
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+    assert ("all", "test_dispatch") in calls
+    assert ("type", "test_dispatch") in calls
+    assert ("all", EVENT_HOMEASSISTANT_CLOSE) not in calls
+
+    calls.clear()
+    unsub_all()
+    unsub()
+    hass.bus.async_fire("test_dispatch")
+    await hass.async_block_till_done()
+    assert calls == []
+
+
+async def test_eventbus_no_event_without_listeners(hass):
+    """Test no Event is created when nobody listens."""
+    with patch.object(ha, "Event") as mock_event, patch.object(
+        ha._LOGGER, "isEnabledFor", return_value=False
+    ):
+        hass.bus.async_fire("test_no_listeners")
+
+    assert not mock_event.called
+
+
 def test_state_init():
     """Test state.init."""
     with pytest.raises(InvalidEntityFormatError):
@@ -596,6 +671,48 @@ async def test_statemachine_remove(hass):
     assert len(events) == 1
 
 
+async def test_statemachine_version(hass):
+    """Test the version changes when a state is set or removed."""
+    version = hass.states.version
+
+    hass.states.async_set("light.bowl", "on")
+    assert hass.states.version != version
+    version = hass.states.version
+
+    hass.states.async_set("light.bowl", "on")
+    assert hass.states.version == version
+
+    hass.states.async_set_many({"light.bowl": ("off", None)})
+    assert hass.states.version != version
+    version = hass.states.version
+
+    hass.states.async_remove("light.bowl")
+    assert hass.states.version != version
+
+
+async def test_statemachine_all_json(hass):
+    """Test the JSON of all states is cached until a state changes."""
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("switch.ac", "off")
+
+    states_json = hass.states.async_all_json()
+    assert json.loads(states_json) == json.loads(
+        json.dumps(hass.states.async_all(), cls=JSONEncoder)
+    )
+    assert hass.states.async_all_json() is states_json
+
+    assert [
+        state["entity_id"]
+        for state in json.loads(
+            hass.states.async_all_json(lambda entity_id: entity_id == "switch.ac")
+        )
+    ] == ["switch.ac"]
+
+    hass.states.async_set("light.bowl", "off")
+    assert hass.states.async_all_json() is not states_json
+    assert json.loads(hass.states.async_all_json())[0]["state"] == "off"
+
+
 async def test_statemachine_case_insensitivty(hass):
     """Test insensitivty."""
     events = async_capture_events(hass, EVENT_STATE_CHANGED)
@@ -637,6 +754,49 @@ async def test_statemachine_force_update(hass):
     assert len(events) == 1
 
 
+async def test_statemachine_set_many(hass):
+    """Test setting many states at once."""
+    hass.states.async_set("light.bowl", "on", {"brightness": 100})
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    batches = async_capture_events(hass, EVENT_STATES_CHANGED)
+    match_all = async_capture_events(hass, MATCH_ALL)
+
+    hass.states.async_set_many(
+        {
+            "light.bowl": ("on", {"brightness": 100}),
+            "light.Kitchen": ("off", None),
+            "sensor.temperature": ("21", {"unit_of_measurement": "°C"}),
+        }
+    )
+    await hass.async_block_till_done()
+
+    assert [event.data["entity_id"] for event in events] == [
+        "light.kitchen",
+        "sensor.temperature",
+    ]
+    assert len(batches) == 1
+    assert batches[0].data["changes"] == [event.data for event in events]
+    assert batches[0].context == events[0].context == events[1].context
+    assert batches[0].time_fired == events[0].time_fired
+    assert events[0].time_fired == hass.states.get("light.kitchen").last_updated
+    assert all(event.event_type == EVENT_STATE_CHANGED for event in match_all)
+
+    # Nothing changed, no batch event
+    hass.states.async_set_many({"light.kitchen": ("off", None)})
+    await hass.async_block_till_done()
+    assert len(batches) == 1
+
+
+async def test_statemachine_set_many_invalid(hass):
+    """Test an invalid state leaves the state machine untouched."""
+    with pytest.raises(InvalidEntityFormatError):
+        hass.states.async_set_many(
+            {"light.kitchen": ("on", None), "invalid_entity": ("on", None)}
+        )
+
+    assert hass.states.get("light.kitchen") is None
+
+
 def test_service_call_repr():
     """Test ServiceCall repr."""
     call = ha.ServiceCall("homeassistant", "start")
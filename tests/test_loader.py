@@ -1,12 +1,21 @@
 """Test to verify that we can load components."""
+from datetime import timedelta
+import sys
+
 import pytest
 
 from homeassistant.components import http, hue
 from homeassistant.components.hue import light as hue_light
 import homeassistant.loader as loader
+import homeassistant.util.dt as dt_util
 
 from tests.async_mock import ANY, patch
-from tests.common import MockModule, async_mock_service, mock_integration
+from tests.common import (
+    MockModule,
+    async_fire_time_changed,
+    async_mock_service,
+    mock_integration,
+)
 
 
 async def test_component_dependencies(hass):
@@ -394,3 +403,90 @@ async def test_get_custom_components_safe_mode(hass):
     """Test that we get empty custom components in safe mode."""
     hass.config.safe_mode = True
     assert await loader.async_get_custom_components(hass) == {}
+
+
+async def test_manifest_index(hass, hass_storage, tmp_path):
+    """Test manifests are only read again when their file changed."""
+    manifest_path = tmp_path / "test" / "manifest.json"
+    manifest_path.parent.mkdir()
+    manifest_path.write_text('{"domain": "test", "name": "Test"}')
+
+    # Test instances use an index that is not stored
+    hass.data.pop(loader.DATA_MANIFEST_INDEX)
+    index = await loader.async_get_manifest_index(hass)
+    assert index.list_sub_directories(str(tmp_path)) == ["test"]
+    assert index.load_manifest(manifest_path) == {"domain": "test", "name": "Test"}
+
+    with patch("pathlib.Path.read_text") as mock_read, patch(
+        "pathlib.Path.iterdir"
+    ) as mock_iterdir:
+        assert index.load_manifest(manifest_path)["name"] == "Test"
+        assert index.list_sub_directories(str(tmp_path)) == ["test"]
+    assert not mock_read.mock_calls
+    assert not mock_iterdir.mock_calls
+
+    manifest_path.write_text('{"domain": "test", "name": "Changed"}')
+    assert index.load_manifest(manifest_path)["name"] == "Changed"
+    assert index.load_manifest(tmp_path / "missing" / "manifest.json") is None
+
+    await hass.async_block_till_done()
+    async_fire_time_changed(
+        hass,
+        dt_util.utcnow() + timedelta(seconds=loader.MANIFEST_INDEX_SAVE_DELAY + 1),
+    )
+    await hass.async_block_till_done()
+
+    # The index of the next start does not read the manifest again
+    index = loader.ManifestIndex(
+        hass, None, hass_storage[loader.MANIFEST_INDEX_STORAGE_KEY]["data"]
+    )
+    with patch("pathlib.Path.read_text") as mock_read:
+        assert index.load_manifest(manifest_path)["name"] == "Changed"
+    assert not mock_read.mock_calls
+
+    manifest_path.unlink()
+    assert index.load_manifest(manifest_path) is None
+
+    # The index is dropped on upgrade
+    with patch("homeassistant.loader.__version__", "0.0.0"):
+        index = loader.ManifestIndex(
+            hass, None, hass_storage[loader.MANIFEST_INDEX_STORAGE_KEY]["data"]
+        )
+    assert not index._manifests
+
+
+def test_lazy_import():
+    """Test a lazy module is imported when an attribute is used."""
+    assert loader.lazy_import("json") is sys.modules["json"]
+
+    with patch.dict(sys.modules):
+        sys.modules.pop("colorsys", None)
+        colorsys = loader.lazy_import("colorsys")
+        assert isinstance(colorsys, loader.LazyModule)
+        assert "colorsys" not in sys.modules
+
+        assert colorsys.rgb_to_hsv(1, 0, 0) == (0, 1, 1)
+        assert "colorsys" in sys.modules
+
+
+async def test_import_profile(hass):
+    """Test the import time of integrations is profiled."""
+    with patch.dict(sys.modules):
+        for name in list(sys.modules):
+            if name.startswith("custom_components.test."):
+                del sys.modules[name]
+        sys.modules.pop("custom_components.test", None)
+
+        integration = await loader.async_get_integration(hass, "test")
+        integration.get_component()
+        integration.get_platform("light")
+        integration.get_platform("light")
+
+    profile = loader.async_get_import_profile(hass)
+    assert len(profile) == 1
+    assert profile[0]["domain"] == "test"
+    assert profile[0]["modules"] == [
+        "custom_components.test",
+        "custom_components.test.light",
+    ]
+    assert profile[0]["cumulative"] >= profile[0]["self"] > 0
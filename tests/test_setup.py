@@ -596,3 +596,49 @@ async def test_integration_disabled(hass, caplog):
     result = await setup.async_setup_component(hass, "test_component1", {})
     assert not result
     assert disabled_reason in caplog.text
+
+
+async def test_setup_timeline(hass):
+    """Test the setup phases are recorded and exported as a Chrome trace."""
+    mock_integration(hass, MockModule("dep"))
+    mock_integration(
+        hass, MockModule("comp", dependencies=["dep"], requirements=["package==1.0"])
+    )
+    hass.config.skip_pip = False
+
+    with patch(
+        "homeassistant.requirements.async_get_integration_with_requirements"
+    ) as mock_requirements:
+        assert await setup.async_setup_component(hass, "comp", {})
+    assert len(mock_requirements.mock_calls) == 1
+
+    timeline = setup.async_get_setup_timeline(hass)
+    phases = [(phase["domain"], phase["phase"]) for phase in timeline]
+    for phase in (
+        ("comp", setup.SETUP_PHASE_WAIT),
+        ("comp", setup.SETUP_PHASE_REQUIREMENTS),
+        ("comp", setup.SETUP_PHASE_IMPORT),
+        ("comp", setup.SETUP_PHASE_SETUP),
+        ("dep", setup.SETUP_PHASE_SETUP),
+    ):
+        assert phase in phases
+    comp_wait = timeline[phases.index(("comp", setup.SETUP_PHASE_WAIT))]
+    dep_setup = timeline[phases.index(("dep", setup.SETUP_PHASE_SETUP))]
+    assert comp_wait["start"] <= dep_setup["start"]
+    assert comp_wait["duration"] >= dep_setup["duration"]
+
+    trace = setup.setup_timeline_to_chrome_trace(timeline)
+    threads = {
+        event["args"]["name"]: event["tid"]
+        for event in trace["traceEvents"]
+        if event["ph"] == "M"
+    }
+    assert set(threads) == {"comp", "dep"}
+    events = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert len(events) == len(timeline)
+    assert min(event["ts"] for event in events) == 0
+    assert {
+        (event["tid"], event["name"]) for event in events if event["cat"] == "comp"
+    } >= {(threads["comp"], setup.SETUP_PHASE_SETUP)}
+
+    assert setup.setup_timeline_to_chrome_trace([]) == {"traceEvents": []}